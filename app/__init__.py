@@ -4,13 +4,26 @@ from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_swagger_ui import get_swaggerui_blueprint
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
 from app.extensions import db, migrate
 from app.services.errors import ServiceError
-from app.services import init_auth_service, init_qr_service
+from app.services import (
+    init_auth_service,
+    init_ekasa_client,
+    init_engine_hooks,
+    init_engine_options,
+    init_job_queue,
+    init_qr_service,
+    init_rate_limiter,
+    init_request_metrics,
+)
+from app.services.data_version_service import install_listeners as install_data_version_listeners
+from app.services.monthly_rollups_service import install_listeners as install_rollup_listeners
+from app.utils.json_provider import FastJSONProvider
 
 load_dotenv()
 
@@ -31,6 +44,8 @@ def create_app(config_object=None):
         template_folder=None,
     )
 
+    flask_app.json = FastJSONProvider(flask_app)
+
     CORS(flask_app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 
     if config_object:
@@ -47,12 +62,24 @@ def create_app(config_object=None):
             from app.config import DevConfig as Cfg
         flask_app.config.from_object(Cfg)
 
+    proxy_count = flask_app.config.get("TRUSTED_PROXY_COUNT", 0)
+    if proxy_count:
+        flask_app.wsgi_app = ProxyFix(flask_app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
+
+    init_engine_options(flask_app)
     db.init_app(flask_app)
     migrate.init_app(flask_app, db)
     init_auth_service(flask_app)
     init_qr_service(flask_app)
+    init_ekasa_client(flask_app)
+    init_rate_limiter(flask_app)
+    init_job_queue(flask_app)
+    init_request_metrics(flask_app)
+    install_rollup_listeners()
+    install_data_version_listeners()
 
     with flask_app.app_context():
+        init_engine_hooks(flask_app, db.engine)
         import app.models
         if flask_app.config.get("DEBUG") or flask_app.config.get("TESTING"):
             app.models.Base.metadata.create_all(bind=db.engine)
@@ -83,6 +110,8 @@ def _register_api(flask_app: Flask):
     import app.api.monthly_budget # noqa: F401
     import app.api.categories    # noqa: F401
     import app.api.analytics     # noqa: F401
+    import app.api.diagnostics   # noqa: F401
+    import app.api.jobs          # noqa: F401
     flask_app.register_blueprint(api_bp)
 
 
@@ -11,9 +11,11 @@ Notes for Swagger:
 """
 
 import warnings
+from functools import wraps
 
 from flask import Blueprint, jsonify
-from app.services.errors import UnauthorizedError
+from app.services import data_version_service, metrics_service
+from app.services.errors import RateLimitExceededError, UnauthorizedError
 from app.services.responses import OkResult
 
 bp = Blueprint("api", __name__, url_prefix="/api")
@@ -42,6 +44,9 @@ PUBLIC_API_PATHS = {
     "/api/auth/logout",
     "/api/auth/google",
     "/api/health",
+    # Operator endpoints; they check METRICS_TOKEN themselves.
+    "/api/diagnostics/metrics",
+    "/api/diagnostics/db-pool",
 }
 
 
@@ -71,7 +76,8 @@ def _enforce_authentication():
         return None
     auth_service = current_app.extensions.get("auth_service")
     token = extract_auth_token()
-    user = auth_service.verify_token(token) if token else None
+    with metrics_service.phase("auth"):
+        user = auth_service.verify_token(token) if token else None
     if user is None:
         raise UnauthorizedError(
             "Authentication required",
@@ -82,6 +88,73 @@ def _enforce_authentication():
     return None
 
 
+# ---------------------------------------------------------------------------
+# Conditional GET
+#
+# Read endpoints decorated with ``conditional_get`` answer with a weak ETag
+# derived from the caller's data version (see data_version_service). A
+# request whose ``If-None-Match`` matches gets an empty 304 from the hook
+# below, before the endpoint runs. Only decorate endpoints whose response
+# depends on nothing but the caller's own data, the accounts they are a
+# member of, and the request URL.
+def conditional_get(view):
+    """Mark a GET endpoint as cacheable by the caller's data version."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return view(*args, **kwargs)
+
+    wrapper.conditional_get = True
+    return wrapper
+
+
+@bp.before_request
+def _short_circuit_not_modified():
+    if request.method != "GET":
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    user = g.get("current_user")
+    if user is None or not getattr(view, "conditional_get", False):
+        return None
+
+    etag = data_version_service.etag_for(user.id, data_version_service.get_version(user.id))
+    g.data_etag = etag
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+#
+# ``rate_limit`` counts calls per client in the limiter registered by
+# ``init_rate_limiter`` (see app/services/rate_limiter.py) and raises
+# ``RateLimitExceededError`` with a ``Retry-After`` once ``limit`` calls
+# were made within ``per`` seconds. Authenticated calls are counted per
+# user, anonymous ones per client address. Endpoints sharing a ``scope``
+# share one budget.
+def rate_limit(limit: int, per: float, scope: str | None = None):
+    """Allow at most ``limit`` calls per client within ``per`` seconds."""
+    def decorator(view):
+        name = scope or view.__name__
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limiter = current_app.extensions.get("rate_limiter")
+            if limiter is not None and current_app.config.get("RATE_LIMIT_ENABLED", True):
+                user = g.get("current_user")
+                client = f"user:{user.id}" if user is not None else f"ip:{request.remote_addr}"
+                decision = limiter.hit(f"{name}:{client}", limit, per)
+                if not decision.allowed:
+                    raise RateLimitExceededError(retry_after=decision.retry_after)
+            return view(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
 def make_response(data=None, error=None, status=200):
     """
     Deprecated unified API response helper.
@@ -25,12 +25,13 @@ Common errors:
 
 from flask import g
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.api.request_parsing import parse_json_object_body
 from app.services import accounts_service
 
 
 @bp.get("/account", strict_slashes=False)
+@conditional_get
 def api_account_get():
     """
     Get the current user's main account.
@@ -7,12 +7,13 @@ Paths:
 
 from flask import request, g
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.services import analytics_service
 from app.validators.common_validators import parse_month_year_query_filter
 
 
 @bp.get("/analytics/donut", strict_slashes=False)
+@conditional_get
 def api_donut_chart():
     month_filter = parse_month_year_query_filter(
         request.args.get("year"),
@@ -26,7 +26,7 @@ Notes:
 """
 
 from flask import request, current_app, g
-from app.api import bp, extract_auth_token
+from app.api import bp, extract_auth_token, rate_limit
 from app.api.request_parsing import parse_json_object_body
 from app.services.errors import BadRequestError, UnauthorizedError
 from app.services.responses import CreatedResult, OkResult
@@ -44,6 +44,7 @@ def _cookie_secure() -> bool:
 
 
 @bp.post("/auth/login", strict_slashes=False)
+@rate_limit(limit=10, per=60)
 def api_login():
     """
     POST /api/auth/login
@@ -55,6 +56,7 @@ def api_login():
     Responses:
       200: {"data":{"ok":true}, "error":null}
       401: {"data":null,"error":{"code":"auth_failed","message":"Invalid credentials"}}
+      429: {"data":null,"error":{"code":"rate_limit_exceeded","message":"Rate limit exceeded. Try again later."}}
     """
     p = parse_json_object_body()
     email = (p.get("email") or "").strip()
@@ -76,6 +78,7 @@ def api_login():
 
 
 @bp.post("/auth/register", strict_slashes=False)
+@rate_limit(limit=5, per=60)
 def api_register():
     """
     POST /api/auth/register
@@ -88,6 +91,7 @@ def api_register():
       201: {"data":{"created":true,"id":"<uuid>"},"error":null}
       400: {"data":null,"error":{"code":"bad_request","message":"email and password required"}}
       409: {"data":null,"error":{"code":"exists","message":"User already exists"}}
+      429: {"data":null,"error":{"code":"rate_limit_exceeded","message":"Rate limit exceeded. Try again later."}}
     """
     p = parse_json_object_body()
     email = (p.get("email") or "").strip()
@@ -97,6 +101,7 @@ def api_register():
 
 
 @bp.post("/auth/verify", strict_slashes=False)
+@rate_limit(limit=10, per=60)
 def api_verify_email():
     """
     POST /api/auth/verify
@@ -178,6 +183,7 @@ def api_logout():
 # Google OAuth login endpoint
 # ----------------------------------------------------------------------
 @bp.post("/auth/google", strict_slashes=False)
+@rate_limit(limit=10, per=60, scope="api_login")
 def api_login_google():
     """
     POST /api/auth/google
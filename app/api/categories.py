@@ -33,7 +33,7 @@ import uuid
 
 from flask import g, request
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.api.request_parsing import parse_json_object_body
 from app.services import categories_service
 from app.services.errors import BadRequestError
@@ -41,6 +41,7 @@ from app.validators.common_validators import parse_month_year_query_filter
 
 
 @bp.get("/categories", strict_slashes=False)
+@conditional_get
 def api_categories_list():
     """
     List categories owned by the current user plus shared categories.
@@ -72,6 +73,7 @@ def create_category():
 
 
 @bp.get("/categories/monthly-limit", strict_slashes=False)
+@conditional_get
 def get_category_monthly_limit():
     """
     Get spent amount and configured limit for one category in one month.
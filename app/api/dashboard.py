@@ -24,12 +24,13 @@ Common errors:
 
 from flask import g, request
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.services import dashboard_service
 from app.validators.common_validators import parse_month_year_query_filter
 
 
 @bp.get("/dashboard/summary", strict_slashes=False)
+@conditional_get
 def api_dashboard_summary():
     """
     Get monthly income and expense totals for the authenticated user.
@@ -0,0 +1,89 @@
+"""
+Diagnostics API
+
+Paths:
+  - GET /api/diagnostics/db-pool
+  - GET /api/diagnostics/metrics
+
+Operational data about the serving process. Values are per worker
+process, so consecutive calls may be answered by different workers.
+
+Operator endpoints: session tokens are not accepted. Authenticate with
+``Authorization: Bearer <METRICS_TOKEN>``; while METRICS_TOKEN is unset
+they answer 403.
+"""
+
+import hmac
+
+from flask import current_app, request
+
+from app.api import bp
+from app.extensions import db
+from app.services import database_service, metrics_service
+from app.services.errors import ForbiddenError, UnauthorizedError
+from app.services.responses import OkResult
+
+
+def _require_operator_token() -> None:
+    """Let only callers holding ``METRICS_TOKEN`` through."""
+    expected = current_app.config.get("METRICS_TOKEN", "")
+    if not expected:
+        raise ForbiddenError("Diagnostics are disabled; set METRICS_TOKEN to enable them")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), expected.encode()):
+        raise UnauthorizedError("Authentication required", code="unauthenticated")
+
+
+@bp.get("/diagnostics/db-pool", strict_slashes=False)
+def api_diagnostics_db_pool():
+    """
+    Connection pool occupancy and cumulative checkout statistics
+    (operator token required).
+
+    Responses:
+      200: {
+             "data": {
+               "pool_class": str,
+               "size": "int | omitted",
+               "checked_out": "int | omitted",
+               "checked_in": "int | omitted",
+               "overflow": "int | omitted",
+               "max_overflow": "int | omitted",
+               "timeout_s": "float | omitted",
+               "stats": {
+                 "connects": int,
+                 "checkouts": int,
+                 "checkins": int,
+                 "invalidations": int,
+                 "waits": int,
+                 "wait_avg_ms": float,
+                 "wait_max_ms": float,
+                 "timeouts": int
+               }
+             },
+             "error": null
+           }
+      401: missing or wrong operator token
+      403: METRICS_TOKEN is not configured
+    """
+    _require_operator_token()
+    return OkResult(database_service.get_pool_status(db.engine)).to_flask_response()
+
+
+@bp.get("/diagnostics/metrics", strict_slashes=False)
+def api_diagnostics_metrics():
+    """
+    Per-endpoint request metrics in the Prometheus text format.
+
+    Not wrapped in the JSON envelope so Prometheus can scrape it directly.
+    Operator token required.
+
+    Responses:
+      200: text/plain; version=0.0.4 (see app/services/metrics_service.py)
+      401: missing or wrong operator token
+      403: METRICS_TOKEN is not configured
+    """
+    _require_operator_token()
+
+    body = metrics_service.registry.render(database_service.pool_stats.snapshot())
+    return current_app.response_class(body, mimetype="text/plain; version=0.0.4")
@@ -2,7 +2,7 @@
 Import QR / eKasa API
 
 Paths:
-  - POST /api/import-qr/extract-id
+  - POST /api/import-qr/extract-id[?async=true]
 
 Response envelope:
   {"data": <payload> | null, "error": {"code": str, "message": str} | null}
@@ -17,45 +17,13 @@ Common errors:
   400: {"data": null, "error": {"code": "bad_request", "message": str}}
   401: {"data": null, "error": {"code": "unauthenticated", "message": str}}
   429: {"data": null, "error": {"code": "rate_limit_exceeded", "message": str}}
+  503: {"data": null, "error": {"code": "service_unavailable", "message": str}}  # async job queue full
 """
 
-import time
-from functools import wraps
-
 from flask import current_app, request
 
-from app.api import bp
-from app.services.errors import RateLimitExceededError
-
-# Rate limiting dictionary (in production, use Redis or similar)
-rate_limit_store = {}
-
-
-def rate_limit(limit=10, per=60):
-    """Simple rate limiter: limit requests per IP per time period"""
-    def decorator(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            ip = request.remote_addr
-            key = f"{ip}:{f.__name__}"
-            now = time.time()
-            
-            # Clean old entries
-            if key in rate_limit_store:
-                rate_limit_store[key] = [t for t in rate_limit_store[key] if now - t < per]
-            
-            # Check rate limit
-            if key in rate_limit_store and len(rate_limit_store[key]) >= limit:
-                raise RateLimitExceededError()
-            
-            # Add current request
-            if key not in rate_limit_store:
-                rate_limit_store[key] = []
-            rate_limit_store[key].append(now)
-            
-            return f(*args, **kwargs)
-        return wrapped
-    return decorator
+from app.api import bp, rate_limit
+from app.api.jobs import async_requested, submit_job
 
 
 def _qr_service():
@@ -72,11 +40,19 @@ def api_importqr_extract_id():
       multipart/form-data with file field:
         image: binary
 
+    Query:
+      async: "true" to decode in the background (optional)
+
     Responses:
       200: {"data": ExtractReceiptIdResponse, "error": null}
+      202: {"data": Job, "error": null}  # async=true, see /api/jobs
       400: see module errors
       401: see module errors
       429: see module errors
     """
-    result = _qr_service().extract_receipt_id_from_upload(request.files.get("image"))
+    qr_service = _qr_service()
+    if async_requested():
+        image = qr_service.read_upload(request.files.get("image"))
+        return submit_job("qr_extract", qr_service.extract_receipt_id_from_bytes, image, pool="cpu")
+    result = qr_service.extract_receipt_id_from_upload(request.files.get("image"))
     return result.to_flask_response()
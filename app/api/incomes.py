@@ -42,7 +42,7 @@ import uuid
 
 from flask import g, request
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.api.request_parsing import parse_json_object_body
 from app.services import incomes_service, tags_service
 from app.validators.common_validators import parse_month_year_query_filter
@@ -163,6 +163,7 @@ def api_incomes_delete(income_id: uuid.UUID):
 
 
 @bp.get("/incomes/tags", strict_slashes=False)
+@conditional_get
 def api_income_tags_list():
     """
     List income-related tags for the authenticated user.
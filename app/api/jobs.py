@@ -0,0 +1,100 @@
+"""
+Background Jobs API
+
+Paths:
+  - GET /api/jobs/{job_id}
+
+Slow endpoints (``POST /api/import-qr/extract-id``,
+``POST /api/receipts/import-ekasa``, ``POST /api/receipts/import-ekasa/batch``)
+accept ``?async=true`` when ``JOBS_ENABLED`` is on. They then answer
+``202 Accepted`` with a Job and a ``Location`` header pointing here instead
+of waiting for the result; while it is off ``?async=true`` gets a 400.
+
+Response envelope:
+  {"data": <payload> | null, "error": {"code": str, "message": str} | null}
+
+Schemas:
+  Job:
+    {
+      "id": uuid,
+      "type": "qr_extract | ekasa_import | ekasa_import_batch",
+      "status": "queued | running | succeeded | failed",
+      "result": "object | null",           # data the synchronous call returns
+      "error": "{code, message} | null",   # error the synchronous call raises
+      "created_at": "ISO 8601",
+      "started_at": "ISO 8601 | null",
+      "finished_at": "ISO 8601 | null"
+    }
+
+Common errors:
+  400: {"data": null, "error": {"code": "bad_request", "message": str}}
+  401: {"data": null, "error": {"code": "unauthenticated", "message": str}}
+  404: {"data": null, "error": {"code": "not_found", "message": str}}
+  503: {"data": null, "error": {"code": "service_unavailable", "message": str}}
+"""
+
+import uuid
+
+from flask import current_app, g, request, url_for
+
+from app.api import bp
+from app.services.errors import BadRequestError, NotFoundError
+from app.services.responses import AcceptedResult, OkResult
+
+
+def _job_queue():
+    """Convenience accessor for the background job queue."""
+    return current_app.extensions.get("job_queue")
+
+
+def async_requested() -> bool:
+    """Whether the caller asked for ``?async=true``.
+
+    Raises:
+        BadRequestError: If async mode was asked for but ``JOBS_ENABLED`` is off.
+    """
+    requested = request.args.get("async", "").strip().lower() in ("1", "true", "yes")
+    if requested and not current_app.config.get("JOBS_ENABLED", False):
+        raise BadRequestError("Asynchronous processing is not enabled on this server")
+    return requested
+
+
+def submit_job(job_type: str, func, /, *args, pool: str = "io", **kwargs):
+    """Queue ``func(*args, **kwargs)`` for the current user; returns the 202 response."""
+    job = _job_queue().submit(job_type, g.current_user.id, func, *args, pool=pool, **kwargs)
+    response, status = AcceptedResult(job.to_dict()).to_flask_response()
+    response.headers["Location"] = url_for("api.api_jobs_get", job_id=job.id)
+    return response, status
+
+
+@bp.get("/jobs/<uuid:job_id>", strict_slashes=False)
+def api_jobs_get(job_id: uuid.UUID):
+    """
+    Status and outcome of a background job owned by the caller.
+
+    Query:
+      wait: seconds to hold the request until the job finishes
+            (optional, capped at JOBS_MAX_WAIT)
+
+    Responses:
+      200: {"data": Job, "error": null}
+      400: see module errors
+      401: see module errors
+      404: see module errors
+    """
+    raw_wait = request.args.get("wait")
+    if raw_wait is None:
+        job = _job_queue().get(job_id, g.current_user.id)
+    else:
+        try:
+            wait = float(raw_wait)
+        except ValueError:
+            raise BadRequestError("wait must be a number of seconds")
+        if not 0 <= wait < float("inf"):
+            raise BadRequestError("wait must be a number of seconds")
+        wait = min(wait, current_app.config.get("JOBS_MAX_WAIT", 30))
+        job = _job_queue().wait(job_id, g.current_user.id, wait)
+
+    if job is None:
+        raise NotFoundError("Job not found")
+    return OkResult(job.to_dict()).to_flask_response()
@@ -24,12 +24,13 @@ Common errors:
 
 from flask import g, request
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.services import monthly_budget_service
 from app.validators.common_validators import parse_month_year_query_filter
 
 
 @bp.get("/monthly-budget", strict_slashes=False)
+@conditional_get
 def api_monthly_budget_get():
     """
     Return monthly income and expense details for the authenticated user.
@@ -5,10 +5,12 @@ Paths:
   - GET    /api/receipts
   - GET    /api/receipts/tags
   - POST   /api/receipts
+  - POST   /api/receipts/bulk
   - GET    /api/receipts/{receipt_id}
   - PUT    /api/receipts/{receipt_id}
   - DELETE /api/receipts/{receipt_id}
   - POST   /api/receipts/import-ekasa
+  - POST   /api/receipts/import-ekasa/batch
   - GET    /api/receipts/ekasa-items
 
 Response envelope:
@@ -34,6 +36,12 @@ Schemas:
   ReceiptList:
     [Receipt]
 
+  ReceiptPage:
+    {
+      "receipts": [Receipt],
+      "next_cursor": "str | null"
+    }
+
   EkasaChecks:
     {
       "success": true,
@@ -42,24 +50,40 @@ Schemas:
       "total_items": int
     }
 
+  EkasaChecksPage:
+    {
+      "success": true,
+      "checks": [object],
+      "total_checks": int,                 # on this page
+      "total_items": int,                  # on this page
+      "next_cursor": "str | null"
+    }
+
 Common errors:
   400: {"data": null, "error": {"code": "bad_request", "message": str}}
   403: {"data": null, "error": {"code": "forbidden", "message": str}}
   404: {"data": null, "error": {"code": "not_found", "message": str}}
   409: {"data": null, "error": {"code": "conflict", "message": str}}
+  429: {"data": null, "error": {"code": "rate_limit_exceeded", "message": str}}
+  503: {"data": null, "error": {"code": "service_unavailable", "message": str}}  # async job queue full
 """
 
 import uuid
 
-from flask import g, request
+from flask import Response, current_app, g, request, stream_with_context
 
-from app.api import bp
+from app.api import bp, conditional_get, rate_limit
+from app.api.jobs import async_requested, submit_job
 from app.api.request_parsing import parse_json_object_body
 from app.services import receipts_service, tags_service
+from app.services.errors import BadRequestError
+from app.services.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 from app.validators.common_validators import (
+    parse_limit_query,
     parse_month_year_query_filter,
     parse_uuid_field,
 )
+from app.validators.receipt_validators import validate_ekasa_batch_data, validate_ekasa_import_data
 
 
 @bp.get("/receipts", strict_slashes=False)
@@ -73,9 +97,14 @@ def api_receipts_list():
       year: int | omitted
       month: int | omitted
       account_id: "uuid | omitted"
+      limit: int 1..200 | omitted
+      cursor: "str | omitted" (next_cursor of the previous page)
+
+    Without limit/cursor the full list is returned. With either of them the
+    response is a single keyset page; follow next_cursor until it is null.
 
     Responses:
-      200: {"data": ReceiptList, "error": null}
+      200: {"data": ReceiptList | ReceiptPage, "error": null}
       400: see module errors
       403: see module errors
     """
@@ -90,17 +119,28 @@ def api_receipts_list():
         required=False,
     )
 
+    limit = None
+    if "limit" in request.args or "cursor" in request.args:
+        limit = parse_limit_query(
+            request.args.get("limit"),
+            default=DEFAULT_PAGE_LIMIT,
+            maximum=MAX_PAGE_LIMIT,
+        )
+
     result = receipts_service.get_all_receipts(
         g.current_user.id,
         month_filter=month_filter,
         sort_by=request.args.get("sort", "issue_date"),
         descending=request.args.get("order", "desc").lower() == "desc",
         account_id=account_id,
+        limit=limit,
+        cursor=request.args.get("cursor") or None,
     )
     return result.to_flask_response()
 
 
 @bp.get("/receipts/tags", strict_slashes=False)
+@conditional_get
 def api_expense_tags_list():
     """
     List expense-related tags for the authenticated user.
@@ -139,6 +179,63 @@ def api_receipts_create():
     return result.to_flask_response()
 
 
+@bp.post("/receipts/bulk", strict_slashes=False)
+def api_receipts_create_bulk():
+    """
+    Create several receipts with their items for the authenticated user.
+
+    The request is validated as a whole and stored in one transaction:
+    either every receipt and item is created or none is. Validation
+    messages are prefixed with the offending path, e.g.
+    "receipts[1].items[4]: Missing name".
+
+    Request:
+      {
+        "receipts": [{
+          "account_id": "uuid | omitted",
+          "tag_id": "uuid | null | omitted",
+          "description": str,
+          "issue_date": "YYYY-MM-DD",
+          "total_amount": float,
+          "external_uid": "str | null | omitted",
+          "extra_metadata": "object | null | omitted",
+          "items": [{
+            "category_id": "uuid | null | omitted",
+            "name": str,
+            "quantity": float,
+            "unit_price": float,
+            "extra_metadata": "object | null | omitted"
+          }] | omitted
+        }]
+      }
+
+    Limits: at most RECEIPTS_BULK_MAX receipts and RECEIPT_ITEMS_BULK_MAX
+    items per request.
+
+    Responses:
+      201: {
+             "data": {
+               "receipts": [{"id": uuid, "item_ids": [uuid]}],
+               "total_receipts": int,
+               "total_items": int,
+               "message": str
+             },
+             "error": null
+           }
+      400: see module errors
+      403: see module errors
+      404: see module errors
+    """
+    payload = parse_json_object_body()
+    result = receipts_service.create_receipts_bulk(
+        payload,
+        user_id=g.current_user.id,
+        max_receipts=current_app.config.get("RECEIPTS_BULK_MAX", 100),
+        max_items=current_app.config.get("RECEIPT_ITEMS_BULK_MAX", 2000),
+    )
+    return result.to_flask_response()
+
+
 @bp.get("/receipts/<uuid:receipt_id>", strict_slashes=False)
 def api_receipts_get(receipt_id: uuid.UUID):
     """
@@ -205,6 +302,7 @@ def api_receipts_delete(receipt_id: uuid.UUID):
 
 
 @bp.post("/receipts/import-ekasa", strict_slashes=False)
+@rate_limit(limit=30, per=60, scope="ekasa_import")
 def api_receipts_import_ekasa():
     """
     Import one eKasa receipt for the authenticated user.
@@ -215,13 +313,27 @@ def api_receipts_import_ekasa():
         "account_id": "uuid | omitted"
       }
 
+    Query:
+      async: "true" to import in the background (optional)
+
     Responses:
       201: {"data": {"receipt_id": uuid, "message": str, "total_items": int}, "error": null}
+      202: {"data": Job, "error": null}  # async=true, see /api/jobs
       400: see module errors
       403: see module errors
       409: see module errors
+      429: see module errors
     """
     payload = parse_json_object_body()
+    if async_requested():
+        # Reject malformed requests now rather than as a failed job.
+        validate_ekasa_import_data(payload)
+        return submit_job(
+            "ekasa_import",
+            receipts_service.import_receipt_from_ekasa,
+            payload,
+            user_id=g.current_user.id,
+        )
     result = receipts_service.import_receipt_from_ekasa(
         payload,
         user_id=g.current_user.id,
@@ -229,6 +341,63 @@ def api_receipts_import_ekasa():
     return result.to_flask_response()
 
 
+@bp.post("/receipts/import-ekasa/batch", strict_slashes=False)
+@rate_limit(limit=30, per=60, scope="ekasa_import")
+def api_receipts_import_ekasa_batch():
+    """
+    Import several eKasa receipts for the authenticated user in one request.
+
+    Lookups run concurrently; receipts already imported are reported as
+    duplicates and the rest are stored in a single transaction.
+
+    Request:
+      {
+        "receipt_ids": [str],            # at most EKASA_BATCH_MAX entries
+        "account_id": "uuid | omitted"
+      }
+
+    Query:
+      async: "true" to import in the background (optional)
+
+    Responses:
+      200: {
+             "data": {
+               "results": [{
+                 "receipt_id": str,
+                 "status": "imported" | "duplicate" | "error",
+                 "id": "uuid | omitted",
+                 "tag": "str | null | omitted",
+                 "total_items": "int | omitted",
+                 "error": "{code, message} | omitted"
+               }],
+               "summary": {"imported": int, "duplicate": int, "error": int}
+             },
+             "error": null
+           }
+      202: {"data": Job, "error": null}  # async=true, see /api/jobs
+      400: see module errors
+      403: see module errors
+      429: see module errors
+    """
+    payload = parse_json_object_body()
+    max_size = current_app.config.get("EKASA_BATCH_MAX", 50)
+    if async_requested():
+        validate_ekasa_batch_data(payload, max_size)
+        return submit_job(
+            "ekasa_import_batch",
+            receipts_service.import_receipts_from_ekasa_batch,
+            payload,
+            user_id=g.current_user.id,
+            max_size=max_size,
+        )
+    result = receipts_service.import_receipts_from_ekasa_batch(
+        payload,
+        user_id=g.current_user.id,
+        max_size=max_size,
+    )
+    return result.to_flask_response()
+
+
 @bp.get("/receipts/ekasa-items", strict_slashes=False)
 def api_receipts_ekasa_items():
     """
@@ -238,9 +407,19 @@ def api_receipts_ekasa_items():
       year: int | omitted
       month: int | omitted
       account_id: "uuid | omitted"
+      limit: int 1..200 | omitted
+      cursor: "str | omitted" (next_cursor of the previous page)
+      format: "json" | "ndjson" (default: "json")
+
+    Checks are ordered oldest first. Without limit/cursor all of them are
+    returned at once; with either of them the response is a single keyset
+    page, follow next_cursor until it is null. With format=ndjson the body
+    is streamed as application/x-ndjson, one check object per line and
+    without the response envelope, as receipts are read from the database.
 
     Responses:
-      200: {"data": EkasaChecks, "error": null}
+      200: {"data": EkasaChecks | EkasaChecksPage, "error": null}
+           or application/x-ndjson with one check per line
       400: see module errors
       403: see module errors
     """
@@ -254,9 +433,37 @@ def api_receipts_ekasa_items():
         required=False,
     )
 
+    output = request.args.get("format", "json").lower()
+    if output not in ("json", "ndjson"):
+        raise BadRequestError("format must be json or ndjson")
+
+    if output == "ndjson":
+        if "limit" in request.args or "cursor" in request.args:
+            raise BadRequestError("limit and cursor cannot be combined with format=ndjson")
+        checks = receipts_service.iter_ekasa_items(
+            month_filter=month_filter,
+            user_id=g.current_user.id,
+            account_id=account_id,
+        )
+        dumps = current_app.json.dumps
+        return Response(
+            stream_with_context(f"{dumps(check)}\n" for check in checks),
+            mimetype="application/x-ndjson",
+        )
+
+    limit = None
+    if "limit" in request.args or "cursor" in request.args:
+        limit = parse_limit_query(
+            request.args.get("limit"),
+            default=DEFAULT_PAGE_LIMIT,
+            maximum=MAX_PAGE_LIMIT,
+        )
+
     result = receipts_service.get_ekasa_items(
         month_filter=month_filter,
         user_id=g.current_user.id,
         account_id=account_id,
+        limit=limit,
+        cursor=request.args.get("cursor") or None,
     )
     return result.to_flask_response()
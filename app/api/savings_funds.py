@@ -48,11 +48,12 @@ import uuid
 
 from flask import current_app, g
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.api.request_parsing import parse_json_object_body
 from app.services import savings_funds_service
 
 @bp.get("/savings/summary", strict_slashes=False)
+@conditional_get
 def api_savings_summary():
     """
     Top-level summary data for savings page.
@@ -71,6 +72,7 @@ def api_savings_summary():
 
 
 @bp.get("/funds", strict_slashes=False)
+@conditional_get
 def api_funds_list():
     """
     List funds for carousel navigation.
@@ -84,6 +86,7 @@ def api_funds_list():
 
 
 @bp.get("/funds/<uuid:fund_id>", strict_slashes=False)
+@conditional_get
 def api_funds_get(fund_id: uuid.UUID):
     """
     Get one fund for carousel navigation.
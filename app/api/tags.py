@@ -30,13 +30,14 @@ import uuid
 
 from flask import g
 
-from app.api import bp
+from app.api import bp, conditional_get
 from app.api.request_parsing import parse_json_object_body
 from app.models.tag import TagType
 from app.services import tags_service
 
 
 @bp.get("/tags/income", strict_slashes=False)
+@conditional_get
 def api_tags_income_list():
     """
     List income-related tags for the authenticated user.
@@ -49,6 +50,7 @@ def api_tags_income_list():
 
 
 @bp.get("/tags/expense", strict_slashes=False)
+@conditional_get
 def api_tags_expense_list():
     """
     List expense-related tags for the authenticated user.
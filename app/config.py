@@ -9,6 +9,107 @@ class BaseConfig:
     IMPORT_XLSX_PATH = os.getenv("IMPORT_XLSX_PATH", "/mnt/data/BugetAppTP.xlsx")
     MAX_SAVINGS_FUNDS = int(os.getenv("MAX_SAVINGS_FUNDS", "10"))
 
+    # In-process cache of resolved session tokens (see
+    # app/services/token_cache.py). The TTL bounds how long a token revoked
+    # by another worker can still be accepted; set either value to 0 to
+    # disable the cache.
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+    AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+
+    # Size of the thread pool QR decoder attempts are spread over
+    # (1 = decode sequentially on the request thread). Defaults to the
+    # number of CPUs, capped at 4.
+    QR_DECODE_WORKERS = int(os.getenv("QR_DECODE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Decoder processes per app process (0 = decode on the thread pool
+    # above). Decoding in processes keeps it off the GIL the app's request
+    # threads share; an attempt running longer than the timeout (seconds)
+    # abandons the scan and replaces the stuck process.
+    QR_DECODE_PROCESSES = int(os.getenv("QR_DECODE_PROCESSES", str(min(2, os.cpu_count() or 1))))
+    QR_DECODE_TASK_TIMEOUT = float(os.getenv("QR_DECODE_TASK_TIMEOUT", "10"))
+
+    # eKasa API client (see app/services/ekasa_service.py): keep-alive
+    # connection pool size, retries with exponential backoff for transient
+    # failures, and how many receipt payloads to cache per process.
+    EKASA_URL = os.getenv("EKASA_URL", "https://ekasa.financnasprava.sk/mdu/api/v1/opd/receipt/find")
+    EKASA_TIMEOUT = float(os.getenv("EKASA_TIMEOUT", "10"))
+    EKASA_POOL_SIZE = int(os.getenv("EKASA_POOL_SIZE", "10"))
+    EKASA_MAX_RETRIES = int(os.getenv("EKASA_MAX_RETRIES", "2"))
+    EKASA_RETRY_BACKOFF = float(os.getenv("EKASA_RETRY_BACKOFF", "0.3"))
+    EKASA_CACHE_SIZE = int(os.getenv("EKASA_CACHE_SIZE", "256"))
+    # Upper bound on receipt IDs accepted by POST /api/receipts/import-ekasa/batch.
+    EKASA_BATCH_MAX = int(os.getenv("EKASA_BATCH_MAX", "50"))
+
+    # Background jobs for ``?async=true`` QR decoding and eKasa imports
+    # (see app/services/job_queue.py). The local backend keeps jobs in the
+    # memory of the process that accepted them, so polls answered by another
+    # worker cannot find them: enable async mode only with a single worker
+    # process. While off, ``?async=true`` is answered with 400.
+    JOBS_ENABLED = os.getenv("JOBS_ENABLED", "false").lower() == "true"
+    JOBS_BACKEND = os.getenv("JOBS_BACKEND", "local")
+    JOBS_CPU_WORKERS = int(os.getenv("JOBS_CPU_WORKERS", "2"))
+    JOBS_IO_WORKERS = int(os.getenv("JOBS_IO_WORKERS", "4"))
+    JOBS_MAX_PENDING = int(os.getenv("JOBS_MAX_PENDING", "100"))
+    JOBS_RESULT_TTL = int(os.getenv("JOBS_RESULT_TTL", "600"))
+    # Longest long-poll accepted by GET /api/jobs/<id>?wait=<seconds>.
+    JOBS_MAX_WAIT = float(os.getenv("JOBS_MAX_WAIT", "30"))
+
+    # Request rate limits (see app/services/rate_limiter.py). Counters live
+    # in-process (bounded to RATE_LIMIT_MAX_KEYS clients per worker) unless
+    # RATE_LIMIT_STORAGE_URL points at a Redis-protocol server, e.g.
+    # redis://redis:6379/0, which all workers then share.
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_STORAGE_URL = os.getenv("RATE_LIMIT_STORAGE_URL", "")
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+    RATE_LIMIT_KEY_PREFIX = os.getenv("RATE_LIMIT_KEY_PREFIX", "rate-limit:")
+    # Number of reverse proxies in front of the app whose X-Forwarded-For
+    # entry is trusted; needed for per-client limits behind nginx.
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+    # Per-endpoint request timing and SQL counts (see
+    # app/services/metrics_service.py), served in the Prometheus text format
+    # by GET /api/diagnostics/metrics. A scraper authenticates with
+    # METRICS_TOKEN as a bearer token (session tokens are refused, and the
+    # diagnostics endpoints answer 403 while it is unset).
+    # METRICS_SERVER_TIMING adds a Server-Timing header to every API response.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "false").lower() == "true"
+
+    # N+1 query detection: every API request records the shape of the SQL
+    # statements it runs, and one that repeats a shape QUERY_REPEAT_THRESHOLD
+    # times or more is logged as a warning. On in development and tests
+    # (where tests/conftest.py also fails the test); costs a regex per
+    # statement, so leave it off in production.
+    QUERY_INSPECTION = os.getenv("QUERY_INSPECTION", "false").lower() == "true"
+    QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+    # Request size limits for POST /api/receipts/bulk.
+    RECEIPTS_BULK_MAX = int(os.getenv("RECEIPTS_BULK_MAX", "100"))
+    RECEIPT_ITEMS_BULK_MAX = int(os.getenv("RECEIPT_ITEMS_BULK_MAX", "2000"))
+
+    # Database connection pool and session tuning (see
+    # app/services/database_service.py). Pool options apply to server
+    # databases only; SQLite keeps Flask-SQLAlchemy's defaults.
+    # DB_STATEMENT_TIMEOUT_MS=0 disables the per-transaction timeout, and
+    # DB_PGBOUNCER=true turns off server-side prepared statements for
+    # PgBouncer transaction pooling.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "false").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+    # Opt-in SQLite tuning for development and single-node deployments:
+    # WAL journal, synchronous=NORMAL, mmap, a larger page cache, in-memory
+    # temp storage and a busy timeout (see app/services/database_service.py).
+    SQLITE_PERFORMANCE_PROFILE = os.getenv("SQLITE_PERFORMANCE_PROFILE", "false").lower() == "true"
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
     # Google OAuth configuration. Set ``GOOGLE_CLIENT_ID`` to the client ID
     # obtained from the Google Developer Console. When provided, the
     # application will validate ID tokens sent from the client against this
@@ -22,6 +123,7 @@ class BaseConfig:
 
 class DevConfig(BaseConfig):
     DEBUG = True
+    QUERY_INSPECTION = os.getenv("QUERY_INSPECTION", "true").lower() == "true"
 
     # Use a SQLite database stored inside the Flask instance directory.
     # The file will be created at: <project_root>/instance/dev.db
@@ -31,6 +133,9 @@ class DevConfig(BaseConfig):
 class TestConfig(BaseConfig):
     TESTING = True
     WTF_CSRF_ENABLED = False
+    QR_DECODE_PROCESSES = 0
+    QUERY_INSPECTION = True
+    JOBS_ENABLED = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
 
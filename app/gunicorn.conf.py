@@ -0,0 +1,69 @@
+"""Gunicorn settings for the production backend.
+
+Start with ``gunicorn -c app/gunicorn.conf.py`` (the Docker entrypoint does
+this when ``APP_SERVER=gunicorn``). Every value can be overridden through
+the environment variables below or ``GUNICORN_CMD_ARGS``.
+
+Worker model: pre-forked processes running the ``gthread`` worker. Most
+slow requests block on I/O (eKasa lookups, PostgreSQL) or on QR decoding
+in C extensions that release the GIL, so a few threads per process keep
+the CPU busy without the monkey-patching an async worker would need.
+
+The app is built once in the master (``preload_app``) and inherited by
+the workers, so boot cost is paid once. The SQLAlchemy pool is reset in
+each worker after the fork so no connection is shared between processes.
+
+Reloads: ``kill -HUP <master>`` restarts workers gracefully with the
+current code and re-reads this file. With ``preload_app`` new code is
+picked up only by a new master, so deploy by restarting the container, or
+use ``USR2`` followed by ``WINCH``/``QUIT`` on the old master for a
+zero-downtime upgrade.
+"""
+
+import multiprocessing
+import os
+
+
+def _int_env(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+wsgi_app = "app.wsgi:app"
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = _int_env("GUNICORN_WORKERS", max(2, multiprocessing.cpu_count()))
+threads = _int_env("GUNICORN_THREADS", 4)
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# An eKasa import may wait for several retried upstream calls
+# (EKASA_TIMEOUT x (1 + EKASA_MAX_RETRIES) plus backoff).
+timeout = _int_env("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _int_env("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _int_env("GUNICORN_KEEPALIVE", 5)
+
+# Recycle workers periodically to bound memory growth; the jitter keeps
+# them from restarting all at once.
+max_requests = _int_env("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _int_env("GUNICORN_MAX_REQUESTS_JITTER", 200)
+
+# Set GUNICORN_ACCESSLOG to an empty value to turn access logging off.
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Connections opened in the master (e.g. by create_all) must not be
+    # reused by several processes; drop them without closing the sockets
+    # the master still owns.
+    from app.extensions import db
+
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+
+    # Start this worker's QR decoder processes now rather than on the
+    # first upload, so no request waits for them to import OpenCV.
+    flask_app.extensions["qr_service"].warm_up()
@@ -6,6 +6,7 @@ from .category import Category
 from .financial_target import FinancialTarget
 from .goal import Goal
 from .income import Income
+from .monthly_rollup import MonthlyRollup
 from .receipt import Receipt
 from .receipt_item import ReceiptItem
 from .savings_fund import SavingsFund
@@ -25,6 +26,7 @@ __all__ = [
     "FinancialTarget",
     "Goal",
     "Income",
+    "MonthlyRollup",
     "Receipt",
     "ReceiptItem",
     "Tag",
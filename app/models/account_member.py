@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -39,6 +39,8 @@ class AccountMember(Base):
     __tablename__ = 'account_members'
     __table_args__ = (
         UniqueConstraint('user_id', 'account_id', name='uq_account_members_user_account'),
+        # Main-account resolution: a user's memberships, oldest first.
+        Index('ix_account_members_user_created_at', 'user_id', 'created_at'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -24,7 +24,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, String, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,6 +36,12 @@ if TYPE_CHECKING:
 
 class AuthToken(Base):
     __tablename__ = "auth_tokens"
+    __table_args__ = (
+        # Lookups by token use the unique constraint's index. This one keeps
+        # the ON DELETE CASCADE from users (and any per-user token query)
+        # off a full scan of the table.
+        Index("ix_auth_tokens_user_expires_at", "user_id", "expires_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
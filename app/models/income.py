@@ -5,7 +5,7 @@ from decimal import Decimal
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Date, Numeric, Text
+from sqlalchemy import ForeignKey, Date, Index, Numeric, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,8 +34,15 @@ class Income(Base):
             The user associated with this income record. Each user can have multiple income entries.
         tag (Tag | None): Many-to-One relationship.
             Optional tag associated with this income record.
+
+    Columns that feed ``monthly_rollups`` keep ``active_history`` so the
+    rollup maintenance hooks always see the value being replaced.
     """
     __tablename__ = 'incomes'
+    __table_args__ = (
+        # Month listings of GET /api/incomes and the rollup rebuild.
+        Index('ix_incomes_user_income_date', 'user_id', 'income_date'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -46,13 +53,15 @@ class Income(Base):
         UUID(as_uuid=True),
         ForeignKey('users.id'),
         nullable=False,
-        index=True
+        index=True,
+        active_history=True
     )
     tag_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('tags.id'),
         nullable=True,
-        index=True
+        index=True,
+        active_history=True
     )
 
     description: Mapped[str] = mapped_column(
@@ -60,8 +69,8 @@ class Income(Base):
         nullable=False
     )
 
-    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
-    income_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, active_history=True)
+    income_date: Mapped[date] = mapped_column(Date, nullable=False, index=True, active_history=True)
     extra_metadata: Mapped[dict | None] = mapped_column(JSONType(), nullable=True)
 
     """ Relationships """
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MonthlyRollup(Base):
+    """Pre-aggregated monthly totals of incomes, receipts and receipt items.
+
+    One row holds the sums for a (user, account, month, category, tag)
+    combination and is kept up to date on every ORM flush that touches
+    incomes, receipts or receipt items (see
+    :mod:`app.services.monthly_rollups_service`), so summary endpoints can
+    read a handful of rows instead of scanning a month of transactions. The table is derived data: it can
+    be rebuilt from the source tables at any time (``python -m
+    scripts.monthly_rollups rebuild``).
+
+    Receipt and income totals live on rows without a category (neither is
+    categorized); item totals are spread over the categories of the items.
+    ``account_id``, ``category_id`` and ``tag_id`` deliberately have no
+    foreign keys: rows are dropped or re-keyed when an account, category
+    or tag is deleted.
+
+    Attributes:
+        id (uuid.UUID): Unique identifier for the row.
+        user_id (uuid.UUID): Owner of the aggregated records.
+        account_id (uuid.UUID | None): Account of the receipts; null for incomes.
+        month (date): First day of the aggregated month.
+        category_id (uuid.UUID | None): Category of the aggregated receipt items.
+        tag_id (uuid.UUID | None): Tag of the aggregated receipts or incomes.
+        income_amount (Decimal): Sum of ``incomes.amount``.
+        income_count (int): Number of incomes.
+        receipt_amount (Decimal): Sum of ``receipts.total_amount``.
+        receipt_count (int): Number of receipts.
+        item_amount (Decimal): Sum of ``receipt_items.total_price``.
+        item_count (int): Number of receipt items.
+    """
+    __tablename__ = 'monthly_rollups'
+    __table_args__ = (
+        Index('ix_monthly_rollups_user_month', 'user_id', 'month'),
+        Index('ix_monthly_rollups_category_month', 'category_id', 'month'),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey('users.id'),
+        nullable=False
+    )
+    account_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    month: Mapped[date] = mapped_column(Date, nullable=False)
+    category_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    tag_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    income_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    income_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    receipt_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    receipt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    item_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return (
+            f"<MonthlyRollup {self.month} user_id={self.user_id} account_id={self.account_id} "
+            f"category_id={self.category_id} tag_id={self.tag_id}>"
+        )
@@ -4,7 +4,7 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, Text, func
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Numeric, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,8 +49,18 @@ class Receipt(Base):
         items (list[ReceiptItem]): One-to-Many relationship.
             The list of receipt items associated with this receipt. Each item
             belongs to exactly one receipt.
+
+    Columns that feed ``monthly_rollups`` keep ``active_history`` so the
+    rollup maintenance hooks always see the value being replaced.
     """
     __tablename__ = 'receipts'
+    __table_args__ = (
+        # Keyset pagination of GET /api/receipts walks these in either direction.
+        Index('ix_receipts_user_issue_date_id', 'user_id', 'issue_date', 'id'),
+        Index('ix_receipts_user_total_amount_id', 'user_id', 'total_amount', 'id'),
+        # Per-account month scans: donut analytics, account-filtered listings.
+        Index('ix_receipts_user_account_issue_date', 'user_id', 'account_id', 'issue_date'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -66,19 +76,22 @@ class Receipt(Base):
         UUID(as_uuid=True),
         ForeignKey('users.id'),
         nullable=False,
-        index=True
+        index=True,
+        active_history=True
     )
     account_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('accounts.id', ondelete='CASCADE'),
         nullable=False,
-        index=True
+        index=True,
+        active_history=True
     )
     tag_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('tags.id'),
         nullable=True,
-        index=True
+        index=True,
+        active_history=True
     )
 
     description: Mapped[str] = mapped_column(
@@ -89,11 +102,13 @@ class Receipt(Base):
     issue_date: Mapped[date] = mapped_column(
         Date,
         nullable=False,
-        index=True
+        index=True,
+        active_history=True
     )
     total_amount: Mapped[float] = mapped_column(
         Numeric(14, 2),
-        nullable=False
+        nullable=False,
+        active_history=True
     )
     extra_metadata: Mapped[dict | None] = mapped_column(
         JSONType(),
@@ -4,7 +4,7 @@ import uuid
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Text, Numeric
+from sqlalchemy import ForeignKey, Index, Text, Numeric
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -41,8 +41,15 @@ class ReceiptItem(Base):
             The category assigned to this item. May be null if uncategorized.
         receipt (Receipt): Many-to-One relationship.
             The receipt this item belongs to. Each receipt can contain multiple items.
+
+    Columns that feed ``monthly_rollups`` keep ``active_history`` so the
+    rollup maintenance hooks always see the value being replaced.
     """
     __tablename__ = 'receipt_items'
+    __table_args__ = (
+        # Items of a receipt grouped by category (donut analytics, rollups).
+        Index('ix_receipt_items_receipt_category', 'receipt_id', 'category_id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -53,7 +60,8 @@ class ReceiptItem(Base):
         UUID(as_uuid=True),
         ForeignKey('receipts.id'),
         nullable=False,
-        index=True
+        index=True,
+        active_history=True
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -65,13 +73,14 @@ class ReceiptItem(Base):
         UUID(as_uuid=True),
         ForeignKey('categories.id'),
         index=True,
-        nullable=True
+        nullable=True,
+        active_history=True
     )
 
     name: Mapped[str] = mapped_column(Text, nullable=False)
     quantity: Mapped[Decimal] = mapped_column(Numeric(12, 3), nullable=False, default=1)
     unit_price: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
-    total_price: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    total_price: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, active_history=True)
     extra_metadata: Mapped[dict | None] = mapped_column(JSONType(), nullable=True)
 
     """ Relationships """
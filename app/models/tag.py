@@ -3,9 +3,9 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Text, Enum, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Text, Enum, Integer, ForeignKey, UniqueConstraint, select
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 
 from .base import Base
 from app.utils.types import TagType
@@ -96,6 +96,27 @@ class Tag(Base):
         if self.counter > 0:
             self.counter -= 1
 
+    def linked_record_kinds(self) -> tuple[bool, bool]:
+        """Return ``(has_receipts, has_incomes)`` without loading either collection.
+
+        Persistent tags are answered with a single ``EXISTS`` query (after the
+        usual autoflush, so pending assignments and deletions are seen);
+        receipts and incomes are indexed by ``tag_id``, so the cost does not
+        grow with the tag's usage. Tags outside a session fall back to the
+        in-memory collections.
+        """
+        session = object_session(self)
+        if session is None:
+            return bool(self.receipts), bool(self.incomes)
+
+        cls = type(self)
+        row = session.execute(
+            select(cls.receipts.any(), cls.incomes.any()).where(cls.id == self.id)
+        ).one_or_none()
+        if row is None:
+            return False, False
+        return bool(row[0]), bool(row[1])
+
     def update_type(self) -> None:
         """Auto-detect and update tag type based on current relationships.
 
@@ -103,10 +124,9 @@ class Tag(Base):
         - Only receipts exist: TagType.EXPENSE
         - Only incomes exist: TagType.INCOME
         - Both receipts and incomes exist: TagType.BOTH
-        - Neither exist: None
+        - Neither exist: TagType.BOTH
         """
-        has_receipts = len(self.receipts) > 0
-        has_incomes = len(self.incomes) > 0
+        has_receipts, has_incomes = self.linked_record_kinds()
 
         if has_receipts and has_incomes:
             self.type = TagType.BOTH
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, String, func, Boolean
+from sqlalchemy import DateTime, Integer, String, func, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,6 +33,8 @@ class User(Base):
         email (str): The unique email address of the user, up to 255 characters.
         password_hash (str): The hashed password for authentication.
         created_at (datetime.datetime): The UTC timestamp when the user record was created.
+        data_version (int): Incremented whenever data visible to this user changes;
+            read endpoints derive their ``ETag`` from it.
 
     Relationships:
         incomes (list[Income]): One-to-Many relationship (cascade delete).
@@ -93,6 +95,11 @@ class User(Base):
         Boolean, default=False, nullable=False
     )
 
+    # Maintained by app.services.data_version_service from the ORM flush.
+    data_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default='0'
+    )
+
     """ Relationships """
     incomes: Mapped[list["Income"]] = relationship(
         "Income", back_populates="user", cascade="all, delete-orphan"
@@ -1,5 +1,28 @@
 #!/bin/sh
 set -e
 
+# APP_SERVER selects how the backend is served:
+#   gunicorn - pre-forked production server (app/gunicorn.conf.py)
+#   flask    - single-process development server (python -m app.run)
+# It defaults to gunicorn when APP_ENV=production and flask otherwise.
+if [ -z "$APP_SERVER" ]; then
+    if [ "$APP_ENV" = "production" ]; then
+        APP_SERVER=gunicorn
+    else
+        APP_SERVER=flask
+    fi
+fi
+
+# RUN_MIGRATIONS=true applies pending Alembic migrations before start-up.
+if [ "$RUN_MIGRATIONS" = "true" ]; then
+    echo "Applying database migrations..."
+    flask --app app db upgrade
+fi
+
+if [ "$APP_SERVER" = "gunicorn" ]; then
+    echo "Starting gunicorn..."
+    exec gunicorn -c app/gunicorn.conf.py
+fi
+
 echo "Starting Flask application..."
 exec python -m app.run
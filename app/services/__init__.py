@@ -1,5 +1,8 @@
+from . import database_service, ekasa_service, metrics_service
 from .auth_service import AuthService
+from .job_queue import build_job_queue
 from .qr_service import QrService
+from .rate_limiter import build_rate_limiter
 
 def init_auth_service(app):
     """Register the database-backed authentication service on the Flask app."""
@@ -10,6 +13,54 @@ def init_auth_service(app):
 
 def init_qr_service(app):
     """Register the QR extraction service on the Flask app."""
-    qr_service = QrService()
+    qr_service = QrService(
+        max_workers=app.config.get("QR_DECODE_WORKERS", 4),
+        processes=app.config.get("QR_DECODE_PROCESSES", 0),
+        task_timeout=app.config.get("QR_DECODE_TASK_TIMEOUT", 10),
+    )
     app.extensions["qr_service"] = qr_service
     return qr_service
+
+
+def init_job_queue(app):
+    """Register the background job queue on the Flask app."""
+    job_queue = build_job_queue(app)
+    app.extensions["job_queue"] = job_queue
+    return job_queue
+
+
+def init_rate_limiter(app):
+    """Register the request rate limiter backend on the Flask app."""
+    limiter = build_rate_limiter(app.config)
+    app.extensions["rate_limiter"] = limiter
+    return limiter
+
+
+def init_ekasa_client(app):
+    """Configure the process-wide eKasa API client from the app config."""
+    client = ekasa_service.configure_client(
+        url=app.config.get("EKASA_URL", ekasa_service.EKASA_URL),
+        timeout=app.config.get("EKASA_TIMEOUT", 10),
+        pool_size=app.config.get("EKASA_POOL_SIZE", 10),
+        max_retries=app.config.get("EKASA_MAX_RETRIES", 2),
+        backoff_factor=app.config.get("EKASA_RETRY_BACKOFF", 0.3),
+        cache_size=app.config.get("EKASA_CACHE_SIZE", 256),
+    )
+    app.extensions["ekasa_client"] = client
+    return client
+
+
+def init_engine_options(app):
+    """Derive ``SQLALCHEMY_ENGINE_OPTIONS`` from the ``DB_*`` settings; call before ``db.init_app``."""
+    database_service.configure_engine_options(app)
+
+
+def init_engine_hooks(app, engine):
+    """Attach pool statistics, the statement timeout and SQL timing to the app's engine."""
+    database_service.install_engine_hooks(app, engine)
+    metrics_service.install_engine_hooks(engine)
+
+
+def init_request_metrics(app):
+    """Time API requests and collect per-endpoint metrics (see metrics_service)."""
+    metrics_service.install_request_hooks(app)
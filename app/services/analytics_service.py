@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import uuid
+from decimal import Decimal
 
 from sqlalchemy import func
 
@@ -16,52 +17,22 @@ def get_donut_data(
     user_id: uuid.UUID,
     month_filter: MonthYearFilter,
 ):
+    """Spending breakdown for the donut chart.
+
+    One grouped scan at (category, tag, issue date) granularity feeds all
+    three views; the category sums and the grand total are rolled up from
+    those rows in a single pass instead of re-scanning ``receipt_items``.
+    """
     account = accounts_service.find_main_account(user_id)
     start, end = month_filter.range()
 
-    # TOTAL
-    total_q = (
-        db.session.query(func.coalesce(func.sum(ReceiptItem.total_price), 0))
-        .join(Receipt, ReceiptItem.receipt_id == Receipt.id)
-        .filter(Receipt.user_id == user_id)
-        .filter(Receipt.account_id == account.id)
-    )
-    if start is not None and end is not None:
-        total_q = total_q.filter(Receipt.issue_date >= start, Receipt.issue_date < end)
-
-    total_amount = float(total_q.scalar() or 0.0)
-
-    # CATEGORIES
-    cat_q = (
-        db.session.query(
-            func.coalesce(Category.name, "Uncategorized").label("category"),
-            func.coalesce(func.sum(ReceiptItem.total_price), 0).label("amount"),
-        )
-        .join(Receipt, ReceiptItem.receipt_id == Receipt.id)
-        .outerjoin(Category, ReceiptItem.category_id == Category.id)
-        .filter(Receipt.user_id == user_id)
-        .filter(Receipt.account_id == account.id)
-        .group_by(func.coalesce(Category.name, "Uncategorized"))
-        .order_by(func.coalesce(func.sum(ReceiptItem.total_price), 0).desc())
-    )
-    if start is not None and end is not None:
-        cat_q = cat_q.filter(Receipt.issue_date >= start, Receipt.issue_date < end)
-
-    categories = []
-    for category, amount in cat_q.all():
-        amount_f = float(amount or 0.0)
-        percentage = (amount_f / total_amount * 100.0) if total_amount > 0 else 0.0
-        categories.append({
-            "category": category,
-            "amount": round(amount_f, 2),
-            "percentage": round(percentage, 1),
-        })
+    category_col = func.coalesce(Category.name, "Uncategorized")
+    tag_col = func.coalesce(Tag.name, "No tag")
 
-    # TAGS_BY_CATEGORY: category -> tag -> date -> sum
     detail_q = (
         db.session.query(
-            func.coalesce(Category.name, "Uncategorized").label("category"),
-            func.coalesce(Tag.name, "No tag").label("tag"),
+            category_col.label("category"),
+            tag_col.label("tag"),
             Receipt.issue_date.label("issue_date"),
             func.coalesce(func.sum(ReceiptItem.total_price), 0).label("amount"),
         )
@@ -70,26 +41,36 @@ def get_donut_data(
         .outerjoin(Tag, Receipt.tag_id == Tag.id)
         .filter(Receipt.user_id == user_id)
         .filter(Receipt.account_id == account.id)
-        .group_by(
-            func.coalesce(Category.name, "Uncategorized"),
-            func.coalesce(Tag.name, "No tag"),
-            Receipt.issue_date,
-        )
-        .order_by(
-            func.coalesce(Category.name, "Uncategorized").asc(),
-            func.coalesce(Tag.name, "No tag").asc(),
-            Receipt.issue_date.asc(),
-        )
+        .group_by(category_col, tag_col, Receipt.issue_date)
+        .order_by(category_col.asc(), tag_col.asc(), Receipt.issue_date.asc())
     )
     if start is not None and end is not None:
         detail_q = detail_q.filter(Receipt.issue_date >= start, Receipt.issue_date < end)
 
+    total = Decimal("0")
+    category_totals: dict[str, Decimal] = {}
+    # TAGS_BY_CATEGORY: category -> tag -> date -> sum
     tags_by_category: dict[str, dict[str, dict[str, float]]] = {}
 
     for category, tag, issue_date, amount in detail_q.all():
+        amount = Decimal(str(amount or 0))
+        total += amount
+        category_totals[category] = category_totals.get(category, Decimal("0")) + amount
         tags_by_category.setdefault(category, {})
         tags_by_category[category].setdefault(tag, {})
-        tags_by_category[category][tag][issue_date.isoformat()] = round(float(amount or 0.0), 2)
+        tags_by_category[category][tag][issue_date.isoformat()] = round(float(amount), 2)
+
+    total_amount = float(total)
+
+    categories = []
+    for category, amount in sorted(category_totals.items(), key=lambda kv: (-kv[1], kv[0])):
+        amount_f = float(amount)
+        percentage = (amount_f / total_amount * 100.0) if total_amount > 0 else 0.0
+        categories.append({
+            "category": category,
+            "amount": round(amount_f, 2),
+            "percentage": round(percentage, 1),
+        })
 
     return OkResult({
         "year": month_filter.year,
@@ -19,11 +19,13 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
 from flask import current_app
+from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from app.extensions import db
 from app.models import User, AuthToken, EmailVerification
 from app.services.errors import BadRequestError, ConflictError, UnauthorizedError
+from app.services.token_cache import AuthenticatedUser, TokenCache
 from app.services.users_service import create_user_with_main_account
 
 
@@ -45,6 +47,12 @@ class AuthService:
 
     def __init__(self, app):
         self.app = app
+        # Resolved tokens are cached per process so the authentication
+        # hook does not hit the database on every API request.
+        self.token_cache = TokenCache(
+            max_size=app.config.get("AUTH_TOKEN_CACHE_SIZE", 1024),
+            ttl_seconds=app.config.get("AUTH_TOKEN_CACHE_TTL", 60),
+        )
 
     # ------------------------------------------------------------------
     # Password utilities
@@ -171,16 +179,31 @@ class AuthService:
         if tok is not None:
             db.session.delete(tok)
             db.session.commit()
+        # Only after the commit: a concurrent lookup could re-cache the row otherwise.
+        self.token_cache.invalidate(token_str)
 
-    def verify_token(self, token_str: str) -> Optional[User]:
+    def verify_token(self, token_str: str) -> Optional[AuthenticatedUser]:
         """Look up and validate a token.
 
-        Returns the associated user if the token exists and is not
-        expired; otherwise returns None.
+        Returns a snapshot of the associated user if the token exists and
+        is not expired; otherwise returns None. Successful lookups are
+        served from :attr:`token_cache` until its TTL elapses; a miss
+        resolves the token and its user with a single joined query.
         """
         if not token_str:
             return None
-        tok = db.session.execute(db.select(AuthToken).filter_by(token=token_str)).scalar()
+        cached = self.token_cache.get(token_str)
+        if cached is not None:
+            user, expires_at = cached
+            if datetime.utcnow() < expires_at:
+                return user
+            # Expired while cached: fall through so the row is cleaned up.
+            self.token_cache.invalidate(token_str)
+        tok = db.session.execute(
+            db.select(AuthToken)
+            .options(joinedload(AuthToken.user))
+            .filter_by(token=token_str)
+        ).scalar()
         if tok is None:
             return None
         if tok.is_expired():
@@ -188,7 +211,9 @@ class AuthService:
             db.session.delete(tok)
             db.session.commit()
             return None
-        return tok.user
+        user = AuthenticatedUser.from_user(tok.user)
+        self.token_cache.put(token_str, user, tok.expires_at)
+        return user
 
     # ------------------------------------------------------------------
     # Email verification
@@ -218,6 +243,7 @@ class AuthService:
                 ver.is_used = True
                 user.is_verified = True
                 db.session.commit()
+                self.token_cache.invalidate_user(user.id)
                 return True
         return False
 
@@ -246,6 +272,7 @@ class AuthService:
             return None
         # Look up existing user by email
         user = db.session.execute(db.select(User).filter_by(email=email_normalized)).scalar()
+        newly_verified = False
         if user is None:
             # Create a new user record. Use the local part of the email as the
             # base for the username and ensure uniqueness. Because the user
@@ -266,12 +293,16 @@ class AuthService:
             # For an existing user, ensure the account is marked as verified.
             if not user.is_verified:
                 user.is_verified = True
+                newly_verified = True
         # Issue a new session token, similar to the normal login flow
         token_value = secrets.token_urlsafe(32)
         expires_at = datetime.utcnow() + timedelta(seconds=self.TOKEN_LIFETIME)
         token = AuthToken(user_id=user.id, token=token_value, expires_at=expires_at)
         db.session.add(token)
         db.session.commit()
+        if newly_verified:
+            # After the commit, so a concurrent lookup cannot cache the stale snapshot.
+            self.token_cache.invalidate_user(user.id)
         return token_value
 
     # ------------------------------------------------------------------
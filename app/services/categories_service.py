@@ -1,9 +1,10 @@
 import uuid
 
-from sqlalchemy import func, or_
+from sqlalchemy import or_
 
 from app.extensions import db
-from app.models import Category, Receipt, ReceiptItem
+from app.models import Category
+from app.services import monthly_rollups_service
 from app.services.errors import NotFoundError
 from app.services.responses import CreatedResult, OkResult
 from app.validators.common_validators import MonthYearFilter
@@ -100,18 +101,7 @@ def get_category_monthly_limit(category_id: uuid.UUID, month_filter: MonthYearFi
     if not category or (category.user_id is not None and category.user_id != user_id):
         raise NotFoundError("Category not found")
 
-    spent_q = (
-        db.session.query(func.coalesce(func.sum(ReceiptItem.total_price), 0))
-        .join(Receipt, ReceiptItem.receipt_id == Receipt.id)
-        .filter(
-            ReceiptItem.category_id == category_id,
-            Receipt.user_id == user_id,
-            Receipt.issue_date >= start,
-            Receipt.issue_date < end,
-        )
-    )
-
-    spent = round(float(spent_q.scalar() or 0), 2)
+    spent = round(float(monthly_rollups_service.get_category_spent(user_id, category_id, start, end)), 2)
 
     return OkResult({
         "year": month_filter.year,
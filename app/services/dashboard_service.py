@@ -1,10 +1,7 @@
 import uuid
 from datetime import date
 
-from sqlalchemy import func
-
-from app.extensions import db
-from app.models import Income, Receipt
+from app.services import monthly_rollups_service
 from app.services.responses import OkResult
 from app.validators.common_validators import MonthYearFilter, validate_month_year_filter
 
@@ -17,6 +14,7 @@ def get_month_summary(
     Return total incomes and total expenses for selected month/year.
     If year/month are not provided -> current month.
     If only one is provided -> error (same rule as other endpoints).
+    Totals are read from ``monthly_rollups``.
     """
 
     # default: current month
@@ -26,23 +24,9 @@ def get_month_summary(
 
     start, end = month_filter.range()
 
-    incomes_q = db.session.query(func.coalesce(func.sum(Income.amount), 0))
-    incomes_q = incomes_q.filter(
-        Income.income_date.isnot(None),
-        Income.income_date >= start,
-        Income.income_date < end,
-    )
-    incomes_q = incomes_q.filter(Income.user_id == user_id)
-
-    receipts_q = db.session.query(func.coalesce(func.sum(Receipt.total_amount), 0))
-    receipts_q = receipts_q.filter(
-        Receipt.issue_date >= start,
-        Receipt.issue_date < end,
-    )
-    receipts_q = receipts_q.filter(Receipt.user_id == user_id)
-
-    total_incomes = float(incomes_q.scalar() or 0)
-    total_expenses = float(receipts_q.scalar() or 0)
+    totals = monthly_rollups_service.get_month_totals(user_id, start, end)
+    total_incomes = float(totals["income_amount"])
+    total_expenses = float(totals["receipt_amount"])
 
     return OkResult({
         "success": True,
@@ -0,0 +1,115 @@
+"""
+Per-user data versions for conditional GET requests.
+
+``users.data_version`` is a counter that changes whenever anything the
+user can read changes. Read endpoints marked with
+:func:`app.api.conditional_get` turn it into an ``ETag``; a request whose
+``If-None-Match`` still matches is answered with ``304 Not Modified``
+before the endpoint runs a single query of its own.
+
+Like the monthly rollups, the counter is maintained from the ORM flush
+instead of from every mutator: ``before_flush`` collects the owners of the
+pending inserts, updates and deletes (the ``user_id`` of owned rows, the
+members of touched accounts) and ``after_flush`` bumps them with one
+``UPDATE users SET data_version = data_version + 1`` in the same
+transaction, so a rolled-back request leaves the versions alone. Writes
+that bypass the ORM unit of work must call :func:`bump` themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import date
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Account, AccountMember, Allocation, AuthToken, EmailVerification, Goal, User
+
+_FLUSH_KEY = "data_version"
+
+# Session bookkeeping, not data any read endpoint returns.
+_UNVERSIONED = (AuthToken, EmailVerification)
+
+
+def get_version(user_id: uuid.UUID) -> int:
+    return db.session.execute(select(User.data_version).where(User.id == user_id)).scalar_one_or_none() or 0
+
+
+def etag_for(user_id: uuid.UUID, version: int) -> str:
+    """Unquoted (weak) ETag of everything ``user_id`` can read at ``version``.
+
+    Includes today's date because endpoints default to the current month
+    when no period is given.
+    """
+    return hashlib.sha256(f"{user_id}:{version}:{date.today().isoformat()}".encode()).hexdigest()[:32]
+
+
+def bump(connection, user_ids) -> None:
+    """Invalidate the cached reads of ``user_ids`` on ``connection``."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        connection.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(data_version=User.data_version + 1)
+        )
+
+
+def _owners(obj) -> set:
+    """``user_id`` values of ``obj`` before and after the pending change."""
+    state = inspect(obj)
+    if "user_id" not in state.attrs:
+        return set()
+    history = state.attrs.user_id.history
+    return {*history.added, *history.unchanged, *history.deleted}
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    user_ids: set = set()
+    account_ids: set = set()
+
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in (*session.new, *session.deleted, *modified):
+        if isinstance(obj, _UNVERSIONED):
+            continue
+        if isinstance(obj, User):
+            # A new user starts at version 0; nothing can be cached yet.
+            if obj.id is not None:
+                user_ids.add(obj.id)
+            continue
+        if isinstance(obj, Account):
+            account_ids.add(obj.id)
+        elif isinstance(obj, Allocation):
+            account_ids.update((obj.source_account_id, obj.target_account_id))
+        elif isinstance(obj, Goal):
+            # Fund summaries aggregate the goals of every member.
+            account_ids.add(obj.savings_fund_id)
+        user_ids.update(_owners(obj))
+
+    account_ids.discard(None)
+    if account_ids:
+        # Shared accounts: every member sees the balance, funds, allocations and goals.
+        with session.no_autoflush:
+            user_ids.update(session.execute(
+                select(AccountMember.user_id).where(AccountMember.account_id.in_(account_ids))
+            ).scalars())
+
+    user_ids.discard(None)
+    if user_ids:
+        flush_context.attributes[_FLUSH_KEY] = user_ids
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    user_ids = flush_context.attributes.pop(_FLUSH_KEY, None)
+    if user_ids:
+        bump(session.connection(), user_ids)
+
+
+def install_listeners() -> None:
+    """Hook version maintenance into every ORM session (idempotent)."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
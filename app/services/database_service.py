@@ -0,0 +1,213 @@
+"""
+Database engine tuning: connection pool options, statement timeouts and
+pool statistics.
+
+Pool settings come from the ``DB_*`` config values (see ``BaseConfig``) and
+are turned into ``SQLALCHEMY_ENGINE_OPTIONS`` before Flask-SQLAlchemy
+creates the engine. SQLite keeps Flask-SQLAlchemy's defaults; the sizing
+options only make sense for a server database.
+
+SQLite connections can opt into a performance profile
+(``SQLITE_PERFORMANCE_PROFILE``): WAL journaling so readers no longer block
+on a writer, ``synchronous=NORMAL`` (durable at checkpoints rather than on
+every commit, which is safe with WAL), a memory-mapped file, a larger page
+cache, in-memory temp tables and a busy timeout instead of immediate
+"database is locked" errors.
+
+The statement timeout is applied with ``SET LOCAL`` at the start of every
+transaction instead of as a connection startup parameter, so it works
+behind PgBouncer in transaction pooling mode and can be raised for a
+single request with :func:`statement_timeout`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+_statement_timeout_override: ContextVar[int | None] = ContextVar("statement_timeout_override", default=None)
+
+
+class PoolStats:
+    """Process-wide counters for the connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.wait_count = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.timeouts = 0
+
+    def record_wait(self, elapsed_ms: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "waits": self.wait_count,
+                "wait_avg_ms": round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        pool_stats.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+def build_engine_options(config) -> dict:
+    """Return ``SQLALCHEMY_ENGINE_OPTIONS`` for ``config`` (a Flask config mapping)."""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.get("DB_POOL_SIZE", 5),
+        "max_overflow": config.get("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+        "pool_use_lifo": config.get("DB_POOL_USE_LIFO", False),
+    }
+
+    if config.get("DB_PGBOUNCER", False):
+        # Transaction pooling hands each transaction to whichever server
+        # connection is free, so statements prepared on one are unknown on
+        # the next. psycopg2 never prepares server-side; psycopg 3 and
+        # asyncpg do unless told otherwise.
+        driver = url.get_driver_name()
+        if driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+    return options
+
+
+def configure_engine_options(app) -> None:
+    """Fill ``SQLALCHEMY_ENGINE_OPTIONS`` from the ``DB_*`` settings unless set explicitly."""
+    if "SQLALCHEMY_ENGINE_OPTIONS" not in app.config:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(app.config)
+
+
+def sqlite_profile_pragmas(config) -> list[str]:
+    """PRAGMA statements of the SQLite performance profile for ``config``."""
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        # Negative values are KiB rather than pages.
+        f"PRAGMA cache_size={-int(config.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+    ]
+
+
+def install_engine_hooks(app, engine) -> None:
+    """Attach pool statistics, the statement timeout and SQLite pragmas to ``engine``."""
+    default_timeout_ms = int(app.config.get("DB_STATEMENT_TIMEOUT_MS", 0) or 0)
+
+    event.listen(engine, "connect", lambda *args: pool_stats.increment("connects"))
+    event.listen(engine, "checkout", lambda *args: pool_stats.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: pool_stats.increment("checkins"))
+    event.listen(engine, "invalidate", lambda *args: pool_stats.increment("invalidations"))
+
+    if engine.dialect.name == "sqlite" and app.config.get("SQLITE_PERFORMANCE_PROFILE", False):
+        pragmas = sqlite_profile_pragmas(app.config)
+
+        def apply_sqlite_profile(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+        event.listen(engine, "connect", apply_sqlite_profile)
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    def set_statement_timeout(connection):
+        timeout_ms = _statement_timeout_override.get()
+        if timeout_ms is None:
+            timeout_ms = default_timeout_ms
+        if timeout_ms:
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    event.listen(engine, "begin", set_statement_timeout)
+
+
+@contextmanager
+def statement_timeout(timeout_ms: int):
+    """Use ``timeout_ms`` (0 = no limit) for transactions begun inside the block.
+
+    If the current session already has a transaction open, the new limit is
+    applied to it right away and stays in effect until it ends.
+    """
+    from app.extensions import db
+
+    token = _statement_timeout_override.set(int(timeout_ms))
+    try:
+        if db.session.in_transaction() and db.session.get_bind().dialect.name == "postgresql":
+            db.session.connection().exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        yield
+    finally:
+        _statement_timeout_override.reset(token)
+
+
+def get_pool_status(engine) -> dict:
+    """Current pool occupancy plus the cumulative counters."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    status["stats"] = pool_stats.snapshot()
+    return status
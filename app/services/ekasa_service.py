@@ -1,17 +1,159 @@
+"""
+Client for the eKasa receipt lookup API (Finančná správa).
+
+Lookups go through one pooled, keep-alive :class:`requests.Session` per
+process, so consecutive imports reuse open TLS connections instead of
+paying a new handshake each time. Transient failures (connection errors,
+502/503/504) are retried with exponential backoff; ``receipt/find`` is a
+read-only lookup, so retrying the POST is safe.
+
+eKasa receipts are immutable, so successful payloads are kept in a bounded
+LRU cache keyed by receipt ID. Importing the same receipt twice (the second
+attempt ends in a ConflictError anyway) does not hit the API again.
+
+Batch imports fan lookups out over a small thread pool sized to the
+connection pool, so N receipts cost roughly one round trip instead of N.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from app.services.errors import BadRequestError, UpstreamServiceError
+from app.services.errors import BadRequestError, ServiceError, UpstreamServiceError
 
 
 EKASA_URL = "https://ekasa.financnasprava.sk/mdu/api/v1/opd/receipt/find"
 
 
-def fetch_receipt_data(receipt_id: str):
-    """
-    Call eKasa API to get receipt details by receiptId.
-    """
-    try:
-        response = requests.post(EKASA_URL, json={"receiptId": receipt_id}, timeout=10)
+class EkasaClient:
+    """Pooled eKasa API client with retries and a payload cache."""
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(
+        self,
+        url: str = EKASA_URL,
+        *,
+        timeout: float = 10,
+        pool_size: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.3,
+        cache_size: int = 256,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.pool_size = max(1, int(pool_size))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_factor = backoff_factor
+        self.cache_size = max(0, int(cache_size))
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            # Hand the last response back instead of raising so the caller
+            # reports the upstream status code.
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.pool_size,
+                        thread_name_prefix="ekasa",
+                    )
+        return self._executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _cached(self, receipt_id: str) -> dict | None:
+        with self._cache_lock:
+            data = self._cache.get(receipt_id)
+            if data is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(receipt_id)
+            self.cache_hits += 1
+        return copy.deepcopy(data)
+
+    def _remember(self, receipt_id: str, data: dict) -> None:
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[receipt_id] = copy.deepcopy(data)
+            self._cache.move_to_end(receipt_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def fetch_receipt(self, receipt_id: str) -> dict:
+        """Return the eKasa payload for ``receipt_id``.
+
+        Raises:
+            BadRequestError: If eKasa does not know the receipt.
+            UpstreamServiceError: If the API is unreachable or misbehaves.
+        """
+        cached = self._cached(receipt_id)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.post(self.url, json={"receiptId": receipt_id}, timeout=self.timeout)
+        except requests.exceptions.RequestException as exc:
+            raise UpstreamServiceError(f"Failed to connect to eKasa API: {str(exc)}") from exc
+
         if response.status_code != 200:
             raise UpstreamServiceError(f"eKasa API returned {response.status_code}")
 
@@ -20,10 +162,75 @@ def fetch_receipt_data(receipt_id: str):
         except ValueError as exc:
             raise UpstreamServiceError("Invalid response returned by eKasa API") from exc
 
-        if data.get("returnValue") != 0:
+        if not isinstance(data, dict) or data.get("returnValue") != 0:
             raise BadRequestError("Invalid receiptId or not found")
 
+        self._remember(receipt_id, data)
         return data
 
-    except requests.exceptions.RequestException as exc:
-        raise UpstreamServiceError(f"Failed to connect to eKasa API: {str(exc)}") from exc
+    def fetch_receipts(self, receipt_ids: list[str]) -> dict[str, dict | ServiceError]:
+        """Look up several receipts concurrently.
+
+        Returns a mapping of receipt ID to its payload, or to the
+        :class:`ServiceError` that :meth:`fetch_receipt` raised for it, so
+        one bad ID does not fail the whole batch.
+        """
+        def lookup(receipt_id):
+            try:
+                return self.fetch_receipt(receipt_id)
+            except ServiceError as exc:
+                return exc
+
+        unique_ids = list(dict.fromkeys(receipt_ids))
+        if len(unique_ids) <= 1:
+            return {receipt_id: lookup(receipt_id) for receipt_id in unique_ids}
+        executor = self._get_executor()
+        return dict(zip(unique_ids, executor.map(lookup, unique_ids)))
+
+    def stats(self) -> dict:
+        with self._cache_lock:
+            size = len(self._cache)
+        return {
+            "cache_size": size,
+            "cache_max_size": self.cache_size,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "pool_size": self.pool_size,
+        }
+
+
+_client: EkasaClient | None = None
+_client_lock = threading.Lock()
+
+
+def configure_client(**options) -> EkasaClient:
+    """Replace the process-wide client, e.g. with settings from the app config."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, EkasaClient(**options)
+    if previous is not None:
+        previous.close()
+    return _client
+
+
+def get_client() -> EkasaClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = EkasaClient()
+    return _client
+
+
+def fetch_receipt_data(receipt_id: str):
+    """
+    Call eKasa API to get receipt details by receiptId.
+    """
+    return get_client().fetch_receipt(receipt_id)
+
+
+def fetch_receipts_data(receipt_ids: list[str]) -> dict:
+    """
+    Look up several receiptIds concurrently; see :meth:`EkasaClient.fetch_receipts`.
+    """
+    return get_client().fetch_receipts(receipt_ids)
@@ -63,7 +63,23 @@ class UpstreamServiceError(ServiceError):
     code = "upstream_service_error"
 
 
+class ServiceUnavailableError(ServiceError):
+    status_code = 503
+    default_message = "Service temporarily unavailable"
+    code = "service_unavailable"
+
+
 class RateLimitExceededError(ServiceError):
     status_code = 429
     default_message = "Rate limit exceeded. Try again later."
     code = "rate_limit_exceeded"
+
+    def __init__(self, message: str | None = None, retry_after: int | None = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+    def to_flask_response(self):
+        response, status = super().to_flask_response()
+        if self.retry_after:
+            response.headers["Retry-After"] = str(self.retry_after)
+        return response, status
@@ -1,19 +1,36 @@
 import csv
 import uuid
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from io import BytesIO, StringIO
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from sqlalchemy.orm import joinedload
+from sqlalchemy import String, cast, func, literal, null, select, union_all
 
 from app.extensions import db
-from app.models import Income, Receipt, ReceiptItem
+from app.models import Account, Category, Income, Receipt, ReceiptItem, Tag
 from app.services.accounts_service import find_main_account
 from app.validators.common_validators import MonthYearFilter
 
+CSV_HEADER = [
+    "date",
+    "kind",
+    "description",
+    "amount",
+    "currency",
+    "account_name",
+    "tag",
+    "category",
+    "receipt_id",
+    "receipt_item_id",
+]
+
+# Rows fetched per round trip from the (server-side) cursor and the size at
+# which buffered CSV text is flushed to the client.
+EXPORT_YIELD_PER = 1000
+CSV_CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class ExportRow:
@@ -35,122 +52,108 @@ def _period_label(month_filter: MonthYearFilter) -> str:
     return f"{month_filter.year:04d}-{month_filter.month:02d}"
 
 
-def _income_rows(user_id: uuid.UUID, month_filter: MonthYearFilter, currency: str, account_name: str) -> list[ExportRow]:
+def _income_rows_select(user_id: uuid.UUID, month_filter: MonthYearFilter, currency: str, account_name: str):
     start, end = month_filter.range()
-    query = db.session.query(Income).filter(Income.user_id == user_id)
+    query = (
+        select(
+            Income.income_date.label("date"),
+            literal("income", String).label("kind"),
+            func.coalesce(Income.description, "").label("description"),
+            Income.amount.label("amount"),
+            literal(currency, String).label("currency"),
+            literal(account_name, String).label("account_name"),
+            func.coalesce(Tag.name, "").label("tag"),
+            literal("", String).label("category"),
+            cast(null(), Receipt.id.type).label("receipt_id"),
+            cast(null(), ReceiptItem.id.type).label("receipt_item_id"),
+            Income.id.label("income_id"),
+        )
+        .outerjoin(Tag, Income.tag_id == Tag.id)
+        .where(Income.user_id == user_id)
+    )
 
     if start is not None and end is not None:
-        query = query.filter(Income.income_date >= start, Income.income_date < end)
-
-    rows = []
-    for income in query.order_by(Income.income_date.asc(), Income.id.asc()).all():
-        rows.append(
-            ExportRow(
-                date=income.income_date.isoformat(),
-                kind="income",
-                description=income.description or "",
-                amount=Decimal(str(income.amount or 0)),
-                currency=currency,
-                account_name=account_name,
-                tag=income.tag.name if income.tag else "",
-                category="",
-                receipt_id="",
-                receipt_item_id="",
-            )
-        )
-    return rows
+        query = query.where(Income.income_date >= start, Income.income_date < end)
+    return query
 
 
-def _expense_rows(user_id: uuid.UUID, month_filter: MonthYearFilter, currency: str) -> list[ExportRow]:
+def _expense_rows_select(user_id: uuid.UUID, month_filter: MonthYearFilter, currency: str):
+    """One row per receipt item, or one row per receipt that has no items."""
     start, end = month_filter.range()
     query = (
-        db.session.query(Receipt)
-        .options(
-            joinedload(Receipt.items).joinedload(ReceiptItem.category),
-            joinedload(Receipt.tag),
-            joinedload(Receipt.account),
+        select(
+            Receipt.issue_date.label("date"),
+            literal("expense", String).label("kind"),
+            func.coalesce(
+                func.nullif(ReceiptItem.name, ""),
+                func.nullif(Receipt.description, ""),
+                "",
+            ).label("description"),
+            func.coalesce(ReceiptItem.total_price, Receipt.total_amount, 0).label("amount"),
+            func.coalesce(Account.currency, currency).label("currency"),
+            func.coalesce(Account.name, "").label("account_name"),
+            func.coalesce(Tag.name, "").label("tag"),
+            func.coalesce(Category.name, "").label("category"),
+            Receipt.id.label("receipt_id"),
+            ReceiptItem.id.label("receipt_item_id"),
+            cast(null(), Income.id.type).label("income_id"),
         )
-        .filter(Receipt.user_id == user_id)
+        .outerjoin(ReceiptItem, ReceiptItem.receipt_id == Receipt.id)
+        .outerjoin(Category, ReceiptItem.category_id == Category.id)
+        .outerjoin(Tag, Receipt.tag_id == Tag.id)
+        .outerjoin(Account, Receipt.account_id == Account.id)
+        .where(Receipt.user_id == user_id)
     )
 
     if start is not None and end is not None:
-        query = query.filter(Receipt.issue_date >= start, Receipt.issue_date < end)
-
-    rows = []
-    for receipt in query.order_by(Receipt.issue_date.asc(), Receipt.created_at.asc().nullslast(), Receipt.id.asc()).all():
-        base = {
-            "date": receipt.issue_date.isoformat(),
-            "kind": "expense",
-            "currency": receipt.account.currency if receipt.account else currency,
-            "account_name": receipt.account.name if receipt.account else "",
-            "tag": receipt.tag.name if receipt.tag else "",
-            "receipt_id": str(receipt.id),
-        }
-
-        if receipt.items:
-            for item in receipt.items:
-                rows.append(
-                    ExportRow(
-                        date=base["date"],
-                        kind=base["kind"],
-                        description=item.name or receipt.description or "",
-                        amount=Decimal(str(item.total_price or 0)),
-                        currency=base["currency"],
-                        account_name=base["account_name"],
-                        tag=base["tag"],
-                        category=item.category.name if item.category else "",
-                        receipt_id=base["receipt_id"],
-                        receipt_item_id=str(item.id),
-                    )
-                )
-        else:
-            rows.append(
-                ExportRow(
-                    date=base["date"],
-                    kind=base["kind"],
-                    description=receipt.description or "",
-                    amount=Decimal(str(receipt.total_amount or 0)),
-                    currency=base["currency"],
-                    account_name=base["account_name"],
-                    tag=base["tag"],
-                    category="",
-                    receipt_id=base["receipt_id"],
-                    receipt_item_id="",
-                )
-            )
-    return rows
-
-
-def _export_rows(user_id: uuid.UUID, month_filter: MonthYearFilter) -> list[ExportRow]:
+        query = query.where(Receipt.issue_date >= start, Receipt.issue_date < end)
+    return query
+
+
+def _export_rows_statement(user_id: uuid.UUID, month_filter: MonthYearFilter):
+    """Merge incomes and expenses into one database-sorted result set."""
     account = find_main_account(user_id)
-    currency = account.currency
-    account_name = account.name
-    rows = _income_rows(user_id, month_filter, currency, account_name)
-    rows.extend(_expense_rows(user_id, month_filter, currency))
-    rows.sort(key=lambda row: (row.date, row.kind, row.description, row.receipt_id, row.receipt_item_id))
-    return rows
+    rows = union_all(
+        _income_rows_select(user_id, month_filter, account.currency, account.name),
+        _expense_rows_select(user_id, month_filter, account.currency),
+    ).subquery("export_rows")
+
+    return (
+        select(rows)
+        .order_by(
+            rows.c.date.asc(),
+            rows.c.kind.asc(),
+            rows.c.description.asc(),
+            rows.c.receipt_id.asc().nulls_first(),
+            rows.c.receipt_item_id.asc().nulls_first(),
+            rows.c.income_id.asc().nulls_first(),
+        )
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
 
 
-def export_csv(user_id: uuid.UUID, month_filter: MonthYearFilter) -> tuple[bytes, str]:
-    rows = _export_rows(user_id, month_filter)
-    period_label = _period_label(month_filter)
+def _iter_export_rows(statement) -> Iterator[ExportRow]:
+    for row in db.session.execute(statement):
+        yield ExportRow(
+            date=row.date.isoformat(),
+            kind=row.kind,
+            description=row.description or "",
+            amount=Decimal(str(row.amount or 0)),
+            currency=row.currency,
+            account_name=row.account_name,
+            tag=row.tag,
+            category=row.category,
+            receipt_id=str(row.receipt_id) if row.receipt_id is not None else "",
+            receipt_item_id=str(row.receipt_item_id) if row.receipt_item_id is not None else "",
+        )
+
+
+def _iter_csv_chunks(statement) -> Iterator[bytes]:
     sio = StringIO()
     writer = csv.writer(sio, delimiter=",")
-    writer.writerow(
-        [
-            "date",
-            "kind",
-            "description",
-            "amount",
-            "currency",
-            "account_name",
-            "tag",
-            "category",
-            "receipt_id",
-            "receipt_item_id",
-        ]
-    )
-    for row in rows:
+    writer.writerow(CSV_HEADER)
+
+    for row in _iter_export_rows(statement):
         writer.writerow(
             [
                 row.date,
@@ -165,14 +168,34 @@ def export_csv(user_id: uuid.UUID, month_filter: MonthYearFilter) -> tuple[bytes
                 row.receipt_item_id,
             ]
         )
+        if sio.tell() >= CSV_CHUNK_SIZE:
+            yield sio.getvalue().encode("utf-8")
+            sio.seek(0)
+            sio.truncate(0)
 
-    data = sio.getvalue().encode("utf-8")
+    if sio.tell():
+        yield sio.getvalue().encode("utf-8")
+
+
+def export_csv(user_id: uuid.UUID, month_filter: MonthYearFilter) -> tuple[Iterator[bytes], str]:
+    """Return a lazy iterator of CSV chunks and the download file name.
+
+    The main account lookup and query construction happen eagerly so
+    errors surface before the response starts; rows are read from the
+    database only as the iterator is consumed.
+    """
+    statement = _export_rows_statement(user_id, month_filter)
+    period_label = _period_label(month_filter)
     name = f"export_{period_label}_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.csv"
-    return data, name
+    return _iter_csv_chunks(statement), name
 
 
 def export_pdf(user_id: uuid.UUID, month_filter: MonthYearFilter) -> tuple[bytes, str]:
-    rows = _export_rows(user_id, month_filter)
+    # reportlab is only needed here; importing it lazily keeps it out of app start-up.
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    rows = list(_iter_export_rows(_export_rows_statement(user_id, month_filter)))
     period_label = _period_label(month_filter)
     income_total = sum((row.amount for row in rows if row.kind == "income"), Decimal("0.00"))
     expense_total = sum((row.amount for row in rows if row.kind == "expense"), Decimal("0.00"))
@@ -19,13 +19,13 @@ ALLOWED_INCOME_SORT_FIELDS = {
 
 def _serialize_income(income: Income) -> dict:
     return {
-        "id": str(income.id),
-        "user_id": str(income.user_id),
+        "id": income.id,
+        "user_id": income.user_id,
         "tag": income.tag.name if income.tag else None,
-        "tag_id": str(income.tag_id) if income.tag_id else None,
+        "tag_id": income.tag_id,
         "description": getattr(income, "description", None),
-        "amount": float(income.amount) if income.amount is not None else None,
-        "income_date": income.income_date.isoformat() if income.income_date else None,
+        "amount": income.amount,
+        "income_date": income.income_date,
         "extra_metadata": income.extra_metadata,
     }
 
@@ -109,7 +109,7 @@ def create_income(data: dict, user_id: uuid.UUID):
         db.session.rollback()
         raise
 
-    return CreatedResult({"id": str(income.id), "message": "Income created successfully"})
+    return CreatedResult({"id": income.id, "message": "Income created successfully"})
 
 
 def get_income_by_id(income_id: uuid.UUID, user_id: uuid.UUID):
@@ -150,7 +150,7 @@ def update_income(income_id: uuid.UUID, data: dict, user_id: uuid.UUID):
         db.session.rollback()
         raise
 
-    return OkResult({"id": str(income.id), "message": "Income updated successfully"})
+    return OkResult({"id": income.id, "message": "Income updated successfully"})
 
 
 def delete_income(income_id: uuid.UUID, user_id: uuid.UUID):
@@ -0,0 +1,195 @@
+"""
+Background jobs for slow request work.
+
+QR decoding and eKasa imports can take seconds: a hard-to-read photo goes
+through dozens of decoder attempts, and the eKasa API may be slow to
+answer. Endpoints that support it accept ``?async=true`` and, instead of
+doing the work on the request thread, submit it here and answer
+``202 Accepted`` with a job right away; the client then polls (or
+long-polls with ``?wait=``) ``GET /api/jobs/<id>``.
+
+:class:`LocalJobQueue` is the single-node backend and needs nothing beyond
+the standard library: one bounded thread pool per kind of work (``cpu``
+for decoding, ``io`` for upstream HTTP calls) and an in-memory job table.
+Jobs run inside an application context, so they can use ``db.session``
+like a request would; a job's return value is the payload of the
+:class:`~app.services.responses.ServiceResult` it produced and a raised
+:class:`~app.services.errors.ServiceError` becomes the job's error.
+
+Finished jobs are kept for ``result_ttl`` seconds. Jobs live in the memory
+of the process that accepted them, so with several workers the status
+endpoint only finds a job when the poll reaches the same process; run a
+single worker process (with threads) when enabling async mode, or put a
+shared backend behind the same :class:`JobQueue` interface.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.services.errors import ServiceError, ServiceUnavailableError
+from app.services.responses import ServiceResult
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+FINISHED = (SUCCEEDED, FAILED)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    id: uuid.UUID
+    type: str
+    user_id: uuid.UUID
+    status: str = QUEUED
+    result: object = None
+    error: dict | None = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # Monotonic time of completion, for expiry.
+    finished: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Runs callables in the background and tracks their outcome."""
+
+    def submit(self, job_type: str, user_id: uuid.UUID, func, /, *args, pool: str = "io", **kwargs) -> Job:
+        """Queue ``func(*args, **kwargs)`` on the ``pool`` (``cpu`` or ``io``) workers."""
+        raise NotImplementedError
+
+    def get(self, job_id: uuid.UUID, user_id: uuid.UUID) -> Job | None:
+        """The job if it exists and belongs to ``user_id``."""
+        raise NotImplementedError
+
+    def wait(self, job_id: uuid.UUID, user_id: uuid.UUID, timeout: float) -> Job | None:
+        """Like :meth:`get`, but block up to ``timeout`` seconds for the job to finish."""
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class LocalJobQueue(JobQueue):
+    """In-process job table with one thread pool per kind of work."""
+
+    def __init__(
+        self,
+        app,
+        *,
+        cpu_workers: int = 2,
+        io_workers: int = 4,
+        max_pending: int = 100,
+        result_ttl: float = 600,
+    ):
+        self.app = app
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._pools = {
+            "cpu": ThreadPoolExecutor(max_workers=max(1, cpu_workers), thread_name_prefix="jobs-cpu"),
+            "io": ThreadPoolExecutor(max_workers=max(1, io_workers), thread_name_prefix="jobs-io"),
+        }
+        self._jobs: dict[uuid.UUID, Job] = {}
+        self._changed = threading.Condition()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished is not None and job.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, job_type, user_id, func, /, *args, pool="io", **kwargs) -> Job:
+        executor = self._pools[pool]
+        with self._changed:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+            if pending >= self.max_pending:
+                raise ServiceUnavailableError("Too many background jobs in progress. Try again later.")
+            job = Job(id=uuid.uuid4(), type=job_type, user_id=user_id)
+            self._jobs[job.id] = job
+        executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job: Job, func, args, kwargs) -> None:
+        with self._changed:
+            job.status = RUNNING
+            job.started_at = _now()
+
+        result, error = None, None
+        try:
+            with self.app.app_context():
+                outcome = func(*args, **kwargs)
+            result = outcome.payload if isinstance(outcome, ServiceResult) else outcome
+        except ServiceError as exc:
+            error = {"code": exc.code or str(exc.status_code), "message": str(exc)}
+        except Exception:
+            logger.exception("Background job %s (%s) failed", job.id, job.type)
+            error = {"code": "internal_server_error", "message": "Internal server error"}
+
+        with self._changed:
+            job.result, job.error = result, error
+            job.status = FAILED if error else SUCCEEDED
+            job.finished_at = _now()
+            job.finished = time.monotonic()
+            self._changed.notify_all()
+
+    def get(self, job_id, user_id) -> Job | None:
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return job if job is not None and job.user_id == user_id else None
+
+    def wait(self, job_id, user_id, timeout) -> Job | None:
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job.user_id != user_id:
+                    return None
+                remaining = deadline - time.monotonic()
+                if job.status in FINISHED or remaining <= 0:
+                    return job
+                self._changed.wait(remaining)
+
+    def shutdown(self) -> None:
+        for executor in self._pools.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_job_queue(app) -> JobQueue:
+    """Job queue backend for ``JOBS_BACKEND`` (only ``local`` is built in)."""
+    backend = (app.config.get("JOBS_BACKEND") or "local").strip().lower()
+    if backend != "local":
+        raise ValueError(f"Unsupported job queue backend: {backend!r}")
+    return LocalJobQueue(
+        app,
+        cpu_workers=app.config.get("JOBS_CPU_WORKERS", 2),
+        io_workers=app.config.get("JOBS_IO_WORKERS", 4),
+        max_pending=app.config.get("JOBS_MAX_PENDING", 100),
+        result_ttl=app.config.get("JOBS_RESULT_TTL", 600),
+    )
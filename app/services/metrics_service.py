@@ -0,0 +1,372 @@
+"""
+Request instrumentation: wall time, SQL statements and SQL time per API
+request, aggregated into per-endpoint histograms.
+
+Every request to the ``api`` blueprint gets a :class:`RequestTiming` for
+the duration of the request. The engine's ``before/after_cursor_execute``
+events add each statement's count and time to it, and code on the hot path
+can time named phases with :func:`phase` (authentication and response
+serialization do). When the response is ready the totals go into the
+process-wide :data:`registry`:
+
+* ``budget_http_requests_total{endpoint,method,status}``
+* ``budget_http_request_duration_seconds{endpoint,method}`` (histogram)
+* ``budget_http_request_sql_statements{endpoint,method}`` (histogram)
+* ``budget_http_request_sql_seconds_total{endpoint,method}``
+* ``budget_http_request_phase_seconds_total{endpoint,method,phase}``
+
+``GET /api/diagnostics/metrics`` renders them, with the connection pool
+counters, in the Prometheus text format. With ``METRICS_SERVER_TIMING``
+each response also carries a ``Server-Timing`` header (``db``, ``auth``,
+``serialize`` and ``total``) that browser dev tools display per request.
+
+Like the pool statistics the numbers are per worker process; scrape each
+worker or aggregate in Prometheus.
+
+With ``QUERY_INSPECTION`` on (the default in development and tests) each
+request also records the shape of every statement it runs, i.e. the SQL
+text with whitespace and ``IN (...)`` lists collapsed. A request that runs
+one shape ``QUERY_REPEAT_THRESHOLD`` times or more is almost always a lazy
+load inside a loop (an N+1); it is logged as a warning and reported to
+:func:`watch_queries` callers, which is how the test suite fails on such
+requests and checks per-endpoint query budgets.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_current: ContextVar["RequestTiming | None"] = ContextVar("request_timing", default=None)
+
+
+@dataclass
+class RequestTiming:
+    started: float = field(default_factory=time.perf_counter)
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    # Statement shape -> executions, collected when QUERY_INSPECTION is on.
+    statements: Counter | None = None
+
+
+def current() -> RequestTiming | None:
+    """Timing of the request being handled on this thread, if instrumented."""
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    """Add the time spent in the block to phase ``name`` of the current request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.phases[name] = timing.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            yield bound, total
+
+
+class _EndpointStats:
+    __slots__ = ("duration", "statements", "sql_seconds", "phases", "statuses")
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.sql_seconds = 0.0
+        self.phases: dict[str, float] = {}
+        self.statuses: dict[int, int] = {}
+
+
+class MetricsRegistry:
+    """Process-wide per-endpoint request statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], _EndpointStats] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def record(self, endpoint: str, method: str, status: int, elapsed: float, timing: RequestTiming) -> None:
+        with self._lock:
+            stats = self._endpoints.get((endpoint, method))
+            if stats is None:
+                stats = self._endpoints[(endpoint, method)] = _EndpointStats()
+            stats.duration.observe(elapsed)
+            stats.statements.observe(timing.sql_count)
+            stats.sql_seconds += timing.sql_seconds
+            for name, seconds in timing.phases.items():
+                stats.phases[name] = stats.phases.get(name, 0.0) + seconds
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def render(self, pool_stats: dict | None = None) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, attribute):
+            for (endpoint, method), stats in endpoints:
+                hist = getattr(stats, attribute)
+                labels = _labels(endpoint=endpoint, method=method)
+                for bound, count in hist.cumulative():
+                    lines.append(f"{name}_bucket{{{labels},le=\"{_format_bound(bound)}\"}} {count}")
+                lines.append(f"{name}_sum{{{labels}}} {_format_value(hist.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            header("budget_http_requests_total", "counter", "API requests handled, by endpoint and status.")
+            for (endpoint, method), stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f"budget_http_requests_total{{{_labels(endpoint=endpoint, method=method, status=status)}}} {count}"
+                    )
+
+            header("budget_http_request_duration_seconds", "histogram", "Wall time of API requests.")
+            histogram("budget_http_request_duration_seconds", "duration")
+
+            header("budget_http_request_sql_statements", "histogram", "SQL statements executed per API request.")
+            histogram("budget_http_request_sql_statements", "statements")
+
+            header("budget_http_request_sql_seconds_total", "counter", "Time spent executing SQL in API requests.")
+            for (endpoint, method), stats in endpoints:
+                lines.append(
+                    f"budget_http_request_sql_seconds_total{{{_labels(endpoint=endpoint, method=method)}}} "
+                    f"{_format_value(stats.sql_seconds)}"
+                )
+
+            header("budget_http_request_phase_seconds_total", "counter", "Time spent in named request phases.")
+            for (endpoint, method), stats in endpoints:
+                for name, seconds in sorted(stats.phases.items()):
+                    lines.append(
+                        f"budget_http_request_phase_seconds_total{{{_labels(endpoint=endpoint, method=method, phase=name)}}} "
+                        f"{_format_value(seconds)}"
+                    )
+
+        for key, (name, kind, help_text) in _POOL_METRICS.items():
+            if pool_stats and key in pool_stats:
+                header(name, kind, help_text)
+                lines.append(f"{name} {_format_value(pool_stats[key])}")
+
+        return "\n".join(lines) + "\n"
+
+
+# ``database_service.PoolStats.snapshot()`` keys.
+_POOL_METRICS = {
+    "connects": ("budget_db_pool_connects_total", "counter", "New DBAPI connections opened."),
+    "checkouts": ("budget_db_pool_checkouts_total", "counter", "Connections checked out of the pool."),
+    "checkins": ("budget_db_pool_checkins_total", "counter", "Connections returned to the pool."),
+    "invalidations": ("budget_db_pool_invalidations_total", "counter", "Connections invalidated."),
+    "waits": ("budget_db_pool_waits_total", "counter", "Checkouts timed by the instrumented pool."),
+    "wait_avg_ms": ("budget_db_pool_wait_avg_ms", "gauge", "Average checkout wait in milliseconds."),
+    "wait_max_ms": ("budget_db_pool_wait_max_ms", "gauge", "Longest checkout wait in milliseconds."),
+    "timeouts": ("budget_db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else _format_value(bound)
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def server_timing_header(timing: RequestTiming, elapsed: float) -> str:
+    entries = [f'db;dur={timing.sql_seconds * 1000:.2f};desc="{timing.sql_count} queries"']
+    entries += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timing.phases.items()]
+    entries.append(f"total;dur={elapsed * 1000:.2f}")
+    return ", ".join(entries)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """``statement`` with whitespace and placeholder lists collapsed."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass(frozen=True)
+class QueryReport:
+    """Statements one API request ran, as seen by :func:`watch_queries`."""
+
+    method: str
+    path: str
+    endpoint: str
+    count: int
+    statements: dict[str, int]
+    repeated: dict[str, int]
+
+    def describe(self) -> str:
+        lines = [f"{self.method} {self.path} ({self.endpoint}) ran {self.count} SQL statements"]
+        for shape, count in sorted(self.statements.items(), key=lambda entry: -entry[1]):
+            lines.append(f"  {count:>4} x {shape}")
+        return "\n".join(lines)
+
+
+_watchers: list[list[QueryReport]] = []
+_watchers_lock = threading.Lock()
+
+
+@contextmanager
+def watch_queries():
+    """Collect a :class:`QueryReport` for every inspected request that finishes in the block."""
+    reports: list[QueryReport] = []
+    with _watchers_lock:
+        _watchers.append(reports)
+    try:
+        yield reports
+    finally:
+        with _watchers_lock:
+            _watchers.remove(reports)
+
+
+def _inspect_queries(timing: RequestTiming) -> None:
+    threshold = current_app.config.get("QUERY_REPEAT_THRESHOLD", 5)
+    statements = dict(timing.statements)
+    report = QueryReport(
+        method=request.method,
+        path=request.path,
+        endpoint=request.endpoint or "unmatched",
+        count=timing.sql_count,
+        statements=statements,
+        repeated={shape: count for shape, count in statements.items() if count >= threshold},
+    )
+    if report.repeated:
+        logger.warning("Repeated SQL statements, possible N+1 query:\n%s", report.describe())
+    with _watchers_lock:
+        for reports in _watchers:
+            reports.append(report)
+
+
+def _is_api_request() -> bool:
+    # Unmatched /api/... URLs have no blueprint but are API traffic too.
+    return request.blueprint == "api" or (request.endpoint is None and request.path.startswith("/api/"))
+
+
+def _before_request():
+    if not _is_api_request():
+        return
+    config = current_app.config
+    inspect_queries = config.get("QUERY_INSPECTION", False)
+    if config.get("METRICS_ENABLED", True) or inspect_queries:
+        g.metrics_token = _current.set(RequestTiming(statements=Counter() if inspect_queries else None))
+
+
+def _after_request(response):
+    timing = _current.get()
+    if timing is None:
+        return response
+    elapsed = time.perf_counter() - timing.started
+    if current_app.config.get("METRICS_ENABLED", True):
+        # Unmatched URLs share one label so probes cannot grow the registry.
+        registry.record(request.endpoint or "unmatched", request.method, response.status_code, elapsed, timing)
+    if timing.statements is not None:
+        _inspect_queries(timing)
+    if current_app.config.get("METRICS_SERVER_TIMING", False):
+        response.headers["Server-Timing"] = server_timing_header(timing, elapsed)
+    return response
+
+
+def _teardown_request(exc):
+    token = g.pop("metrics_token", None)
+    if token is not None:
+        _current.reset(token)
+
+
+def install_request_hooks(app) -> None:
+    """Time every API request of ``app``; runs before the blueprint's own hooks."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("budget_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current.get()
+    started = conn.info.get("budget_query_started")
+    if timing is None or not started:
+        return
+    timing.sql_count += 1
+    timing.sql_seconds += time.perf_counter() - started.pop()
+    if timing.statements is not None:
+        timing.statements[statement_shape(statement)] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("budget_query_started"):
+        connection.info["budget_query_started"].pop()
+
+
+def install_engine_hooks(engine) -> None:
+    """Count and time the statements ``engine`` executes for instrumented requests."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,470 @@
+"""
+Maintenance and queries for the ``monthly_rollups`` table.
+
+:class:`app.models.MonthlyRollup` keeps per-month sums of incomes, receipts
+and receipt items keyed by (user, account, month, category, tag). Rather
+than calling into this module from every create/update/delete path, the
+rollups are maintained from the ORM flush: ``before_flush`` turns the
+pending income/receipt/receipt item changes into signed deltas (old values
+out, new values in) and ``after_flush`` applies them with atomic
+``UPDATE ... SET x = x + :delta`` statements in the same transaction. That
+covers the services, the eKasa import and the seed script alike; a
+rolled-back request rolls its rollup changes back with it.
+
+Writes that bypass the ORM unit of work (bulk ``insert()``/``update()``
+statements, raw SQL, database-side cascades) are not seen. Run
+``python -m scripts.monthly_rollups verify`` to detect drift and
+``... rebuild`` to recompute the table from the source rows.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, fields, replace
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Account, Category, Income, MonthlyRollup, Receipt, ReceiptItem, Tag
+
+AMOUNTS = ("income_amount", "receipt_amount", "item_amount")
+COUNTS = ("income_count", "receipt_count", "item_count")
+MEASURES = AMOUNTS + COUNTS
+
+_CENT = Decimal("0.01")
+_FLUSH_KEY = "monthly_rollups"
+
+
+@dataclass(frozen=True)
+class RollupKey:
+    user_id: uuid.UUID
+    account_id: uuid.UUID | None
+    month: date
+    category_id: uuid.UUID | None
+    tag_id: uuid.UUID | None
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+class RollupChanges:
+    """Signed per-key measure deltas, merged before they are written."""
+
+    def __init__(self):
+        self.deltas: dict[RollupKey, dict[str, Decimal | int]] = {}
+
+    def add(self, key: RollupKey, sign: int = 1, **measures) -> None:
+        current = self.deltas.setdefault(key, {name: 0 for name in MEASURES})
+        for name, value in measures.items():
+            current[name] += sign * value
+
+    def merge(self, other: "RollupChanges") -> None:
+        for key, measures in other.deltas.items():
+            self.add(key, **measures)
+
+    def __bool__(self) -> bool:
+        return any(any(measures.values()) for measures in self.deltas.values())
+
+
+# ----------------------------------------------------------------------
+# Reading old/new attribute values inside a flush
+# ----------------------------------------------------------------------
+def _value(obj, attr: str, old: bool):
+    if not old:
+        return getattr(obj, attr)
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if history.added:
+        # Changed from NULL; the models load previous values eagerly
+        # (``active_history``) so an unknown previous value cannot occur.
+        return None
+    return getattr(obj, attr)
+
+
+def _foreign_key(obj, relationship: str, column: str, old: bool):
+    """Resolve a foreign key that may have been set through its relationship.
+
+    Assigning ``receipt.tag = tag`` only updates ``tag_id`` during the
+    flush, so the new value is read from the relationship when that was
+    changed and the old value always from the column.
+    """
+    if not old and inspect(obj).attrs[relationship].history.has_changes():
+        target = getattr(obj, relationship)
+        if target is None:
+            return None
+        if target.id is None:
+            # Pending parent: assign the primary key its default would.
+            target.id = uuid.uuid4()
+        return target.id
+    return _value(obj, column, old)
+
+
+def _receipt_dimensions(receipt: Receipt, old: bool) -> tuple:
+    return (
+        _foreign_key(receipt, "user", "user_id", old),
+        _foreign_key(receipt, "account", "account_id", old),
+        month_start(_value(receipt, "issue_date", old)),
+        _foreign_key(receipt, "tag", "tag_id", old),
+    )
+
+
+def _item_receipt(session: Session, item: ReceiptItem, old: bool) -> Receipt | None:
+    if not old and inspect(item).attrs.receipt.history.has_changes():
+        return item.receipt
+    receipt_id = _value(item, "receipt_id", old)
+    return session.get(Receipt, receipt_id) if receipt_id is not None else None
+
+
+def _track(changes: RollupChanges, session: Session, obj, sign: int, old: bool) -> None:
+    if isinstance(obj, Income):
+        key = RollupKey(
+            user_id=_foreign_key(obj, "user", "user_id", old),
+            account_id=None,
+            month=month_start(_value(obj, "income_date", old)),
+            category_id=None,
+            tag_id=_foreign_key(obj, "tag", "tag_id", old),
+        )
+        changes.add(key, sign, income_amount=_money(_value(obj, "amount", old)), income_count=1)
+    elif isinstance(obj, Receipt):
+        user_id, account_id, month, tag_id = _receipt_dimensions(obj, old)
+        key = RollupKey(user_id, account_id, month, None, tag_id)
+        changes.add(key, sign, receipt_amount=_money(_value(obj, "total_amount", old)), receipt_count=1)
+    elif isinstance(obj, ReceiptItem):
+        receipt = _item_receipt(session, obj, old)
+        if receipt is None:
+            return
+        user_id, account_id, month, tag_id = _receipt_dimensions(receipt, old)
+        key = RollupKey(user_id, account_id, month, _foreign_key(obj, "category", "category_id", old), tag_id)
+        changes.add(key, sign, item_amount=_money(_value(obj, "total_price", old)), item_count=1)
+
+
+def _move_untouched_items(changes: RollupChanges, session: Session, receipt: Receipt,
+                          touched_ids: set, deleted: bool) -> None:
+    """Re-key the stored items of a receipt whose month/account/tag changed."""
+    old_dimensions = _receipt_dimensions(receipt, old=True)
+    new_dimensions = None if deleted else _receipt_dimensions(receipt, old=False)
+    if old_dimensions == new_dimensions:
+        return
+
+    query = (
+        select(ReceiptItem.category_id, func.sum(ReceiptItem.total_price), func.count(ReceiptItem.id))
+        .where(ReceiptItem.receipt_id == receipt.id)
+        .group_by(ReceiptItem.category_id)
+    )
+    if touched_ids:
+        query = query.where(ReceiptItem.id.notin_(touched_ids))
+
+    for category_id, amount, count in session.execute(query):
+        user_id, account_id, month, tag_id = old_dimensions
+        changes.add(RollupKey(user_id, account_id, month, category_id, tag_id), -1,
+                    item_amount=_money(amount), item_count=count)
+        if new_dimensions is not None:
+            user_id, account_id, month, tag_id = new_dimensions
+            changes.add(RollupKey(user_id, account_id, month, category_id, tag_id),
+                        item_amount=_money(amount), item_count=count)
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    changes = RollupChanges()
+    touched_items: dict = {}
+    rekeyed_receipts = []
+    removed = {"account_id": set(), "category_id": set(), "tag_id": set()}
+
+    with session.no_autoflush:
+        for obj in session.new:
+            _track(changes, session, obj, +1, old=False)
+
+        for obj in session.deleted:
+            _track(changes, session, obj, -1, old=True)
+            if isinstance(obj, Receipt):
+                rekeyed_receipts.append((obj, True))
+            elif isinstance(obj, Account):
+                removed["account_id"].add(obj.id)
+            elif isinstance(obj, Category):
+                removed["category_id"].add(obj.id)
+            elif isinstance(obj, Tag):
+                removed["tag_id"].add(obj.id)
+
+        for obj in session.dirty:
+            if not isinstance(obj, (Income, Receipt, ReceiptItem)) or not session.is_modified(obj):
+                continue
+            _track(changes, session, obj, -1, old=True)
+            _track(changes, session, obj, +1, old=False)
+            if isinstance(obj, Receipt):
+                rekeyed_receipts.append((obj, False))
+
+        for obj in (*session.new, *session.deleted, *session.dirty):
+            if isinstance(obj, ReceiptItem) and obj.id is not None:
+                touched_items.setdefault(obj.receipt_id, set()).add(obj.id)
+
+        for receipt, deleted in rekeyed_receipts:
+            _move_untouched_items(changes, session, receipt, touched_items.get(receipt.id, set()), deleted)
+
+    if changes or any(removed.values()):
+        flush_context.attributes[_FLUSH_KEY] = (changes, removed)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    pending = flush_context.attributes.pop(_FLUSH_KEY, None)
+    if pending is None:
+        return
+    changes, removed = pending
+    connection = session.connection()
+    apply_changes(connection, changes)
+    if removed["account_id"]:
+        # Receipts of a deleted account go with it (``ON DELETE CASCADE``).
+        table = MonthlyRollup.__table__
+        connection.execute(delete(table).where(table.c.account_id.in_(removed["account_id"])))
+    for column in ("category_id", "tag_id"):
+        if removed[column]:
+            _clear_dimension(connection, column, removed[column])
+
+
+def install_listeners() -> None:
+    """Hook rollup maintenance into every ORM session (idempotent)."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+
+
+# ----------------------------------------------------------------------
+# Writing
+# ----------------------------------------------------------------------
+def _key_clause(table, key: RollupKey) -> list:
+    clauses = []
+    for field in fields(RollupKey):
+        column, value = table.c[field.name], getattr(key, field.name)
+        clauses.append(column.is_(None) if value is None else column == value)
+    return clauses
+
+
+def apply_changes(connection, changes: RollupChanges) -> None:
+    """Add ``changes`` to the stored rollups.
+
+    Increments are applied as ``x = x + delta`` on one existing row per key
+    so concurrent transactions never lose each other's updates; rows whose
+    counters all drop to zero are removed. Should two transactions race to
+    create the same key, both rows are kept and summed by the readers.
+
+    However many keys change, this is at most four statements: one SELECT
+    for the existing rows, one multi-row INSERT, one executemany UPDATE and
+    one DELETE of emptied rows.
+    """
+    table = MonthlyRollup.__table__
+    deltas = {key: measures for key, measures in changes.deltas.items() if any(measures.values())}
+    if not deltas:
+        return
+
+    existing: dict[RollupKey, uuid.UUID] = {}
+    rows = connection.execute(
+        select(table.c.id, *(table.c[field.name] for field in fields(RollupKey))).where(
+            table.c.user_id.in_({key.user_id for key in deltas}),
+            table.c.month.in_({key.month for key in deltas}),
+        )
+    ).mappings()
+    for row in rows:
+        existing.setdefault(_row_key(row), row["id"])
+
+    inserts = [
+        {"id": uuid.uuid4(), **vars(key), **measures}
+        for key, measures in deltas.items()
+        if key not in existing
+    ]
+    if inserts:
+        connection.execute(insert(table), inserts)
+
+    updates = [
+        {"row_id": existing[key], **{f"delta_{name}": measures[name] for name in MEASURES}}
+        for key, measures in deltas.items()
+        if key in existing
+    ]
+    if not updates:
+        return
+    connection.execute(
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values({name: table.c[name] + bindparam(f"delta_{name}") for name in MEASURES}),
+        updates,
+    )
+
+    decremented = [
+        existing[key]
+        for key, measures in deltas.items()
+        if key in existing and any(measures[name] < 0 for name in COUNTS)
+    ]
+    if decremented:
+        connection.execute(
+            delete(table).where(
+                table.c.id.in_(decremented),
+                *(table.c[name] == 0 for name in COUNTS),
+            )
+        )
+
+
+def _clear_dimension(connection, column: str, ids: set) -> None:
+    """Fold rows of deleted categories/tags into their "none" rows.
+
+    The ORM nulls ``receipt_items.category_id`` (and ``tag_id`` of tagged
+    records) of a deleted category or tag inside the flush, after the
+    deltas were computed.
+    """
+    table = MonthlyRollup.__table__
+    rows = connection.execute(select(table).where(table.c[column].in_(ids))).mappings().all()
+    if not rows:
+        return
+
+    changes = RollupChanges()
+    for row in rows:
+        key = replace(_row_key(row), **{column: None})
+        changes.add(key, **{name: row[name] for name in MEASURES})
+    connection.execute(delete(table).where(table.c[column].in_(ids)))
+    apply_changes(connection, changes)
+
+
+def _row_key(row) -> RollupKey:
+    return RollupKey(**{field.name: row[field.name] for field in fields(RollupKey)})
+
+
+# ----------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------
+def get_month_totals(user_id: uuid.UUID, start: date, end: date) -> dict[str, Decimal]:
+    """Income and receipt totals of ``user_id`` for months in ``[start, end)``."""
+    row = db.session.execute(
+        select(
+            func.coalesce(func.sum(MonthlyRollup.income_amount), 0),
+            func.coalesce(func.sum(MonthlyRollup.receipt_amount), 0),
+        ).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.month >= start,
+            MonthlyRollup.month < end,
+        )
+    ).one()
+    return {"income_amount": Decimal(str(row[0])), "receipt_amount": Decimal(str(row[1]))}
+
+
+def get_category_spent(user_id: uuid.UUID, category_id: uuid.UUID, start: date, end: date) -> Decimal:
+    """Sum of the user's receipt items in ``category_id`` for months in ``[start, end)``."""
+    spent = db.session.execute(
+        select(func.coalesce(func.sum(MonthlyRollup.item_amount), 0)).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.category_id == category_id,
+            MonthlyRollup.month >= start,
+            MonthlyRollup.month < end,
+        )
+    ).scalar()
+    return Decimal(str(spent))
+
+
+# ----------------------------------------------------------------------
+# Rebuild / verify
+# ----------------------------------------------------------------------
+def compute_rollups(user_id: uuid.UUID | None = None) -> RollupChanges:
+    """Aggregate the source tables into rollups.
+
+    Rows are grouped by day and folded into months here, which keeps the
+    queries portable between PostgreSQL and SQLite.
+    """
+    incomes = select(
+        Income.user_id, Income.tag_id, Income.income_date,
+        func.sum(Income.amount), func.count(Income.id),
+    ).group_by(Income.user_id, Income.tag_id, Income.income_date)
+    receipts = select(
+        Receipt.user_id, Receipt.account_id, Receipt.tag_id, Receipt.issue_date,
+        func.sum(Receipt.total_amount), func.count(Receipt.id),
+    ).group_by(Receipt.user_id, Receipt.account_id, Receipt.tag_id, Receipt.issue_date)
+    items = (
+        select(
+            Receipt.user_id, Receipt.account_id, ReceiptItem.category_id, Receipt.tag_id, Receipt.issue_date,
+            func.sum(ReceiptItem.total_price), func.count(ReceiptItem.id),
+        )
+        .join(Receipt, ReceiptItem.receipt_id == Receipt.id)
+        .group_by(Receipt.user_id, Receipt.account_id, ReceiptItem.category_id, Receipt.tag_id,
+                  Receipt.issue_date)
+    )
+    if user_id is not None:
+        incomes = incomes.where(Income.user_id == user_id)
+        receipts = receipts.where(Receipt.user_id == user_id)
+        items = items.where(Receipt.user_id == user_id)
+
+    changes = RollupChanges()
+    for owner, tag_id, day, amount, count in db.session.execute(incomes):
+        changes.add(RollupKey(owner, None, month_start(day), None, tag_id),
+                    income_amount=_money(amount), income_count=count)
+    for owner, account_id, tag_id, day, amount, count in db.session.execute(receipts):
+        changes.add(RollupKey(owner, account_id, month_start(day), None, tag_id),
+                    receipt_amount=_money(amount), receipt_count=count)
+    for owner, account_id, category_id, tag_id, day, amount, count in db.session.execute(items):
+        changes.add(RollupKey(owner, account_id, month_start(day), category_id, tag_id),
+                    item_amount=_money(amount), item_count=count)
+    return changes
+
+
+def stored_rollups(user_id: uuid.UUID | None = None) -> RollupChanges:
+    """Current table contents, with duplicate rows of a key summed."""
+    query = select(MonthlyRollup.__table__)
+    if user_id is not None:
+        query = query.where(MonthlyRollup.user_id == user_id)
+
+    changes = RollupChanges()
+    for row in db.session.execute(query).mappings():
+        changes.add(_row_key(row), **{name: row[name] for name in MEASURES})
+    return changes
+
+
+def verify(user_id: uuid.UUID | None = None) -> list[dict]:
+    """Compare stored rollups against the source tables.
+
+    Returns one entry per drifted key with the expected and stored
+    measures; an empty list means the table is consistent.
+    """
+    expected = compute_rollups(user_id).deltas
+    stored = stored_rollups(user_id).deltas
+    empty = {name: 0 for name in MEASURES}
+
+    drift = []
+    for key in expected.keys() | stored.keys():
+        want = {name: _normalize(name, value) for name, value in expected.get(key, empty).items()}
+        have = {name: _normalize(name, value) for name, value in stored.get(key, empty).items()}
+        if want != have:
+            drift.append({"key": key, "expected": want, "stored": have})
+    drift.sort(key=lambda entry: (str(entry["key"].user_id), entry["key"].month))
+    return drift
+
+
+def _normalize(name: str, value):
+    return _money(value) if name in AMOUNTS else int(value)
+
+
+def rebuild(user_id: uuid.UUID | None = None) -> int:
+    """Recompute the rollups (of one user or everyone); returns rows written.
+
+    The caller commits.
+    """
+    table = MonthlyRollup.__table__
+    changes = compute_rollups(user_id)
+
+    statement = delete(table)
+    if user_id is not None:
+        statement = statement.where(table.c.user_id == user_id)
+    db.session.execute(statement)
+
+    rows = [
+        {"id": uuid.uuid4(), **vars(key), **measures}
+        for key, measures in changes.deltas.items()
+        if any(measures.values())
+    ]
+    if rows:
+        db.session.execute(insert(table), rows)
+    return len(rows)
@@ -0,0 +1,43 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe base64 strings wrapping a small JSON object
+with the sort key values of the last row on a page plus the sort/order they
+were produced for. Clients pass the ``next_cursor`` of one page back as
+``cursor`` to get the next one; the service turns it into a
+``(sort_value, id) < (last_value, last_id)`` predicate so every page is an
+index range scan regardless of its depth.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+from app.services.errors import BadRequestError
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        BadRequestError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise BadRequestError("Invalid cursor") from exc
+
+    if not isinstance(payload, dict):
+        raise BadRequestError("Invalid cursor")
+    return payload
@@ -1,25 +1,158 @@
-from PIL import Image, ImageOps, ImageEnhance, ImageFilter
-from pyzbar.pyzbar import decode, ZBarSymbol
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+import io
+import logging
+import multiprocessing
+import os
 import re
-import cv2
-import numpy as np
+import threading
+import time
 
 from app.services.errors import BadRequestError
 from app.services.responses import OkResult
 
+logger = logging.getLogger(__name__)
+
+
+# State of a decoder process (see ``QrService(processes=...)``).
+_decoder = None
+
+
+def _init_decode_worker():
+    """Load the imaging stack once per decoder process."""
+    global _decoder
+    try:
+        import cv2
+        import numpy  # noqa: F401
+        import PIL.Image  # noqa: F401
+        import pyzbar.pyzbar  # noqa: F401
+    except ImportError:
+        # Let the decoders raise it per attempt, as they do in-process.
+        pass
+    else:
+        # Parallelism comes from the pool; one thread per decode.
+        cv2.setNumThreads(1)
+    _decoder = QrService(max_workers=1)
+
+
+def _decode_buffer(decoder_name, mode, size, data):
+    from PIL import Image
+
+    image = Image.frombuffer(mode, size, data, "raw", mode, 0, 1)
+    return getattr(_decoder, decoder_name)(image)
+
+
+@dataclass(frozen=True)
+class QrScanResult:
+    receipt_id: str | None
+    attempts: int
+    variant: str | None = None
+
 
 class QrService:
+    """Extract eKasa receipt IDs from photos of QR codes.
+
+    Decoding runs as a staged pipeline: the image is first scaled down to a
+    decoder-friendly size, cheap candidates (original/grayscale, upright)
+    are tried before rotations, brightness tweaks and upscales, and every
+    variant is only built when the pipeline actually gets to it. Decoder
+    attempts are spread over a bounded pool and the remaining attempts are
+    cancelled as soon as one of them finds a receipt ID.
+
+    With ``processes`` set, the pool is a warm ``ProcessPoolExecutor``
+    whose workers import the imaging stack once at start-up, so decoding
+    never holds the GIL of the process serving other requests. Variants are
+    shipped to it as raw pixel buffers (mode, size, bytes) rather than
+    pickled PIL images, and an attempt still running after ``task_timeout``
+    seconds is abandoned; the pool it runs in is then retired and replaced
+    so a stuck decoder cannot starve later scans. Without ``processes`` the
+    attempts run on a thread pool of ``max_workers`` threads, or inline for
+    a single worker.
+
+    The imaging stack (Pillow, pyzbar, OpenCV, NumPy) is imported on first
+    use rather than at module import, so app start-up and requests that
+    never scan a photo do not pay for loading it.
+    """
+
     EKASA_PATTERN = r"O-[0-9A-Za-z]{20,}"
     MAX_FILE_SIZE = 5 * 1024 * 1024
     ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp"}
 
-    def _rotate_variants(self, image):
-        return [
-            ("rot_0", image),
-            ("rot_90", image.rotate(90, expand=True)),
-            ("rot_180", image.rotate(180, expand=True)),
-            ("rot_270", image.rotate(270, expand=True)),
-        ]
+    # Longest side of the working image; phone photos are scaled down to it.
+    MAX_DECODE_SIDE = 1600
+    # Upscaled variants are skipped once they would exceed this size.
+    MAX_UPSCALED_SIDE = 3200
+    UPSCALE_FACTORS = (2, 3)
+    ROTATIONS = (90, 180, 270)
+
+    def __init__(self, max_workers: int = 4, processes: int = 0, task_timeout: float = 10.0):
+        self.max_workers = max(1, int(max_workers))
+        self.processes = max(0, int(processes))
+        self.task_timeout = task_timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._process_pool = None
+        self._process_pool_pid = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="qr-decode",
+                    )
+        return self._executor
+
+    def _get_process_pool(self):
+        with self._executor_lock:
+            if self._process_pool is not None and self._process_pool_pid != os.getpid():
+                # Inherited through fork: the workers belong to the parent.
+                self._process_pool = None
+            if self._process_pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=_init_decode_worker,
+                )
+                self._process_pool_pid = os.getpid()
+            return self._process_pool
+
+    def _retire_process_pool(self, pool):
+        """Stop using ``pool`` and kill its workers; the next scan starts a fresh one.
+
+        Attempts other scans still have in it fail with ``BrokenProcessPool``
+        and are counted as unsuccessful.
+        """
+        with self._executor_lock:
+            if self._process_pool is pool:
+                self._process_pool = None
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def warm_up(self):
+        """Start the decoder processes and load the imaging stack in them now."""
+        if self.processes:
+            pool = self._get_process_pool()
+            try:
+                for future in [pool.submit(os.getpid) for _ in range(self.processes)]:
+                    future.result()
+            except BrokenProcessPool:
+                logger.warning("QR decoder processes failed to start; retrying on first scan")
+                self._retire_process_pool(pool)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
 
     def _match_ekasa(self, text):
         if not text:
@@ -28,6 +161,8 @@ class QrService:
         return match.group(0) if match else None
 
     def _extract_with_pyzbar(self, image):
+        from pyzbar.pyzbar import decode, ZBarSymbol
+
         try:
             codes = decode(image, symbols=[ZBarSymbol.QRCODE])
         except Exception:
@@ -46,6 +181,9 @@ class QrService:
         return None
 
     def _extract_with_opencv(self, image):
+        import cv2
+        import numpy as np
+
         try:
             arr = np.array(image)
             if len(arr.shape) == 2:
@@ -64,43 +202,238 @@ class QrService:
 
         return None
 
-    def _extract_from_image(self, image):
-        receipt_id = self._extract_with_pyzbar(image)
-        if receipt_id:
-            return receipt_id
+    def _fit_to_decode_size(self, image):
+        from PIL import Image
+
+        longest = max(image.width, image.height)
+        if longest <= self.MAX_DECODE_SIDE:
+            return image
+        scale = self.MAX_DECODE_SIDE / longest
+        return image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.LANCZOS,
+        )
+
+    def _variant_stages(self, source):
+        """Yield ``(label, factory)`` pairs from cheapest to most expensive.
+
+        Factories are called only when the pipeline reaches the variant,
+        so a scan that succeeds on the first attempt never builds the
+        upscaled images.
+        """
+        from PIL import ImageEnhance, ImageOps
+
+        base = self._fit_to_decode_size(source)
+        gray_cache = []
+
+        def gray():
+            if not gray_cache:
+                gray_cache.append(ImageOps.grayscale(base))
+            return gray_cache[0]
+
+        yield "original", lambda: base
+        yield "gray", gray
+        yield "auto", lambda: ImageOps.autocontrast(gray())
+        yield "bright2", lambda: ImageEnhance.Brightness(gray()).enhance(2.0)
+        yield "bright3", lambda: ImageEnhance.Brightness(gray()).enhance(3.0)
+
+        for factor in self.UPSCALE_FACTORS:
+            width, height = base.width * factor, base.height * factor
+            if max(width, height) > self.MAX_UPSCALED_SIDE:
+                break
+            # Resample from the full-resolution source so a photo that was
+            # scaled down for the cheap passes gets its detail back here.
+            yield f"x{factor}", (
+                lambda size=(width, height): ImageOps.grayscale(source).resize(size)
+            )
+
+    def _attempts(self, source):
+        """Yield decoder attempts as ``(label, decoder, image_factory)``.
+
+        Upright variants come first for the cheap stages, then their
+        rotations; each variant image is built once and shared by its
+        rotations and both decoders.
+        """
+        decoders = (self._extract_with_pyzbar, self._extract_with_opencv)
+        stages = list(self._variant_stages(source))
+        cheap, expensive = stages[:3], stages[3:]
+        built = {}
 
-        return self._extract_with_opencv(image)
+        def image_factory(label, factory, angle):
+            def make():
+                if label not in built:
+                    built[label] = factory()
+                if angle == 0:
+                    return built[label]
+                if (label, angle) not in built:
+                    built[(label, angle)] = built[label].rotate(angle, expand=True)
+                return built[(label, angle)]
+            return make
+
+        def attempts_for(label, factory, angles):
+            for angle in angles:
+                make = image_factory(label, factory, angle)
+                for decoder in decoders:
+                    yield f"{label}/rot_{angle}", decoder, make
+
+        for label, factory in cheap:
+            yield from attempts_for(label, factory, (0,))
+        for label, factory in cheap:
+            yield from attempts_for(label, factory, self.ROTATIONS)
+        for label, factory in expensive:
+            yield from attempts_for(label, factory, (0, *self.ROTATIONS))
+
+    def scan_image(self, image) -> QrScanResult:
+        """Run the decoding pipeline over a loaded PIL image."""
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        attempts = self._attempts(image)
+        if self.processes:
+            return self._scan_in_processes(attempts)
+        if self.max_workers == 1:
+            count = 0
+            for label, decoder, make_image in attempts:
+                count += 1
+                receipt_id = decoder(make_image())
+                if receipt_id:
+                    return QrScanResult(receipt_id, count, label)
+            return QrScanResult(None, count)
+
+        return self._scan_parallel(attempts)
+
+    def _scan_parallel(self, attempts) -> QrScanResult:
+        executor = self._get_executor()
+        stop = threading.Event()
+        executed = []
+        # Only as many attempts as there are workers are queued at a time,
+        # so variants are still generated lazily and little work is wasted
+        # once an attempt succeeds.
+        window = self.max_workers
+        pending = {}
+        exhausted = False
+
+        def run(decoder, image):
+            if stop.is_set():
+                return None
+            executed.append(1)
+            return decoder(image)
+
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        label, decoder, make_image = next(attempts)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(run, decoder, make_image())] = label
+
+                if not pending:
+                    return QrScanResult(None, len(executed))
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label = pending.pop(future)
+                    receipt_id = future.result()
+                    if receipt_id:
+                        return QrScanResult(receipt_id, len(executed), label)
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
+
+    def _submit_to_process(self, decoder, image, buffers):
+        # Both decoders and all rotations of a variant share one buffer.
+        key = id(image)
+        if key not in buffers:
+            buffers[key] = (image, image.mode, image.size, image.tobytes())
+        _image, mode, size, data = buffers[key]
+        for attempt in (1, 2):
+            pool = self._get_process_pool()
+            try:
+                return pool, pool.submit(_decode_buffer, decoder.__name__, mode, size, data)
+            except BrokenProcessPool:
+                self._retire_process_pool(pool)
+                if attempt == 2:
+                    raise
+
+    def _scan_in_processes(self, attempts) -> QrScanResult:
+        window = self.processes
+        # future -> [label, pool, deadline]; the deadline starts once the
+        # pool hands the attempt to a worker, not while it waits in line
+        # behind other scans.
+        pending = {}
+        buffers = {}
+        executed = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        label, decoder, make_image = next(attempts)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pool, future = self._submit_to_process(decoder, make_image(), buffers)
+                    pending[future] = [label, pool, None]
+
+                if not pending:
+                    return QrScanResult(None, executed)
+
+                now = time.monotonic()
+                for future, entry in pending.items():
+                    if entry[2] is None and future.running():
+                        entry[2] = now + self.task_timeout
+                deadlines = [entry[2] for entry in pending.values() if entry[2] is not None]
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                if len(deadlines) < len(pending):
+                    # Attempts still queued behind other scans: look again soon.
+                    timeout = 0.05 if timeout is None else min(timeout, 0.05)
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label, pool, _deadline = pending.pop(future)
+                    executed += 1
+                    try:
+                        receipt_id = future.result()
+                    except BrokenProcessPool:
+                        logger.warning("QR decoder process died during attempt %s", label)
+                        self._retire_process_pool(pool)
+                        continue
+                    if receipt_id:
+                        return QrScanResult(receipt_id, executed, label)
+
+                now = time.monotonic()
+                for future, (label, pool, deadline) in pending.items():
+                    if deadline is not None and deadline <= now and not future.done():
+                        # A decoder this slow on a bounded image is stuck;
+                        # reclaim its worker and give up on the photo.
+                        logger.warning("QR decoder attempt %s timed out after %ss", label, self.task_timeout)
+                        self._retire_process_pool(pool)
+                        return QrScanResult(None, executed + 1)
+        finally:
+            for future in pending:
+                future.cancel()
 
     def extract_ekasa_id(self, file_stream):
+        from PIL import Image
+
         try:
             image = Image.open(file_stream)
             image.load()
         except Exception:
             return None, "Invalid image file"
 
-        if image.mode not in ("RGB", "L"):
-            image = image.convert("RGB")
-
-        gray = ImageOps.grayscale(image)
-        attempts = [
-            ("original", image),
-            ("gray", gray),
-            ("auto", ImageOps.autocontrast(gray)),
-            ("bright2", ImageEnhance.Brightness(gray).enhance(2.0)),
-            ("bright3", ImageEnhance.Brightness(gray).enhance(3.0)),
-            ("x2", gray.resize((gray.width * 2, gray.height * 2))),
-            ("x3", gray.resize((gray.width * 3, gray.height * 3))),
-        ]
-
-        for label, variant in attempts:
-            for rot_label, rotated in self._rotate_variants(variant):
-                receipt_id = self._extract_from_image(rotated)
-                if receipt_id:
-                    return receipt_id, None
+        result = self.scan_image(image)
+        if result.receipt_id:
+            return result.receipt_id, None
 
         return None, "QR code not found or does not contain a valid eKasa receipt ID"
 
-    def extract_receipt_id_from_upload(self, uploaded_file):
+    def read_upload(self, uploaded_file) -> bytes:
+        """Validate an uploaded image and return its content."""
         if uploaded_file is None:
             raise BadRequestError("Missing image file")
 
@@ -117,7 +450,10 @@ class QrService:
         if not any(filename_lower.endswith(ext) for ext in self.ALLOWED_EXTENSIONS):
             raise BadRequestError("Invalid file type. Please upload an image.")
 
-        receipt_id, error = self.extract_ekasa_id(uploaded_file.stream)
+        return uploaded_file.stream.read()
+
+    def extract_receipt_id_from_bytes(self, data: bytes):
+        receipt_id, error = self.extract_ekasa_id(io.BytesIO(data))
         if error:
             raise BadRequestError(error)
 
@@ -125,3 +461,6 @@ class QrService:
             raise BadRequestError("Invalid receipt ID extracted")
 
         return OkResult({"receiptId": receipt_id})
+
+    def extract_receipt_id_from_upload(self, uploaded_file):
+        return self.extract_receipt_id_from_bytes(self.read_upload(uploaded_file))
@@ -0,0 +1,183 @@
+"""
+Request rate limiting with pluggable storage.
+
+Limits use the sliding-window counter algorithm: each key keeps one
+counter for the current fixed window and one for the previous window, and
+the request rate is estimated as::
+
+    previous * (1 - elapsed / per) + current
+
+That is O(1) in time and memory per key regardless of the limit, unlike a
+log of request timestamps, and smooths out the burst a plain fixed window
+allows at window boundaries. Only allowed requests are counted.
+
+Two backends implement :class:`RateLimiter`:
+
+* :class:`MemoryRateLimiter` keeps the counters in-process in an LRU map
+  bounded by ``max_keys``, so idle clients are evicted. Each worker process
+  enforces its own limit.
+* :class:`RedisRateLimiter` keeps them in Redis (or anything speaking the
+  Redis protocol, e.g. Valkey, KeyDB, Dragonfly), shared by all workers and
+  hosts. It talks to the server through ``redis-py``'s connection pool, so
+  concurrent request threads do not queue behind one socket, and needs only
+  ``INCRBY``, ``DECRBY``, ``PEXPIRE`` and ``GET`` (plus ``SCAN`` and ``DEL``
+  for :meth:`~RateLimiter.reset`). If the server is unreachable
+  requests are allowed (fail open) and a warning is logged.
+
+:func:`build_rate_limiter` picks the backend from ``RATE_LIMIT_STORAGE_URL``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+try:
+    import redis
+except ImportError:  # only needed when RATE_LIMIT_STORAGE_URL points at Redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Keys deleted per DEL (and requested per SCAN) by RedisRateLimiter.reset.
+RESET_BATCH = 500
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+
+
+def _decide(previous: int, current: int, limit: int, per: float, elapsed: float) -> RateLimitDecision:
+    """Decision for one more request given the counters before it."""
+    weight = 1 - elapsed / per
+    estimated = previous * weight + current
+    if estimated + 1 <= limit:
+        return RateLimitDecision(True, limit, max(0, math.floor(limit - estimated - 1)))
+
+    if current + 1 > limit or previous == 0:
+        # Nothing frees up before the next window.
+        retry_after = per - elapsed
+    else:
+        # Wait until the previous window's share has decayed enough.
+        retry_after = per * (1 - (limit - current - 1) / previous) - elapsed
+    return RateLimitDecision(False, limit, 0, max(1, math.ceil(retry_after)))
+
+
+class RateLimiter:
+    """Counts hits per key; subclasses provide the storage."""
+
+    def hit(self, key: str, limit: int, per: float) -> RateLimitDecision:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget all counters (tests, administrative resets)."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Per-process counters in an LRU map of at most ``max_keys`` entries."""
+
+    def __init__(self, max_keys: int = 10_000, clock=time.time):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [window index, current count, previous count]
+        self._entries: OrderedDict[str, list] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit(self, key: str, limit: int, per: float) -> RateLimitDecision:
+        now = self._clock()
+        window = int(now // per)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [window, 0, 0]
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                if entry[0] != window:
+                    entry[2] = entry[1] if entry[0] == window - 1 else 0
+                    entry[0], entry[1] = window, 0
+
+            decision = _decide(entry[2], entry[1], limit, per, now - window * per)
+            if decision.allowed:
+                entry[1] += 1
+            return decision
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisRateLimiter(RateLimiter):
+    """Counters shared through a Redis-protocol server."""
+
+    def __init__(self, url: str, *, prefix: str = "rate-limit:", timeout: float = 0.5, clock=time.time):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL points at Redis but the redis package is not installed")
+        # Raises ValueError for URL schemes redis-py does not handle. RESP2
+        # keeps older servers and Redis-compatible stores working.
+        self.client = redis.Redis.from_url(
+            url,
+            protocol=2,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+            decode_responses=True,
+        )
+        self.prefix = prefix
+        self._clock = clock
+
+    def hit(self, key: str, limit: int, per: float) -> RateLimitDecision:
+        now = self._clock()
+        window = int(now // per)
+        current_key = f"{self.prefix}{key}:{window}"
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.incr(current_key)
+            pipeline.pexpire(current_key, int(per * 2000))
+            pipeline.get(f"{self.prefix}{key}:{window - 1}")
+            current, _, previous = pipeline.execute()
+            decision = _decide(int(previous or 0), current - 1, limit, per, now - window * per)
+            if not decision.allowed:
+                self.client.decr(current_key)
+            return decision
+        except redis.RedisError as exc:
+            logger.warning("Rate limit storage unavailable, allowing request: %s", exc)
+            return RateLimitDecision(True, limit, limit)
+
+    def reset(self) -> None:
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self.prefix) + "*"
+        batch = []
+        for key in self.client.scan_iter(match=pattern, count=RESET_BATCH):
+            batch.append(key)
+            if len(batch) >= RESET_BATCH:
+                self.client.delete(*batch)
+                batch.clear()
+        if batch:
+            self.client.delete(*batch)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def build_rate_limiter(config) -> RateLimiter:
+    """Backend for ``RATE_LIMIT_STORAGE_URL``: empty or ``memory://`` for in-process."""
+    url = (config.get("RATE_LIMIT_STORAGE_URL") or "").strip()
+    if not url or url.startswith("memory://"):
+        return MemoryRateLimiter(max_keys=config.get("RATE_LIMIT_MAX_KEYS", 10_000))
+    return RedisRateLimiter(url, prefix=config.get("RATE_LIMIT_KEY_PREFIX", "rate-limit:"))
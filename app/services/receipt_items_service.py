@@ -13,14 +13,14 @@ from app.validators.receipt_item_validators import (
 
 def _serialize_receipt_item(item: ReceiptItem) -> dict:
     return {
-        "id": str(item.id),
-        "receipt_id": str(item.receipt_id),
-        "user_id": str(item.user_id),
-        "category_id": str(item.category_id) if item.category_id else None,
+        "id": item.id,
+        "receipt_id": item.receipt_id,
+        "user_id": item.user_id,
+        "category_id": item.category_id,
         "name": item.name,
-        "quantity": float(item.quantity),
-        "unit_price": float(item.unit_price),
-        "total_price": float(item.total_price),
+        "quantity": item.quantity,
+        "unit_price": item.unit_price,
+        "total_price": item.total_price,
         "extra_metadata": item.extra_metadata,
     }
 
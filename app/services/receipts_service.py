@@ -1,21 +1,29 @@
 import uuid
-from datetime import datetime
-from decimal import Decimal
+from collections import Counter
+from collections.abc import Iterator
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy import String, literal, tuple_, type_coerce
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.extensions import db
-from app.models import AccountMember, Receipt, ReceiptItem, Tag
+from app.models import AccountMember, Category, Receipt, ReceiptItem, Tag
 from app.services import ekasa_service, tags_service
 from app.services.errors import (
     BadRequestError,
     ConflictError,
     ForbiddenError,
     NotFoundError,
+    ServiceError,
 )
+from app.services.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, encode_cursor
 from app.services.responses import CreatedResult, OkResult
-from app.validators.common_validators import MonthYearFilter, parse_uuid_field
+from app.validators.common_validators import MonthYearFilter
 from app.validators.receipt_validators import (
+    validate_receipt_bulk_data,
+    validate_ekasa_batch_data,
+    validate_ekasa_import_data,
     validate_receipt_create_data,
     validate_receipt_update_data,
 )
@@ -25,6 +33,14 @@ ALLOWED_RECEIPT_SORT_FIELDS = {
     "total_amount": Receipt.total_amount,
 }
 
+# Receipts read per round trip when eKasa checks are streamed.
+EKASA_ITEMS_YIELD_PER = 200
+
+_RECEIPT_CURSOR_PARSERS = {
+    "issue_date": date.fromisoformat,
+    "total_amount": Decimal,
+}
+
 
 def _receipt_currency(receipt: Receipt) -> str | None:
     return receipt.account.currency if receipt.account is not None else None
@@ -32,18 +48,18 @@ def _receipt_currency(receipt: Receipt) -> str | None:
 
 def _serialize_receipt(receipt: Receipt) -> dict:
     return {
-        "id": str(receipt.id),
+        "id": receipt.id,
         "external_uid": receipt.external_uid,
         "tag": receipt.tag.name if receipt.tag else None,
-        "tag_id": str(receipt.tag_id) if receipt.tag_id else None,
+        "tag_id": receipt.tag_id,
         "description": receipt.description,
-        "issue_date": receipt.issue_date.isoformat() if receipt.issue_date else None,
+        "issue_date": receipt.issue_date,
         "currency": _receipt_currency(receipt),
-        "total_amount": float(receipt.total_amount) if receipt.total_amount is not None else None,
+        "total_amount": receipt.total_amount,
         "extra_metadata": receipt.extra_metadata,
-        "user_id": str(receipt.user_id),
-        "account_id": str(receipt.account_id),
-        "created_at": receipt.created_at.isoformat() if receipt.created_at else None,
+        "user_id": receipt.user_id,
+        "account_id": receipt.account_id,
+        "created_at": receipt.created_at,
     }
 
 
@@ -118,6 +134,89 @@ def _resolve_account_for_user(
     return default_membership.account_id
 
 
+def _resolve_accounts_for_user(
+    user_id: uuid.UUID,
+    account_ids: set[uuid.UUID | None],
+) -> dict[uuid.UUID | None, uuid.UUID]:
+    """Bulk form of :func:`_resolve_account_for_user`; ``None`` maps to the default account."""
+    memberships = (
+        db.session.query(AccountMember)
+        .filter(AccountMember.user_id == user_id)
+        .order_by(AccountMember.created_at.asc())
+        .all()
+    )
+    member_of = {membership.account_id for membership in memberships}
+
+    resolved = {}
+    for account_id in account_ids:
+        if account_id is None:
+            if not memberships:
+                raise BadRequestError("Missing account_id and user has no account membership")
+            resolved[None] = memberships[0].account_id
+        elif account_id not in member_of:
+            raise ForbiddenError("User is not a member of this account")
+        else:
+            resolved[account_id] = account_id
+    return resolved
+
+
+def _load_tags_for_user(user_id: uuid.UUID, tag_ids: set[uuid.UUID]) -> dict[uuid.UUID, Tag]:
+    """Bulk form of :func:`_load_tag_for_user`."""
+    if not tag_ids:
+        return {}
+
+    tags = {tag.id: tag for tag in db.session.query(Tag).filter(Tag.id.in_(tag_ids))}
+    for tag_id in tag_ids:
+        tag = tags.get(tag_id)
+        if tag is None:
+            raise NotFoundError("Tag not found")
+        if tag.user_id != user_id:
+            raise ForbiddenError("Tag does not belong to this user")
+    return tags
+
+
+def _load_categories_for_user(user_id: uuid.UUID, category_ids: set[uuid.UUID]) -> dict[uuid.UUID, Category]:
+    if not category_ids:
+        return {}
+
+    categories = {
+        category.id: category
+        for category in db.session.query(Category).filter(Category.id.in_(category_ids))
+    }
+    for category_id in category_ids:
+        category = categories.get(category_id)
+        if category is None or (category.user_id is not None and category.user_id != user_id):
+            raise NotFoundError("Category not found")
+    return categories
+
+
+def _receipt_cursor(receipt: Receipt, sort_by: str, descending: bool) -> str:
+    value = getattr(receipt, sort_by)
+    return encode_cursor(
+        {
+            "sort": sort_by,
+            "order": "desc" if descending else "asc",
+            "value": value.isoformat() if sort_by == "issue_date" else str(value),
+            "id": str(receipt.id),
+        }
+    )
+
+
+def _parse_receipt_cursor(cursor: str, sort_by: str, descending: bool):
+    payload = decode_cursor(cursor)
+    if payload.get("sort") != sort_by or payload.get("order") != ("desc" if descending else "asc"):
+        raise BadRequestError("Cursor does not match the requested sort order")
+    if not isinstance(payload.get("value"), str) or not isinstance(payload.get("id"), str):
+        raise BadRequestError("Invalid cursor")
+
+    try:
+        value = _RECEIPT_CURSOR_PARSERS[sort_by](payload["value"])
+        last_id = uuid.UUID(payload["id"])
+    except (KeyError, TypeError, ValueError, InvalidOperation) as exc:
+        raise BadRequestError("Invalid cursor") from exc
+    return value, last_id
+
+
 def get_all_receipts(
     user_id: uuid.UUID,
     month_filter: MonthYearFilter,
@@ -125,7 +224,15 @@ def get_all_receipts(
     sort_by: str = "issue_date",
     descending: bool = True,
     account_id: uuid.UUID | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
 ):
+    """List the user's receipts.
+
+    Without ``limit`` and ``cursor`` the full list is returned (legacy
+    shape). With either of them the result is one keyset page ordered by
+    ``(sort_by, id)``: ``{"receipts": [...], "next_cursor": str | None}``.
+    """
     if sort_by not in ALLOWED_RECEIPT_SORT_FIELDS:
         raise BadRequestError("Invalid sort field")
 
@@ -146,10 +253,34 @@ def get_all_receipts(
         query = query.filter(Receipt.account_id == account_id)
 
     order_column = ALLOWED_RECEIPT_SORT_FIELDS[sort_by]
-    query = query.order_by(order_column.desc() if descending else order_column.asc())
 
-    receipts = query.all()
-    return OkResult([_serialize_receipt(receipt) for receipt in receipts])
+    if limit is None and cursor is None:
+        query = query.order_by(order_column.desc() if descending else order_column.asc())
+        receipts = query.all()
+        return OkResult([_serialize_receipt(receipt) for receipt in receipts])
+
+    if cursor:
+        last_value, last_id = _parse_receipt_cursor(cursor, sort_by, descending)
+        key = tuple_(order_column, Receipt.id)
+        boundary = tuple_(last_value, last_id)
+        query = query.filter(key < boundary if descending else key > boundary)
+
+    if descending:
+        query = query.order_by(order_column.desc(), Receipt.id.desc())
+    else:
+        query = query.order_by(order_column.asc(), Receipt.id.asc())
+
+    page_size = limit or DEFAULT_PAGE_LIMIT
+    receipts = query.limit(page_size + 1).all()
+    has_more = len(receipts) > page_size
+    receipts = receipts[:page_size]
+
+    return OkResult(
+        {
+            "receipts": [_serialize_receipt(receipt) for receipt in receipts],
+            "next_cursor": _receipt_cursor(receipts[-1], sort_by, descending) if has_more else None,
+        }
+    )
 
 
 def create_receipt(data: dict, user_id: uuid.UUID):
@@ -182,6 +313,92 @@ def create_receipt(data: dict, user_id: uuid.UUID):
     )
 
 
+def create_receipts_bulk(data: dict, user_id: uuid.UUID, *, max_receipts: int, max_items: int):
+    """Create several receipts, each with nested items, in one transaction.
+
+    The whole request is validated before anything is written. Accounts,
+    tags and categories are each resolved with one query, tag and category
+    usage counters are bumped once per distinct tag or category, and all
+    rows are inserted by a single flush before the commit.
+    """
+    validated = validate_receipt_bulk_data(data, max_receipts, max_items)
+
+    accounts = _resolve_accounts_for_user(user_id, {receipt["account_id"] for receipt in validated})
+    tags = _load_tags_for_user(
+        user_id, {receipt["tag_id"] for receipt in validated if receipt["tag_id"] is not None}
+    )
+    categories = _load_categories_for_user(
+        user_id,
+        {
+            item["category_id"]
+            for receipt in validated
+            for item in receipt["items"]
+            if item["category_id"] is not None
+        },
+    )
+
+    tag_usage: Counter[Tag] = Counter()
+    category_usage: Counter[Category] = Counter()
+    receipts = []
+    for receipt_data in validated:
+        tag = tags.get(receipt_data["tag_id"])
+        receipt = Receipt(
+            user_id=user_id,
+            account_id=accounts[receipt_data["account_id"]],
+            tag=tag,
+            description=receipt_data["description"],
+            issue_date=receipt_data["issue_date"],
+            total_amount=receipt_data["total_amount"],
+            external_uid=receipt_data["external_uid"],
+            extra_metadata=receipt_data["extra_metadata"],
+        )
+        if tag is not None:
+            tag_usage[tag] += 1
+
+        for item_data in receipt_data["items"]:
+            category = categories.get(item_data["category_id"])
+            receipt.items.append(
+                ReceiptItem(
+                    user_id=user_id,
+                    category_id=category.id if category else None,
+                    name=item_data["name"],
+                    quantity=item_data["quantity"],
+                    unit_price=item_data["unit_price"],
+                    total_price=item_data["quantity"] * item_data["unit_price"],
+                    extra_metadata=item_data["extra_metadata"],
+                )
+            )
+            if category is not None:
+                category_usage[category] += 1
+        receipts.append(receipt)
+
+    try:
+        db.session.add_all(receipts)
+        tags_service.register_receipt_tags_assigned(tag_usage)
+        for category, count in category_usage.items():
+            category.count = (category.count or 0) + count
+        db.session.flush()
+        # Read the generated IDs now; after commit every attribute access
+        # would reload its row.
+        created = [
+            {"id": str(receipt.id), "item_ids": [str(item.id) for item in receipt.items]}
+            for receipt in receipts
+        ]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return CreatedResult(
+        {
+            "receipts": created,
+            "total_receipts": len(created),
+            "total_items": sum(len(receipt["item_ids"]) for receipt in created),
+            "message": "Receipts created successfully",
+        }
+    )
+
+
 def get_receipt_by_id(receipt_id: uuid.UUID, user_id: uuid.UUID):
     receipt = _get_receipt_for_user(receipt_id, user_id)
     return OkResult(_serialize_receipt(receipt))
@@ -246,93 +463,94 @@ def delete_receipt(receipt_id: uuid.UUID, user_id: uuid.UUID):
     return OkResult({"message": "Receipt deleted successfully"})
 
 
-def import_receipt_from_ekasa(data: dict, user_id: uuid.UUID):
-    receipt_id = str(data.get("receipt_id", "")).strip()
-    if not receipt_id:
-        raise BadRequestError("Missing receipt_id")
-
-    account_id = _resolve_account_for_user(
-        user_id,
-        parse_uuid_field(
-            data.get("account_id"),
-            "account_id",
-            required=False,
-        ),
-    )
-
-    ekasa_data = ekasa_service.fetch_receipt_data(receipt_id)
+def _parse_ekasa_receipt(ekasa_data: dict) -> dict:
     receipt_payload = ekasa_data["receipt"]
-    external_uid = receipt_payload.get("receiptId")
-
-    existing = (
-        db.session.query(Receipt)
-        .filter(Receipt.external_uid == external_uid)
-        .first()
-    )
-    if existing:
-        raise ConflictError("Receipt already imported")
-
     try:
         issue_date = datetime.strptime(
             receipt_payload["issueDate"],
             "%d.%m.%Y %H:%M:%S",
         ).date()
         total_price = Decimal(str(receipt_payload.get("totalPrice", 0)))
-    except (KeyError, ValueError, TypeError) as exc:
+    except (KeyError, ValueError, TypeError, InvalidOperation) as exc:
         raise BadRequestError("Invalid receipt data returned by eKasa") from exc
 
+    items_payload = receipt_payload.get("items") or []
+    if not isinstance(items_payload, list):
+        items_payload = []
+
     organization = receipt_payload.get("organization")
-    tag = None
-    if organization:
-        tag = tags_service.find_or_create_tag_from_ekasa(user_id, organization)
+    return {
+        "external_uid": receipt_payload.get("receiptId"),
+        "issue_date": issue_date,
+        "total_price": total_price,
+        "organization": organization,
+        "tag_name": organization.get("name") if organization else None,
+        "items": items_payload,
+        "extra_metadata": {
+            "ico": receipt_payload.get("ico"),
+            "dic": receipt_payload.get("dic"),
+            "okp": receipt_payload.get("okp"),
+            "unit": receipt_payload.get("unit", {}),
+        },
+    }
 
-    description = (
-        organization.get("name")
-        if organization and organization.get("name")
-        else "eKasa receipt"
-    )
 
+def _build_ekasa_receipt(parsed: dict, user_id: uuid.UUID, account_id: uuid.UUID, tag: Tag | None) -> Receipt:
     receipt = Receipt(
         user_id=user_id,
         account_id=account_id,
         tag=tag,
-        description=description,
-        issue_date=issue_date,
-        total_amount=total_price,
-        external_uid=external_uid,
-        extra_metadata={
-            "ico": receipt_payload.get("ico"),
-            "dic": receipt_payload.get("dic"),
-            "okp": receipt_payload.get("okp"),
-            "unit": receipt_payload.get("unit", {}),
-        },
+        description=parsed["tag_name"] or "eKasa receipt",
+        issue_date=parsed["issue_date"],
+        total_amount=parsed["total_price"],
+        external_uid=parsed["external_uid"],
+        extra_metadata=parsed["extra_metadata"],
     )
+    for item_payload in parsed["items"]:
+        ReceiptItem(
+            receipt=receipt,
+            user_id=user_id,
+            name=(item_payload.get("name") or "").strip(),
+            quantity=Decimal(str(item_payload.get("quantity", 1))),
+            unit_price=Decimal(str(item_payload.get("price", 0))),
+            total_price=Decimal(str(item_payload.get("price", 0))),
+            extra_metadata={
+                "vatRate": item_payload.get("vatRate"),
+                "itemType": item_payload.get("itemType"),
+            },
+        )
+    return receipt
 
-    items_payload = receipt_payload.get("items") or []
-    if not isinstance(items_payload, list):
-        items_payload = []
+
+def import_receipt_from_ekasa(data: dict, user_id: uuid.UUID):
+    cleaned = validate_ekasa_import_data(data)
+    receipt_id = cleaned["receipt_id"]
+    account_id = _resolve_account_for_user(user_id, cleaned["account_id"])
+
+    ekasa_data = ekasa_service.fetch_receipt_data(receipt_id)
+    external_uid = ekasa_data["receipt"].get("receiptId")
+
+    existing = (
+        db.session.query(Receipt)
+        .filter(Receipt.external_uid == external_uid)
+        .first()
+    )
+    if existing:
+        raise ConflictError("Receipt already imported")
+
+    parsed = _parse_ekasa_receipt(ekasa_data)
+
+    tag = None
+    if parsed["organization"]:
+        tag = tags_service.find_or_create_tag_from_ekasa(user_id, parsed["organization"])
 
     try:
+        receipt = _build_ekasa_receipt(parsed, user_id, account_id, tag)
         db.session.add(receipt)
 
         if tag is not None:
             tags_service.register_tag_assigned(tag)
 
-        for item_payload in items_payload:
-            item = ReceiptItem(
-                receipt=receipt,
-                user_id=user_id,
-                name=(item_payload.get("name") or "").strip(),
-                quantity=Decimal(str(item_payload.get("quantity", 1))),
-                unit_price=Decimal(str(item_payload.get("price", 0))),
-                total_price=Decimal(str(item_payload.get("price", 0))),
-                extra_metadata={
-                    "vatRate": item_payload.get("vatRate"),
-                    "itemType": item_payload.get("itemType"),
-                },
-            )
-            db.session.add(item)
-
         db.session.commit()
     except Exception:
         db.session.rollback()
@@ -344,21 +562,115 @@ def import_receipt_from_ekasa(data: dict, user_id: uuid.UUID):
             "tag": tag.name if tag else None,
             "tag_id": str(tag.id) if tag else None,
             "receipt_id": str(receipt.id),
-            "total_items": len(items_payload),
+            "total_items": len(parsed["items"]),
         }
     )
 
 
-def get_ekasa_items(
-    month_filter: MonthYearFilter,
-    user_id: uuid.UUID,
-    *,
-    account_id: uuid.UUID | None = None,
-):
+def _batch_error(receipt_id: str, exc: ServiceError) -> dict:
+    return {
+        "receipt_id": receipt_id,
+        "status": "error",
+        "error": {"code": exc.code, "message": str(exc)},
+    }
+
+
+def import_receipts_from_ekasa_batch(data: dict, user_id: uuid.UUID, *, max_size: int):
+    """Import up to ``max_size`` eKasa receipts in one request.
+
+    Lookups run concurrently through the eKasa client's thread pool. Already
+    imported receipts are found with a single ``external_uid IN (...)``
+    query, tags for all organizations are resolved together, and every new
+    receipt and item is written in one transaction. Lookup and parse
+    failures are reported per ID instead of failing the whole batch.
+    """
+    cleaned = validate_ekasa_batch_data(data, max_size)
+    account_id = _resolve_account_for_user(user_id, cleaned["account_id"])
+    receipt_ids = cleaned["receipt_ids"]
+
+    fetched = ekasa_service.fetch_receipts_data(receipt_ids)
+
+    results: dict[str, dict] = {}
+    parsed_by_id: dict[str, dict] = {}
+    for receipt_id in receipt_ids:
+        outcome = fetched[receipt_id]
+        if isinstance(outcome, ServiceError):
+            results[receipt_id] = _batch_error(receipt_id, outcome)
+            continue
+        try:
+            parsed_by_id[receipt_id] = _parse_ekasa_receipt(outcome)
+        except BadRequestError as exc:
+            results[receipt_id] = _batch_error(receipt_id, exc)
+
+    external_uids = {parsed["external_uid"] for parsed in parsed_by_id.values()}
+    existing_uids = set()
+    if external_uids:
+        existing_uids = {
+            external_uid
+            for (external_uid,) in db.session.query(Receipt.external_uid)
+            .filter(Receipt.external_uid.in_(external_uids))
+        }
+
+    to_import: dict[str, dict] = {}
+    seen_uids = set(existing_uids)
+    for receipt_id, parsed in parsed_by_id.items():
+        if parsed["external_uid"] in seen_uids:
+            results[receipt_id] = {
+                "receipt_id": receipt_id,
+                "status": "duplicate",
+                "error": {"code": ConflictError.code, "message": "Receipt already imported"},
+            }
+            continue
+        seen_uids.add(parsed["external_uid"])
+        to_import[receipt_id] = parsed
+
+    if to_import:
+        try:
+            tags = tags_service.get_or_create_user_tags(
+                user_id, (parsed["tag_name"] for parsed in to_import.values())
+            )
+            receipts = {}
+            for receipt_id, parsed in to_import.items():
+                tag = tags.get(parsed["tag_name"]) if parsed["tag_name"] else None
+                receipt = _build_ekasa_receipt(parsed, user_id, account_id, tag)
+                db.session.add(receipt)
+                receipts[receipt_id] = receipt
+                if tag is not None:
+                    tag.increment_counter()
+            # Re-derive each tag's type once rather than once per receipt.
+            for tag in tags.values():
+                tag.update_type()
+            db.session.flush()
+
+            # Read the new IDs before the commit expires every receipt.
+            for receipt_id, receipt in receipts.items():
+                results[receipt_id] = {
+                    "receipt_id": receipt_id,
+                    "status": "imported",
+                    "id": str(receipt.id),
+                    "tag": receipt.tag.name if receipt.tag else None,
+                    "total_items": len(to_import[receipt_id]["items"]),
+                }
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    ordered = [results[receipt_id] for receipt_id in receipt_ids]
+    summary = {status: 0 for status in ("imported", "duplicate", "error")}
+    for result in ordered:
+        summary[result["status"]] += 1
+    return OkResult({"results": ordered, "summary": summary})
+
+
+def _ekasa_items_query(month_filter: MonthYearFilter, user_id: uuid.UUID, account_id: uuid.UUID | None):
+    # Items come from one ``IN`` query per batch of receipts instead of a
+    # joined, row-multiplied result; tag and account are many-to-one, so
+    # joining them does not multiply rows.
     query = (
         _owned_receipts_query(user_id)
         .options(
-            joinedload(Receipt.items),
+            selectinload(Receipt.items),
             joinedload(Receipt.tag),
             joinedload(Receipt.account),
         )
@@ -376,48 +688,134 @@ def get_ekasa_items(
         _ensure_account_membership(user_id, account_id)
         query = query.filter(Receipt.account_id == account_id)
 
-    receipts = query.order_by(Receipt.issue_date.asc(), Receipt.created_at.asc()).all()
-
-    checks = []
-    total_items = 0
-
-    for receipt in receipts:
-        items = []
-        for item in receipt.items or []:
-            items.append(
-                {
-                    "id": str(item.id),
-                    "name": item.name,
-                    "quantity": float(item.quantity) if item.quantity is not None else None,
-                    "unit_price": float(item.unit_price) if item.unit_price is not None else None,
-                    "total_price": float(item.total_price) if item.total_price is not None else None,
-                    "category_id": str(item.category_id) if item.category_id else None,
-                    "extra_metadata": item.extra_metadata,
-                }
-            )
+    return query.order_by(Receipt.issue_date.asc(), Receipt.created_at.asc(), Receipt.id.asc())
+
+
+def _serialize_ekasa_check(receipt: Receipt) -> dict:
+    return {
+        "receipt_id": receipt.id,
+        "external_uid": receipt.external_uid,
+        "issue_date": receipt.issue_date,
+        "description": receipt.description,
+        "currency": _receipt_currency(receipt),
+        "total_amount": receipt.total_amount,
+        "tag": receipt.tag.name if receipt.tag else None,
+        "tag_id": receipt.tag_id,
+        "user_id": receipt.user_id,
+        "account_id": receipt.account_id,
+        "items": [
+            {
+                "id": item.id,
+                "name": item.name,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "total_price": item.total_price,
+                "category_id": item.category_id,
+                "extra_metadata": item.extra_metadata,
+            }
+            for item in receipt.items or []
+        ],
+    }
+
+
+# ``created_at`` as the database stores it. SQLite keeps server-default
+# timestamps as text without microseconds, which a bound ``datetime``
+# (rendered with them) would not compare equal to, so the cursor carries
+# that text and compares it as text; PostgreSQL parses it back into a
+# timestamp.
+_STORED_CREATED_AT = type_coerce(Receipt.created_at, String)
+
+
+def _ekasa_cursor(receipt: Receipt, stored_created_at) -> str:
+    if not isinstance(stored_created_at, str):
+        stored_created_at = stored_created_at.isoformat()
+    return encode_cursor(
+        {
+            "issue_date": receipt.issue_date.isoformat(),
+            "created_at": stored_created_at,
+            "id": str(receipt.id),
+        }
+    )
 
-        total_items += len(items)
-        checks.append(
+
+def _ekasa_cursor_boundary(cursor: str):
+    """Row value the next page starts after."""
+    payload = decode_cursor(cursor)
+    if not all(isinstance(payload.get(field), str) for field in ("issue_date", "created_at", "id")):
+        raise BadRequestError("Invalid cursor")
+
+    try:
+        issue_date = date.fromisoformat(payload["issue_date"])
+        # Parsed only to reject garbage: the stored text is compared as is.
+        datetime.fromisoformat(payload["created_at"])
+        last_id = uuid.UUID(payload["id"])
+    except ValueError as exc:
+        raise BadRequestError("Invalid cursor") from exc
+
+    return tuple_(issue_date, literal(payload["created_at"], String), last_id)
+
+
+def get_ekasa_items(
+    month_filter: MonthYearFilter,
+    user_id: uuid.UUID,
+    *,
+    account_id: uuid.UUID | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """List the user's eKasa receipts with their items, oldest first.
+
+    Without ``limit`` and ``cursor`` every matching receipt is returned
+    (legacy shape). With either of them the result is one keyset page
+    ordered by ``(issue_date, created_at, id)``: ``checks`` and
+    ``total_items`` cover the page only, plus ``next_cursor``.
+    """
+    query = _ekasa_items_query(month_filter, user_id, account_id)
+
+    if limit is None and cursor is None:
+        checks = [_serialize_ekasa_check(receipt) for receipt in query]
+        return OkResult(
             {
-                "receipt_id": str(receipt.id),
-                "external_uid": receipt.external_uid,
-                "issue_date": receipt.issue_date.isoformat() if receipt.issue_date else None,
-                "description": receipt.description,
-                "currency": _receipt_currency(receipt),
-                "total_amount": float(receipt.total_amount) if receipt.total_amount is not None else None,
-                "tag": receipt.tag.name if receipt.tag else None,
-                "tag_id": str(receipt.tag_id) if receipt.tag_id else None,
-                "user_id": str(receipt.user_id),
-                "account_id": str(receipt.account_id),
-                "items": items,
+                "success": True,
+                "checks": checks,
+                "total_checks": len(checks),
+                "total_items": sum(len(check["items"]) for check in checks),
             }
         )
 
+    if cursor:
+        key = tuple_(Receipt.issue_date, Receipt.created_at, Receipt.id)
+        query = query.filter(key > _ekasa_cursor_boundary(cursor))
+
+    page_size = limit or DEFAULT_PAGE_LIMIT
+    rows = query.add_columns(_STORED_CREATED_AT).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    checks = [_serialize_ekasa_check(receipt) for receipt, _ in rows]
+
     return OkResult(
         {
             "success": True,
             "checks": checks,
             "total_checks": len(checks),
-            "total_items": total_items,
+            "total_items": sum(len(check["items"]) for check in checks),
+            "next_cursor": _ekasa_cursor(*rows[-1]) if has_more else None,
         }
     )
+
+
+def iter_ekasa_items(
+    month_filter: MonthYearFilter,
+    user_id: uuid.UUID,
+    *,
+    account_id: uuid.UUID | None = None,
+) -> Iterator[dict]:
+    """Return a lazy iterator over the user's eKasa checks, oldest first.
+
+    The account check and query construction happen eagerly so errors
+    surface before a streamed response starts; receipts are read
+    ``EKASA_ITEMS_YIELD_PER`` at a time (with one items query per batch)
+    as the iterator is consumed.
+    """
+    query = _ekasa_items_query(month_filter, user_id, account_id).yield_per(EKASA_ITEMS_YIELD_PER)
+    return (_serialize_ekasa_check(receipt) for receipt in query)
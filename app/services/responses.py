@@ -1,4 +1,6 @@
-from flask import jsonify
+from flask import g, jsonify
+
+from app.services import metrics_service
 
 
 class ServiceResult:
@@ -11,7 +13,14 @@ class ServiceResult:
         return {"data": self.payload, "error": None}
 
     def to_flask_response(self):
-        return jsonify(self.to_dict()), self.status_code
+        with metrics_service.phase("serialize"):
+            response = jsonify(self.to_dict())
+        # Set by ``app.api.conditional_get`` for versioned read endpoints.
+        etag = g.get("data_etag")
+        if etag and self.status_code == 200:
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+        return response, self.status_code
 
 
 class OkResult(ServiceResult):
@@ -20,3 +29,7 @@ class OkResult(ServiceResult):
 
 class CreatedResult(ServiceResult):
     status_code = 201
+
+
+class AcceptedResult(ServiceResult):
+    status_code = 202
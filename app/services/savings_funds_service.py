@@ -5,7 +5,8 @@ from decimal import Decimal, InvalidOperation
 from sqlalchemy import func
 
 from app.extensions import db
-from app.models import AccountMember, AccountType, Goal, Income, Receipt, SavingsFund
+from app.models import AccountMember, AccountType, Goal, SavingsFund
+from app.services import monthly_rollups_service
 from app.services.errors import BadRequestError, NotFoundError
 from app.services.responses import CreatedResult, OkResult
 
@@ -64,25 +65,9 @@ def get_savings_summary(user_id: uuid.UUID):
     else:
         next_month_start = date(today.year, today.month + 1, 1)
 
-    income_total = (
-        db.session.query(func.coalesce(func.sum(Income.amount), 0))
-        .filter(
-            Income.user_id == user_id,
-            Income.income_date >= month_start,
-            Income.income_date < next_month_start,
-        )
-        .scalar()
-    )
-
-    expenses_total = (
-        db.session.query(func.coalesce(func.sum(Receipt.total_amount), 0))
-        .filter(
-            Receipt.user_id == user_id,
-            Receipt.issue_date >= month_start,
-            Receipt.issue_date < next_month_start,
-        )
-        .scalar()
-    )
+    totals = monthly_rollups_service.get_month_totals(user_id, month_start, next_month_start)
+    income_total = totals["income_amount"]
+    expenses_total = totals["receipt_amount"]
 
     current_balance = Decimal(str(income_total)) - Decimal(str(expenses_total))
 
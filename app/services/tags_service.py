@@ -3,8 +3,10 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
+from sqlalchemy import update
+
 from app.extensions import db
-from app.models import Tag, User
+from app.models import Income, Receipt, Tag, User
 from app.models.tag import TagType
 from app.services.errors import BadRequestError, NotFoundError
 from app.services.responses import CreatedResult, OkResult
@@ -33,6 +35,25 @@ def get_or_create_user_tag(user_id: uuid.UUID, name: str) -> Tag:
     return tag
 
 
+def get_or_create_user_tags(user_id: uuid.UUID, names) -> dict[str, Tag]:
+    """Batch variant of :func:`get_or_create_user_tag`: one lookup for all names."""
+    wanted = list(dict.fromkeys(name for name in names if name))
+    if not wanted:
+        return {}
+
+    tags = {
+        tag.name: tag
+        for tag in db.session.query(Tag).filter(Tag.user_id == user_id, Tag.name.in_(wanted))
+    }
+    missing = [name for name in wanted if name not in tags]
+    for name in missing:
+        tags[name] = Tag(user_id=user_id, name=name, type=None, counter=0)
+    if missing:
+        db.session.add_all(tags[name] for name in missing)
+        db.session.flush()
+    return tags
+
+
 def find_or_create_tag_from_ekasa(user_id: uuid.UUID, data: dict) -> Tag | None:
     name = data.get("name")
     if not name:
@@ -49,6 +70,30 @@ def register_tag_assigned(tag: Tag) -> None:
     tag.update_type()
 
 
+def register_receipt_tags_assigned(usage: dict[Tag, int]) -> None:
+    """Bulk form of :func:`register_tag_assigned` for newly added receipts.
+
+    ``usage`` maps each tag to the number of new receipts carrying it. Every
+    such tag now has receipts, so only the income side of the type needs
+    checking, and that is done for all tags in one query without
+    autoflushing the pending receipts.
+    """
+    if not usage:
+        return
+
+    with db.session.no_autoflush:
+        tag_ids_with_incomes = {
+            tag_id
+            for (tag_id,) in db.session.query(Income.tag_id)
+            .filter(Income.tag_id.in_([tag.id for tag in usage]))
+            .distinct()
+        }
+
+    for tag, count in usage.items():
+        tag.counter += count
+        tag.type = TagType.BOTH if tag.id in tag_ids_with_incomes else TagType.EXPENSE
+
+
 def register_tag_unassigned(tag: Tag) -> None:
     """Update usage when a tag is removed from an income or receipt."""
     if tag is None:
@@ -92,7 +137,7 @@ def _find_duplicate_user_tag(
 
 
 def _tag_has_linked_records(tag: Tag) -> bool:
-    return bool(tag.incomes) or bool(tag.receipts)
+    return any(tag.linked_record_kinds())
 
 
 def get_tags_by_type(tag_type: TagType, user_id: uuid.UUID) -> OkResult:
@@ -157,12 +202,12 @@ def update_tag(tag_id: uuid.UUID, data: dict, user_id: uuid.UUID) -> OkResult:
 def delete_tag(tag_id: uuid.UUID, user_id: uuid.UUID) -> OkResult:
     tag = _get_tag_for_user(tag_id, user_id)
 
-    tagged_records = [*list(tag.incomes), *list(tag.receipts)]
-    for tagged_record in tagged_records:
-        tagged_record.tag = None
-        register_tag_unassigned(tag)
-
     try:
+        # Untag the records with one UPDATE per table instead of loading and
+        # flushing each of them; the rollup rows of the deleted tag are
+        # folded into the untagged rows when the tag itself is deleted.
+        for model in (Income, Receipt):
+            db.session.execute(update(model).where(model.tag_id == tag.id).values(tag_id=None))
         db.session.delete(tag)
         db.session.commit()
     except Exception:
@@ -0,0 +1,156 @@
+"""
+In-process cache for resolved session tokens.
+
+Every authenticated API request resolves its session token through
+:meth:`app.services.auth_service.AuthService.verify_token`. Without a cache
+that costs a lookup on ``auth_tokens`` plus a second query for the owning
+user. The cache keeps a small snapshot of the resolved identity keyed by a
+SHA-256 digest of the token (raw tokens are never kept in memory), bounded
+both by size (LRU eviction) and by age (TTL).
+
+The cache is per process. Logout invalidates the entry in the process that
+handled it; other workers drop their copy once the TTL elapses, so the TTL
+is the upper bound on how long a revoked token may still be accepted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Immutable snapshot of the user a session token resolves to.
+
+    Exposes the same attributes handlers read from ``g.current_user`` so
+    a cached identity can be used in place of the ORM ``User`` without
+    touching the database session.
+    """
+
+    id: uuid.UUID
+    username: str
+    email: str
+    is_verified: bool
+    created_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_verified=bool(user.is_verified),
+            created_at=user.created_at,
+        )
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    user: AuthenticatedUser
+    expires_at: datetime
+    cached_at: float
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a raw token string."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """Bounded TTL/LRU cache of token digest -> resolved identity.
+
+    A ``max_size`` or ``ttl_seconds`` of 0 disables caching entirely; all
+    lookups then count as misses.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60):
+        self.max_size = max(0, int(max_size))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> tuple[AuthenticatedUser, datetime] | None:
+        """Return ``(user, expires_at)`` for a cached token or ``None``.
+
+        Entries older than the TTL are dropped and reported as misses.
+        Token expiry (``expires_at``) is checked by the caller so it can
+        also clean up the database row.
+        """
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        key = hash_token(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry.cached_at >= self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.user, entry.expires_at
+
+    def put(self, token: str, user: AuthenticatedUser, expires_at: datetime) -> None:
+        if not self.enabled:
+            return
+
+        key = hash_token(token)
+        entry = _CacheEntry(user=user, expires_at=expires_at, cached_at=time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        key = hash_token(token)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop every cached token belonging to ``user_id``."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.user.id == user_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -37,9 +37,12 @@ def login_required(f: F) -> F:
 
     @wraps(f)
     def wrapper(*args: Any, **kwargs: Any):
-        auth_service = current_app.extensions.get("auth_service")
-        token = extract_auth_token()
-        user = auth_service.verify_token(token) if token else None
+        # The blueprint-level hook has usually resolved the user already.
+        user = g.get("current_user")
+        if user is None:
+            auth_service = current_app.extensions.get("auth_service")
+            token = extract_auth_token()
+            user = auth_service.verify_token(token) if token else None
         if user is None:
             return make_response(None, {"code": "unauthenticated", "message": "Authentication required"}, 401)
         # Attach user to request context for downstream handlers
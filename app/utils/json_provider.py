@@ -0,0 +1,95 @@
+"""
+JSON provider for the Flask app.
+
+API payloads carry ``UUID``, ``Decimal``, ``date`` and ``datetime`` values
+straight from the models; this provider serializes them (as strings,
+floats and ISO 8601 strings) so the service layer does not have to convert
+every field of every row by hand.
+
+When ``orjson`` is installed it does the encoding and decoding: it handles
+UUIDs and dates natively in C, only calls back into Python for
+``Decimal``, and writes the response body as bytes without an intermediate
+``str``. Without it the standard library encoder is used with the same
+conversions, so the output is identical either way.
+
+Unlike Flask's default provider, keys keep their insertion order, non-ASCII
+text is not escaped, and dates are ISO 8601 instead of HTTP dates.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _default(o):
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` with native model types and optional ``orjson``."""
+
+    default = staticmethod(_default)
+    sort_keys = False
+    # orjson always writes UTF-8; match it on the fallback path.
+    ensure_ascii = False
+
+    def _orjson_option(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            if "indent" not in kwargs:
+                kwargs.setdefault("separators", (",", ":"))
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+
+        if orjson is None:
+            body = json.dumps(
+                obj,
+                default=self.default,
+                ensure_ascii=self.ensure_ascii,
+                sort_keys=self.sort_keys,
+                **({"indent": 2} if pretty else {"separators": (",", ":")}),
+            )
+            return self._app.response_class(f"{body}\n", mimetype=self.mimetype)
+
+        body = orjson.dumps(obj, default=self.default, option=self._orjson_option(indent=pretty))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -106,6 +106,21 @@ def validate_non_empty_string(value, field_name: str):
     return text
 
 
+def parse_limit_query(value, *, default: int, maximum: int) -> int:
+    if value is None or value == "":
+        return default
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError) as exc:
+        raise BadRequestError("Invalid limit format") from exc
+
+    if limit < 1 or limit > maximum:
+        raise BadRequestError(f"limit must be between 1 and {maximum}")
+
+    return limit
+
+
 @dataclass(frozen=True)
 class MonthYearFilter:
     year: int | None
@@ -1,3 +1,4 @@
+from app.services.errors import BadRequestError
 from app.validators.common_validators import (
     parse_uuid_field,
     validate_date_field,
@@ -6,6 +7,7 @@ from app.validators.common_validators import (
     validate_required_string,
     validate_non_empty_string,
 )
+from app.validators.receipt_item_validators import validate_receipt_item_create_data
 
 
 def validate_receipt_create_data(data: dict):
@@ -43,6 +45,81 @@ def validate_receipt_create_data(data: dict):
     }
 
 
+def validate_ekasa_import_data(data: dict):
+    receipt_id = str(data.get("receipt_id", "")).strip()
+    if not receipt_id:
+        raise BadRequestError("Missing receipt_id")
+
+    return {
+        "receipt_id": receipt_id,
+        "account_id": parse_uuid_field(data.get("account_id"), "account_id", required=False),
+    }
+
+
+def validate_ekasa_batch_data(data: dict, max_size: int):
+    receipt_ids = data.get("receipt_ids")
+    if receipt_ids is None:
+        raise BadRequestError("Missing receipt_ids")
+    if not isinstance(receipt_ids, list) or not receipt_ids:
+        raise BadRequestError("receipt_ids must be a non-empty list")
+    if len(receipt_ids) > max_size:
+        raise BadRequestError(f"receipt_ids cannot contain more than {max_size} items")
+
+    cleaned = []
+    for value in receipt_ids:
+        if not isinstance(value, str) or not value.strip():
+            raise BadRequestError("receipt_ids must contain non-empty strings")
+        cleaned.append(value.strip())
+
+    return {
+        "receipt_ids": list(dict.fromkeys(cleaned)),
+        "account_id": parse_uuid_field(data.get("account_id"), "account_id", required=False),
+    }
+
+
+def validate_receipt_bulk_data(data: dict, max_receipts: int, max_items: int):
+    receipts = data.get("receipts")
+    if receipts is None:
+        raise BadRequestError("Missing receipts")
+    if not isinstance(receipts, list) or not receipts:
+        raise BadRequestError("receipts must be a non-empty list")
+    if len(receipts) > max_receipts:
+        raise BadRequestError(f"receipts cannot contain more than {max_receipts} items")
+
+    cleaned = []
+    total_items = 0
+    for index, receipt_data in enumerate(receipts):
+        path = f"receipts[{index}]"
+        if not isinstance(receipt_data, dict):
+            raise BadRequestError(f"{path} must be an object")
+        try:
+            receipt = validate_receipt_create_data(receipt_data)
+        except BadRequestError as exc:
+            raise BadRequestError(f"{path}: {exc}") from exc
+
+        items = receipt_data.get("items")
+        if items is None:
+            items = []
+        if not isinstance(items, list):
+            raise BadRequestError(f"{path}.items must be a list")
+        total_items += len(items)
+        if total_items > max_items:
+            raise BadRequestError(f"Bulk request cannot contain more than {max_items} receipt items")
+
+        receipt["items"] = []
+        for item_index, item_data in enumerate(items):
+            item_path = f"{path}.items[{item_index}]"
+            if not isinstance(item_data, dict):
+                raise BadRequestError(f"{item_path} must be an object")
+            try:
+                receipt["items"].append(validate_receipt_item_create_data(item_data))
+            except BadRequestError as exc:
+                raise BadRequestError(f"{item_path}: {exc}") from exc
+        cleaned.append(receipt)
+
+    return cleaned
+
+
 def validate_receipt_update_data(data: dict):
     cleaned = {}
 
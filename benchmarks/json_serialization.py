@@ -0,0 +1,206 @@
+"""JSON serialization cost of large receipt payloads.
+
+Builds 10k receipts (with items for the eKasa shape) in memory and times
+turning them into a Flask response three ways:
+
+* ``manual+default`` - the previous serializers, which converted every
+  UUID, Decimal and date by hand, encoded by Flask's default provider
+  (kept here as the reference);
+* ``native+stdlib`` - the current serializers with
+  :class:`app.utils.json_provider.FastJSONProvider` on the standard library
+  encoder;
+* ``native+orjson`` - the same with ``orjson`` (skipped if not installed).
+
+All three must produce the same JSON document.
+
+Usage:
+    python -m benchmarks.json_serialization
+    python -m benchmarks.json_serialization --rows 50000 --items-per-receipt 5 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.models import Account, Receipt, ReceiptItem, Tag
+from app.services import receipts_service
+from app.services.responses import OkResult
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+from benchmarks.qr_decode import percentile
+
+
+def manual_receipt(receipt: Receipt) -> dict:
+    """The previous ``_serialize_receipt``."""
+    return {
+        "id": str(receipt.id),
+        "external_uid": receipt.external_uid,
+        "tag": receipt.tag.name if receipt.tag else None,
+        "tag_id": str(receipt.tag_id) if receipt.tag_id else None,
+        "description": receipt.description,
+        "issue_date": receipt.issue_date.isoformat() if receipt.issue_date else None,
+        "currency": receipt.account.currency if receipt.account is not None else None,
+        "total_amount": float(receipt.total_amount) if receipt.total_amount is not None else None,
+        "extra_metadata": receipt.extra_metadata,
+        "user_id": str(receipt.user_id),
+        "account_id": str(receipt.account_id),
+        "created_at": receipt.created_at.isoformat() if receipt.created_at else None,
+    }
+
+
+def manual_item(item: ReceiptItem) -> dict:
+    """The previous per-item conversion of ``get_ekasa_items``."""
+    return {
+        "id": str(item.id),
+        "name": item.name,
+        "quantity": float(item.quantity) if item.quantity is not None else None,
+        "unit_price": float(item.unit_price) if item.unit_price is not None else None,
+        "total_price": float(item.total_price) if item.total_price is not None else None,
+        "category_id": str(item.category_id) if item.category_id else None,
+        "extra_metadata": item.extra_metadata,
+    }
+
+
+def native_item(item: ReceiptItem) -> dict:
+    return {
+        "id": item.id,
+        "name": item.name,
+        "quantity": item.quantity,
+        "unit_price": item.unit_price,
+        "total_price": item.total_price,
+        "category_id": item.category_id,
+        "extra_metadata": item.extra_metadata,
+    }
+
+
+def build_receipts(rows: int, items_per_receipt: int) -> list[Receipt]:
+    user_id = uuid.uuid4()
+    account = Account(id=uuid.uuid4(), name="Main", currency="EUR")
+    tags = [Tag(id=uuid.uuid4(), user_id=user_id, name=f"Tag {n}") for n in range(5)]
+    category_ids = [uuid.uuid4() for _ in range(10)] + [None]
+    created_at = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+    receipts = []
+    for n in range(rows):
+        tag = tags[n % len(tags)] if n % 3 else None
+        receipt = Receipt(
+            id=uuid.uuid4(),
+            external_uid=f"O-{n:08d}",
+            user_id=user_id,
+            account_id=account.id,
+            tag_id=tag.id if tag else None,
+            description=f"Receipt {n}",
+            issue_date=date(2025, 10, 1 + n % 28),
+            total_amount=Decimal(f"{n % 500}.{n % 100:02d}"),
+            created_at=created_at,
+        )
+        receipt.account = account
+        receipt.tag = tag
+        receipt.items = [
+            ReceiptItem(
+                id=uuid.uuid4(),
+                receipt_id=receipt.id,
+                user_id=user_id,
+                category_id=category_ids[(n + i) % len(category_ids)],
+                name=f"Item {i}",
+                quantity=Decimal("1.000"),
+                unit_price=Decimal("2.49"),
+                total_price=Decimal("2.49"),
+            )
+            for i in range(items_per_receipt)
+        ]
+        receipts.append(receipt)
+    return receipts
+
+
+def receipts_payload(receipts, serialize) -> dict:
+    return {"receipts": [serialize(receipt) for receipt in receipts], "next_cursor": None}
+
+
+def ekasa_payload(receipts, serialize_receipt, serialize_item) -> dict:
+    checks = []
+    for receipt in receipts:
+        check = serialize_receipt(receipt)
+        check["items"] = [serialize_item(item) for item in receipt.items]
+        checks.append(check)
+    return {"success": True, "checks": checks, "total_checks": len(checks)}
+
+
+def measure(app: Flask, build_payload, repeat: int) -> tuple[list[float], bytes]:
+    latencies_ms = []
+    body = b""
+    with app.test_request_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response, _status = OkResult(build_payload()).to_flask_response()
+            body = response.get_data()
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+    return latencies_ms, body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="receipts per payload")
+    parser.add_argument("--items-per-receipt", type=int, default=3, help="items per receipt in the eKasa payload")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per implementation")
+    args = parser.parse_args(argv)
+
+    receipts = build_receipts(args.rows, args.items_per_receipt)
+
+    default_app = Flask(__name__)
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app = Flask(__name__)
+    fast_app.json = FastJSONProvider(fast_app)
+
+    shapes = {
+        "receipts": (
+            lambda: receipts_payload(receipts, manual_receipt),
+            lambda: receipts_payload(receipts, receipts_service._serialize_receipt),
+        ),
+        "ekasa_items": (
+            lambda: ekasa_payload(receipts, manual_receipt, manual_item),
+            lambda: ekasa_payload(receipts, receipts_service._serialize_receipt, native_item),
+        ),
+    }
+    implementations = [("manual+default", default_app, 0), ("native+stdlib", fast_app, 1)]
+    if json_provider.orjson is not None:
+        implementations.append(("native+orjson", fast_app, 1))
+
+    rows = []
+    for shape, builders in shapes.items():
+        documents = []
+        for name, app, builder in implementations:
+            use_orjson = name.endswith("orjson")
+            with mock.patch.object(json_provider, "orjson", json_provider.orjson if use_orjson else None):
+                latencies_ms, body = measure(app, builders[builder], args.repeat)
+            documents.append(json.loads(body))
+            rows.append({
+                "payload": shape,
+                "implementation": name,
+                "rows": args.rows,
+                "bytes": len(body),
+                "p50_ms": round(percentile(latencies_ms, 50), 1),
+                "p90_ms": round(percentile(latencies_ms, 90), 1),
+            })
+        if any(document != documents[0] for document in documents[1:]):
+            raise SystemExit(f"{shape}: implementations produced different JSON")
+
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
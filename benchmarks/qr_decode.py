@@ -0,0 +1,176 @@
+"""QR decoding benchmark for :class:`app.services.qr_service.QrService`.
+
+Runs the decoding pipeline over a corpus of receipt photos and reports the
+success rate, attempts-to-success and latency percentiles for each worker
+configuration.
+
+Usage:
+    python -m benchmarks.qr_decode                      # synthetic corpus
+    python -m benchmarks.qr_decode --corpus photos/     # real photos
+    python -m benchmarks.qr_decode --workers 1 4 8 --repeat 3
+
+A real corpus is a directory of images. When a file name contains an eKasa
+receipt ID (``O-...``) the decoded value is checked against it, otherwise
+any decoded ID counts as a success. Without ``--corpus`` a deterministic
+synthetic corpus is generated: QR codes pasted onto noisy receipt-like
+backgrounds with varying size, rotation, blur, contrast and resolution,
+including a few large phone-sized photos and images without a QR code.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image, ImageFilter
+
+from app.services.qr_service import QrService
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".bmp"}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _qr_matrix(text: str) -> np.ndarray:
+    encoder = cv2.QRCodeEncoder.create() if hasattr(cv2.QRCodeEncoder, "create") else cv2.QRCodeEncoder()
+    return encoder.encode(text)
+
+
+def _synthetic_photo(rng: random.Random, receipt_id: str | None, size: tuple[int, int], module_px: int,
+                     angle: float, blur: float, contrast: float) -> Image.Image:
+    width, height = size
+    noise = np.random.default_rng(rng.randrange(2**32)).normal(225, 18, (height, width))
+    canvas = Image.fromarray(np.clip(noise, 0, 255).astype(np.uint8), mode="L")
+
+    if receipt_id is not None:
+        matrix = _qr_matrix(receipt_id)
+        qr = Image.fromarray(matrix, mode="L")
+        qr = qr.resize((qr.width * module_px, qr.height * module_px), Image.NEAREST)
+        border = module_px * 4
+        framed = Image.new("L", (qr.width + 2 * border, qr.height + 2 * border), 255)
+        framed.paste(qr, (border, border))
+        framed = framed.rotate(angle, expand=True, fillcolor=255)
+        x = rng.randint(0, max(0, width - framed.width))
+        y = rng.randint(0, max(0, height - framed.height))
+        canvas.paste(framed, (x, y))
+
+    if blur:
+        canvas = canvas.filter(ImageFilter.GaussianBlur(blur))
+    if contrast != 1.0:
+        arr = np.asarray(canvas, dtype=np.float32)
+        canvas = Image.fromarray(np.clip((arr - 128) * contrast + 128, 0, 255).astype(np.uint8), mode="L")
+    return canvas.convert("RGB")
+
+
+def synthetic_corpus(count: int, seed: int = 42) -> list[tuple[str, Image.Image, str | None]]:
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        receipt_id = "O-" + "".join(rng.choice("0123456789ABCDEF") for _ in range(32))
+        kind = index % 10
+        if kind == 9:
+            # Photos without any QR code exercise the full (failing) pipeline.
+            corpus.append((f"noqr-{index}", _synthetic_photo(rng, None, (1200, 1600), 0, 0, 0, 1.0), None))
+            continue
+        large = kind in (7, 8)
+        size = (3024, 4032) if large else (rng.randint(600, 1100), rng.randint(800, 1400))
+        photo = _synthetic_photo(
+            rng,
+            receipt_id,
+            size,
+            module_px=rng.randint(9, 14) if large else rng.randint(3, 7),
+            angle=rng.choice([0, 0, 90, 180, 270, rng.uniform(-25, 25)]),
+            blur=rng.choice([0, 0, 0.8, 1.5]),
+            contrast=rng.choice([1.0, 1.0, 0.5, 0.3]),
+        )
+        corpus.append((f"synthetic-{index}", photo, receipt_id))
+    return corpus
+
+
+def directory_corpus(path: Path) -> list[tuple[str, Image.Image, str | None]]:
+    corpus = []
+    for file in sorted(path.iterdir()):
+        if file.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        image = Image.open(file)
+        image.load()
+        match = re.search(QrService.EKASA_PATTERN, file.stem)
+        corpus.append((file.name, image, match.group(0) if match else None))
+    return corpus
+
+
+def run(corpus, workers: int, repeat: int) -> dict:
+    service = QrService(max_workers=workers)
+    latencies_ms = []
+    attempts_to_success = []
+    failures = 0
+    wrong = 0
+    try:
+        for _ in range(repeat):
+            for _name, image, expected in corpus:
+                started = time.perf_counter()
+                result = service.scan_image(image)
+                latencies_ms.append((time.perf_counter() - started) * 1000)
+                if result.receipt_id is None:
+                    failures += 1
+                elif expected is not None and result.receipt_id != expected:
+                    wrong += 1
+                else:
+                    attempts_to_success.append(result.attempts)
+    finally:
+        service.shutdown()
+
+    scans = len(corpus) * repeat
+    return {
+        "workers": workers,
+        "scans": scans,
+        "decoded": len(attempts_to_success),
+        "failed": failures,
+        "wrong": wrong,
+        "attempts_p50": percentile(attempts_to_success, 50),
+        "attempts_p90": percentile(attempts_to_success, 90),
+        "attempts_mean": round(statistics.fmean(attempts_to_success), 2) if attempts_to_success else 0.0,
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 1),
+        "latency_p90_ms": round(percentile(latencies_ms, 90), 1),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 1),
+        "latency_max_ms": round(max(latencies_ms, default=0.0), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of receipt photos (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=40, help="synthetic corpus size")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="decoder pool sizes to compare")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus per configuration")
+    args = parser.parse_args(argv)
+
+    corpus = directory_corpus(args.corpus) if args.corpus else synthetic_corpus(args.count)
+    print(f"corpus: {len(corpus)} images ({args.corpus or 'synthetic'})")
+
+    columns = [
+        "workers", "scans", "decoded", "failed", "wrong",
+        "attempts_p50", "attempts_p90", "attempts_mean",
+        "latency_p50_ms", "latency_p90_ms", "latency_p99_ms", "latency_max_ms",
+    ]
+    rows = [run(corpus, workers, args.repeat) for workers in args.workers]
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Request latency while QR photos are being decoded.
+
+Runs a steady stream of QR scans on background threads (standing in for
+upload requests) and meanwhile times a small pure-Python task on the main
+thread (standing in for every other request the same app process
+serves). Three configurations are compared:
+
+* ``idle`` - no scans, the baseline;
+* ``threads`` - decoder attempts on the in-process thread pool
+  (``QR_DECODE_PROCESSES=0``);
+* ``processes`` - decoder attempts in warm decoder processes.
+
+Usage:
+    python -m benchmarks.qr_offload
+    python -m benchmarks.qr_offload --uploads 4 --processes 2 --seconds 10
+    python -m benchmarks.qr_offload --max-p99-ratio 3   # exit 1 if processes p99 > 3x idle p99
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from app.services.qr_service import QrService
+
+from benchmarks.qr_decode import percentile, synthetic_corpus
+
+
+def request_work() -> None:
+    """About a millisecond of interpreter-bound work, like building a small response."""
+    rows = [{"id": n, "name": f"Item {n}", "amount": n * 1.5} for n in range(300)]
+    sorted(rows, key=lambda row: (row["name"], -row["amount"]))
+
+
+def measure(service: QrService | None, corpus, uploads: int, seconds: float) -> dict:
+    stop = threading.Event()
+    scans = []
+
+    def upload_loop(offset):
+        index = offset
+        while not stop.is_set():
+            service.scan_image(corpus[index % len(corpus)][1])
+            scans.append(1)
+            index += uploads
+
+    threads = [threading.Thread(target=upload_loop, args=(n,)) for n in range(uploads if service else 0)]
+    for thread in threads:
+        thread.start()
+
+    latencies_ms = []
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            request_work()
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            # Requests arrive spaced out, not back to back.
+            time.sleep(0.002)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    return {
+        "requests": len(latencies_ms),
+        "scans": len(scans),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p90_ms": round(percentile(latencies_ms, 90), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms, default=0.0), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=2, help="concurrent scans in flight")
+    parser.add_argument("--workers", type=int, default=4, help="decoder threads in threads mode")
+    parser.add_argument("--processes", type=int, default=2, help="decoder processes in processes mode")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement time per configuration")
+    parser.add_argument("--count", type=int, default=20, help="synthetic corpus size")
+    parser.add_argument("--max-p99-ratio", type=float, help="fail if processes p99 exceeds idle p99 by this factor")
+    args = parser.parse_args(argv)
+
+    corpus = synthetic_corpus(args.count)
+    services = {
+        "idle": None,
+        "threads": QrService(max_workers=args.workers),
+        "processes": QrService(processes=args.processes),
+    }
+    services["processes"].warm_up()
+
+    rows = []
+    try:
+        for name, service in services.items():
+            rows.append({"mode": name, **measure(service, corpus, args.uploads, args.seconds)})
+    finally:
+        for service in services.values():
+            if service is not None:
+                service.shutdown()
+
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))
+
+    if args.max_p99_ratio is not None:
+        idle, processes = rows[0], rows[2]
+        if processes["p99_ms"] > idle["p99_ms"] * args.max_p99_ratio:
+            print(f"processes p99 {processes['p99_ms']} ms exceeds {args.max_p99_ratio}x idle p99 {idle['p99_ms']} ms")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
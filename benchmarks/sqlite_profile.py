@@ -0,0 +1,114 @@
+"""Insert and aggregate throughput on SQLite with and without the performance profile.
+
+For each setting of ``SQLITE_PERFORMANCE_PROFILE`` the script creates a
+fresh database file, bulk-seeds a month of receipts, then times
+single-receipt commits through :func:`app.services.receipts_service.create_receipt`
+(the write path of the API, where ``synchronous=NORMAL`` under WAL saves an
+fsync per commit) and the donut aggregation over the seeded month.
+
+Usage:
+    python -m benchmarks.sqlite_profile
+    python -m benchmarks.sqlite_profile --items 250000 --commits 1000 --repeat 10
+    python -m benchmarks.sqlite_profile --directory /mnt/ssd/bench
+
+Results depend heavily on the file system holding ``--directory`` (the
+default is the system temp directory, which may be tmpfs); point it at the
+disk the application would use. Exits with status 1 when ``--min-speedup``
+is given and the profile's commit throughput gains less than that.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db
+from app.models import Base
+from app.services import analytics_service, receipts_service
+from app.services.users_service import create_user_with_main_account
+from app.validators.common_validators import parse_month_year_query_filter
+
+from benchmarks.donut_analytics import seed
+from benchmarks.qr_decode import percentile
+
+
+def run_profile(enabled: bool, directory: Path, args) -> dict:
+    class BenchmarkConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{directory / ('profile.db' if enabled else 'default.db')}"
+        SQLITE_PERFORMANCE_PROFILE = enabled
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        Base.metadata.create_all(bind=db.engine)
+        journal_mode = db.session.connection().exec_driver_sql("PRAGMA journal_mode").scalar()
+        user = create_user_with_main_account(
+            username="sqlite-bench",
+            email="sqlite-bench@example.com",
+            password_hash="x",
+            is_verified=True,
+        )
+        db.session.commit()
+        user_id = user.id
+
+        started = time.perf_counter()
+        seed(user_id, args.items, categories=25, tags=10, items_per_receipt=8, year=2025, month=10)
+        seed_seconds = time.perf_counter() - started
+
+        payload = {"description": "Timed receipt", "total_amount": "4.20", "issue_date": "2025-10-15"}
+        started = time.perf_counter()
+        for _ in range(args.commits):
+            receipts_service.create_receipt(payload, user_id)
+        commit_seconds = time.perf_counter() - started
+
+        month_filter = parse_month_year_query_filter("2025", "10")
+        latencies_ms = []
+        for _ in range(args.repeat):
+            db.session.expire_all()
+            started = time.perf_counter()
+            analytics_service.get_donut_data(user_id, month_filter)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+        db.session.remove()
+        db.engine.dispose()
+
+    return {
+        "profile": "performance" if enabled else "default",
+        "journal_mode": journal_mode,
+        "seed_rows_per_s": round(args.items / seed_seconds),
+        "commits_per_s": round(args.commits / commit_seconds, 1),
+        "donut_p50_ms": round(percentile(latencies_ms, 50), 1),
+        "donut_p90_ms": round(percentile(latencies_ms, 90), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="receipt items to bulk-seed")
+    parser.add_argument("--commits", type=int, default=500, help="single-receipt transactions to time")
+    parser.add_argument("--repeat", type=int, default=5, help="timed donut aggregations")
+    parser.add_argument("--directory", type=Path, default=None, help="where to create the database files")
+    parser.add_argument("--min-speedup", type=float, default=None,
+                        help="fail if the profile's commits/s gain is below this factor")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmp:
+        rows = [run_profile(enabled, Path(tmp), args) for enabled in (False, True)]
+
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))
+
+    speedup = rows[1]["commits_per_s"] / rows[0]["commits_per_s"] if rows[0]["commits_per_s"] else 0.0
+    print(f"commit throughput speedup: {speedup:.2f}x")
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
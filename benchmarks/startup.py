@@ -0,0 +1,112 @@
+"""Cold-start profile of ``create_app()``.
+
+Each run starts a fresh interpreter with ``python -X importtime``, builds
+the app with the test configuration and reports how long that took, the
+slowest top-level imports, and whether any of the heavy optional
+dependencies (OpenCV, NumPy, Pillow, pyzbar, pandas, reportlab) were
+loaded. They are imported on first use, so none should be.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --top 20
+    python -m benchmarks.startup --max-ms 1500
+
+Exits with status 1 when a heavy dependency is loaded during start-up or
+the median start-up time exceeds ``--max-ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks.qr_decode import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "pyzbar", "pandas", "reportlab")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+from app.config import TestConfig
+create_app(TestConfig)
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "create_app_ms": elapsed_ms,
+    "heavy_modules": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$")
+
+
+def run_probe() -> tuple[dict, dict[str, int]]:
+    env = dict(os.environ, APP_ENV="test", PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # Cumulative microseconds per top-level package, taken from the line
+    # where the package itself is first imported (at whatever depth).
+    packages: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and "." not in match.group(3):
+            packages.setdefault(match.group(3), int(match.group(2)))
+    return result, packages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median create_app() exceeds this")
+    args = parser.parse_args(argv)
+
+    timings_ms = []
+    heavy = set()
+    packages: dict[str, list[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        result, run_packages = run_probe()
+        timings_ms.append(result["create_app_ms"])
+        heavy.update(result["heavy_modules"])
+        for name, micros in run_packages.items():
+            packages[name].append(micros)
+
+    median_ms = percentile(timings_ms, 50)
+    print(f"create_app() cold start over {args.runs} runs: "
+          f"p50 {median_ms:.0f} ms, min {min(timings_ms):.0f} ms, max {max(timings_ms):.0f} ms")
+    print("(-X importtime adds overhead; compare runs with each other, not with production boot time)")
+
+    slowest = sorted(packages.items(), key=lambda item: percentile(item[1], 50), reverse=True)[:args.top]
+    width = max(len(name) for name, _ in slowest)
+    print(f"\n{'package'.ljust(width)}  cumulative_ms_p50")
+    for name, micros in slowest:
+        print(f"{name.ljust(width)}  {percentile(micros, 50) / 1000:>17.1f}")
+
+    print(f"\nheavy modules loaded at start-up: {', '.join(sorted(heavy)) or 'none'}")
+
+    failed = bool(heavy)
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"median start-up {median_ms:.0f} ms exceeds --max-ms {args.max_ms:.0f}")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
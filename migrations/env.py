@@ -46,9 +46,11 @@ target_db = current_app.extensions['migrate'].db
 
 
 def get_metadata():
-    if hasattr(target_db, 'metadatas'):
-        return target_db.metadatas[None]
-    return target_db.metadata
+    # The models are declared on their own ``DeclarativeBase`` rather than
+    # ``db.Model``, so Flask-SQLAlchemy's metadata is empty.
+    import app.models
+
+    return app.models.Base.metadata
 
 
 def run_migrations_offline():
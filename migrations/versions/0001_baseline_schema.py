@@ -0,0 +1,313 @@
+"""baseline schema
+
+Schema as previously created by ``Base.metadata.create_all``. Databases
+that were created that way can be adopted with ``flask db stamp
+0001_baseline`` before running ``flask db upgrade``.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 06:16:58.659859
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.types import JSONType
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('accounts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('account_type', sa.Enum('account', 'savings_fund', name='accounttype', native_enum=False), server_default='account', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('username', sa.String(length=32), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('is_verified', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('account_members',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('role', sa.String(length=32), server_default='owner', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'account_id', name='uq_account_members_user_account')
+    )
+    with op.batch_alter_table('account_members', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_account_members_account_id'), ['account_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_account_members_user_id'), ['user_id'], unique=False)
+
+    op.create_table('allocations',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('allocation_date', sa.Date(), server_default=sa.text('(CURRENT_DATE)'), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('source_account_id', sa.UUID(), nullable=False),
+    sa.Column('target_account_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['source_account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['target_account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('allocations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_allocations_source_account_id'), ['source_account_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_allocations_target_account_id'), ['target_account_id'], unique=False)
+
+    op.create_table('auth_tokens',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('token', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token')
+    )
+    op.create_table('categories',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('parent_id', sa.UUID(), nullable=True),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('is_pinned', sa.Boolean(), server_default=sa.text('(false)'), nullable=False),
+    sa.Column('limit', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_categories_user_id'), ['user_id'], unique=False)
+
+    op.create_table('email_verifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('code', sa.String(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('is_used', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('financial_targets',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('target_amount', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('target_percent', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('currency', sa.Text(), nullable=False),
+    sa.Column('current_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('deadline_date', sa.Date(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('financial_targets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_financial_targets_user_id'), ['user_id'], unique=False)
+
+    op.create_table('monthly_rollups',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=True),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=True),
+    sa.Column('tag_id', sa.UUID(), nullable=True),
+    sa.Column('income_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('income_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('receipt_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('receipt_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('item_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('monthly_rollups', schema=None) as batch_op:
+        batch_op.create_index('ix_monthly_rollups_category_month', ['category_id', 'month'], unique=False)
+        batch_op.create_index('ix_monthly_rollups_user_month', ['user_id', 'month'], unique=False)
+
+    op.create_table('savings_funds',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('target_amount', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('monthly_contribution', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('tags',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('type', sa.Enum('INCOME', 'EXPENSE', 'BOTH', name='tagtype'), nullable=True),
+    sa.Column('counter', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'name', name='uq_user_tag_name')
+    )
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tags_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tags_user_id'), ['user_id'], unique=False)
+
+    op.create_table('goals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('savings_fund_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('target_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('current_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('is_completed', sa.Boolean(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['savings_fund_id'], ['savings_funds.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_goals_savings_fund_id'), ['savings_fund_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_goals_user_id'), ['user_id'], unique=False)
+
+    op.create_table('incomes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('tag_id', sa.UUID(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('income_date', sa.Date(), nullable=False),
+    sa.Column('extra_metadata', JSONType(), nullable=True),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('incomes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_incomes_income_date'), ['income_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_incomes_tag_id'), ['tag_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_incomes_user_id'), ['user_id'], unique=False)
+
+    op.create_table('receipts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('external_uid', sa.Text(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('tag_id', sa.UUID(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('issue_date', sa.Date(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('extra_metadata', JSONType(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_receipts_account_id'), ['account_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipts_external_uid'), ['external_uid'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipts_issue_date'), ['issue_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipts_tag_id'), ['tag_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipts_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_receipts_user_issue_date_id', ['user_id', 'issue_date', 'id'], unique=False)
+        batch_op.create_index('ix_receipts_user_total_amount_id', ['user_id', 'total_amount', 'id'], unique=False)
+
+    op.create_table('receipt_items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('receipt_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=True),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=12, scale=3), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_price', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('extra_metadata', JSONType(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['receipt_id'], ['receipts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('receipt_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_receipt_items_category_id'), ['category_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipt_items_receipt_id'), ['receipt_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_receipt_items_user_id'), ['user_id'], unique=False)
+
+
+
+def downgrade():
+    with op.batch_alter_table('receipt_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_receipt_items_user_id'))
+        batch_op.drop_index(batch_op.f('ix_receipt_items_receipt_id'))
+        batch_op.drop_index(batch_op.f('ix_receipt_items_category_id'))
+
+    op.drop_table('receipt_items')
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.drop_index('ix_receipts_user_total_amount_id')
+        batch_op.drop_index('ix_receipts_user_issue_date_id')
+        batch_op.drop_index(batch_op.f('ix_receipts_user_id'))
+        batch_op.drop_index(batch_op.f('ix_receipts_tag_id'))
+        batch_op.drop_index(batch_op.f('ix_receipts_issue_date'))
+        batch_op.drop_index(batch_op.f('ix_receipts_external_uid'))
+        batch_op.drop_index(batch_op.f('ix_receipts_account_id'))
+
+    op.drop_table('receipts')
+    with op.batch_alter_table('incomes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_incomes_user_id'))
+        batch_op.drop_index(batch_op.f('ix_incomes_tag_id'))
+        batch_op.drop_index(batch_op.f('ix_incomes_income_date'))
+
+    op.drop_table('incomes')
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_goals_user_id'))
+        batch_op.drop_index(batch_op.f('ix_goals_savings_fund_id'))
+
+    op.drop_table('goals')
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tags_user_id'))
+        batch_op.drop_index(batch_op.f('ix_tags_name'))
+
+    op.drop_table('tags')
+    op.drop_table('savings_funds')
+    with op.batch_alter_table('monthly_rollups', schema=None) as batch_op:
+        batch_op.drop_index('ix_monthly_rollups_user_month')
+        batch_op.drop_index('ix_monthly_rollups_category_month')
+
+    op.drop_table('monthly_rollups')
+    with op.batch_alter_table('financial_targets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_financial_targets_user_id'))
+
+    op.drop_table('financial_targets')
+    op.drop_table('email_verifications')
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_categories_user_id'))
+
+    op.drop_table('categories')
+    op.drop_table('auth_tokens')
+    with op.batch_alter_table('allocations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_allocations_target_account_id'))
+        batch_op.drop_index(batch_op.f('ix_allocations_source_account_id'))
+
+    op.drop_table('allocations')
+    with op.batch_alter_table('account_members', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_account_members_user_id'))
+        batch_op.drop_index(batch_op.f('ix_account_members_account_id'))
+
+    op.drop_table('account_members')
+    op.drop_table('users')
+    op.drop_table('accounts')
+    # Native enum type on PostgreSQL; a no-op elsewhere.
+    sa.Enum(name='tagtype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,57 @@
+"""hot query indexes
+
+Composite indexes for the queries behind the dashboard, analytics, receipt
+and income listings, and main-account resolution:
+
+* ``receipts(user_id, account_id, issue_date)``: donut analytics and
+  account-filtered receipt listings for a month.
+* ``incomes(user_id, income_date)``: month listings of incomes.
+* ``receipt_items(receipt_id, category_id)``: items joined to a receipt and
+  grouped by category.
+* ``auth_tokens(user_id, expires_at)``: cascade deletes from ``users``;
+  lookups by token already use the unique index on ``token``.
+* ``account_members(user_id, created_at)``: a user's memberships oldest
+  first, which is how the main account is found on nearly every request.
+
+On PostgreSQL the indexes are built ``CONCURRENTLY`` so writes are not
+blocked while a large table is indexed.
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 06:24:41.118305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_query_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_receipts_user_account_issue_date', 'receipts', ['user_id', 'account_id', 'issue_date']),
+    ('ix_incomes_user_income_date', 'incomes', ['user_id', 'income_date']),
+    ('ix_receipt_items_receipt_category', 'receipt_items', ['receipt_id', 'category_id']),
+    ('ix_auth_tokens_user_expires_at', 'auth_tokens', ['user_id', 'expires_at']),
+    ('ix_account_members_user_created_at', 'account_members', ['user_id', 'created_at']),
+)
+
+
+def _concurrently():
+    return {'postgresql_concurrently': True} if op.get_bind().dialect.name == 'postgresql' else {}
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, **_concurrently())
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, **_concurrently())
@@ -0,0 +1,29 @@
+"""user data version
+
+Adds ``users.data_version``, the per-user counter behind the ``ETag`` of
+read endpoints (see ``app/services/data_version_service.py``).
+
+Revision ID: 0003_user_data_version
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-18 07:02:13.540912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_user_data_version'
+down_revision = '0002_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,67 @@
+"""Rebuild or verify the ``monthly_rollups`` table.
+
+The table is maintained incrementally on every ORM flush; writes that
+bypass the ORM (bulk statements, manual SQL, restores) can leave it out of
+date. ``verify`` compares it against the source tables and exits with
+status 1 when they disagree, ``rebuild`` recomputes it.
+
+Usage:
+    python -m scripts.monthly_rollups verify
+    python -m scripts.monthly_rollups rebuild
+    python -m scripts.monthly_rollups rebuild --user-id 6f1c...
+"""
+
+import argparse
+import sys
+import uuid
+
+from app import create_app
+from app.extensions import db
+from app.services import monthly_rollups_service
+
+
+def _print_drift(drift, limit):
+    for entry in drift[:limit]:
+        key = entry["key"]
+        changed = {
+            name: (entry["stored"][name], entry["expected"][name])
+            for name in entry["expected"]
+            if entry["stored"][name] != entry["expected"][name]
+        }
+        details = ", ".join(f"{name}: {have} != {want}" for name, (have, want) in changed.items())
+        print(
+            f"  user={key.user_id} account={key.account_id} month={key.month:%Y-%m} "
+            f"category={key.category_id} tag={key.tag_id}: {details}"
+        )
+    if len(drift) > limit:
+        print(f"  ... and {len(drift) - limit} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("verify", "rebuild"))
+    parser.add_argument("--user-id", type=uuid.UUID, help="limit to one user (default: everyone)")
+    parser.add_argument("--show", type=int, default=20, help="drifted keys to print")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        if args.command == "rebuild":
+            rows = monthly_rollups_service.rebuild(args.user_id)
+            db.session.commit()
+            print(f"Rebuilt monthly_rollups: {rows} rows")
+            return 0
+
+        drift = monthly_rollups_service.verify(args.user_id)
+        if not drift:
+            print("monthly_rollups is consistent with the source tables")
+            return 0
+
+        print(f"monthly_rollups has drifted for {len(drift)} keys:")
+        _print_drift(drift, args.show)
+        print("Run `python -m scripts.monthly_rollups rebuild` to recompute it.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,676 @@
+"""Deterministic synthetic dataset for benchmarks and load tests.
+
+Generates ``--users`` users with ``--years`` of history each: a main
+account, savings funds with monthly allocations and goals, financial
+targets, categories (with sub-categories), merchant and income tags,
+monthly salaries plus occasional side income, and receipts with items.
+Distributions are meant to look like real use rather than uniform noise:
+
+* receipts per month scatter around ``--receipts-per-month``;
+* merchants are picked with Zipf-like popularity, so a few shops dominate;
+* items per receipt are geometric around ``--items-per-receipt``, with
+  produce sold by weight and most other goods in ones and twos;
+* about half the receipts come from eKasa (``external_uid`` and metadata
+  set), one in ten has no items, and some items are uncategorized.
+
+The same ``--seed`` and ``--end`` always produce the same rows, IDs
+included. Each user's data comes from its own random stream, so user ``n``
+looks the same whatever ``--users`` is.
+
+Rows bypass the ORM. They are bulk-loaded in chunks with ``COPY`` on
+PostgreSQL through psycopg2 and with ``executemany`` inserts elsewhere;
+with ``--reset`` the secondary indexes are built after the load. What the
+flush hooks would otherwise maintain (tag counters and types, category
+usage, ``monthly_rollups``) is computed while generating.
+
+Every user can sign in as ``synthetic-<seed>-<n>@example.com`` with the
+password ``synthetic`` (see :func:`user_email`).
+
+Usage:
+    python -m scripts.synthetic_data --users 10 --years 2
+    python -m scripts.synthetic_data --users 200 --years 3 --seed 7 --reset
+    python -m scripts.synthetic_data --users 50 --receipts-per-month 80 --end 2025-12-31
+
+Note: This script will refuse to run in production environments.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import math
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+from tabulate import tabulate
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.extensions import db
+from app.models import (
+    Account,
+    AccountMember,
+    Allocation,
+    Category,
+    FinancialTarget,
+    Goal,
+    Income,
+    MonthlyRollup,
+    Receipt,
+    ReceiptItem,
+    SavingsFund,
+    Tag,
+    User,
+)
+from app.models.account import AccountType
+from app.models.base import Base
+from app.services.monthly_rollups_service import RollupChanges, RollupKey, month_start
+from app.utils.types import TagType
+
+from scripts.seed import check_environment
+
+PASSWORD = "synthetic"
+CHUNK_SIZE = 10_000
+
+# Parent category -> (sub-categories, products as (name, unit price, sold by weight)).
+CATALOG = {
+    "Groceries": (
+        ["Fruits and Vegetables", "Meat and Fish", "Dairy", "Bakery"],
+        [
+            ("Apples", 1.80, True), ("Bananas", 1.40, True), ("Tomatoes", 2.90, True),
+            ("Potatoes", 0.90, True), ("Chicken Breast", 7.50, True), ("Salmon Fillet", 18.00, True),
+            ("Milk 1L", 0.95, False), ("Greek Yogurt", 0.65, False), ("Cheddar", 2.40, False),
+            ("Sliced Bread", 1.20, False), ("Croissant", 0.60, False), ("Pasta", 1.45, False),
+            ("Olive Oil", 6.90, False), ("Coffee Beans", 8.50, False),
+        ],
+    ),
+    "Household": (
+        ["Cleaning"],
+        [("Dish Soap", 2.10, False), ("Paper Towels", 3.40, False), ("Laundry Detergent", 9.90, False),
+         ("Light Bulb", 4.50, False), ("Trash Bags", 2.80, False)],
+    ),
+    "Eating Out": (
+        [],
+        [("Espresso", 2.20, False), ("Lunch Menu", 8.90, False), ("Pizza", 11.50, False),
+         ("Burger", 9.80, False), ("Lemonade", 3.10, False)],
+    ),
+    "Transport": (
+        ["Fuel", "Public Transport"],
+        [("Diesel", 1.55, True), ("Petrol 95", 1.68, True), ("Tram Ticket", 1.10, False),
+         ("Monthly Pass", 26.00, False), ("Car Wash", 12.00, False)],
+    ),
+    "Health": (
+        ["Pharmacy"],
+        [("Ibuprofen", 4.20, False), ("Vitamins", 9.50, False), ("Toothpaste", 2.90, False),
+         ("Plasters", 3.30, False)],
+    ),
+    "Clothing": (
+        [],
+        [("T-Shirt", 14.90, False), ("Socks", 5.90, False), ("Jeans", 49.00, False),
+         ("Sneakers", 79.00, False)],
+    ),
+    "Electronics": (
+        [],
+        [("USB Cable", 9.90, False), ("Headphones", 59.00, False), ("Batteries", 6.50, False),
+         ("Phone Case", 15.00, False)],
+    ),
+    "Entertainment": (
+        [],
+        [("Cinema Ticket", 8.50, False), ("Book", 16.90, False), ("Board Game", 34.00, False),
+         ("Concert Ticket", 45.00, False)],
+    ),
+}
+
+# Merchant -> parent categories its receipts draw products from.
+MERCHANTS = [
+    ("Quantum Mart", ["Groceries", "Household"]),
+    ("Fresh Corner", ["Groceries"]),
+    ("Daily Basket", ["Groceries", "Household"]),
+    ("Bio Market", ["Groceries"]),
+    ("Byte & Bean Café", ["Eating Out"]),
+    ("Pizza Orbit", ["Eating Out"]),
+    ("Noodle Station", ["Eating Out"]),
+    ("Green Cross Pharmacy", ["Health"]),
+    ("City Transit", ["Transport"]),
+    ("Fuel Point", ["Transport"]),
+    ("The Electric Bazaar", ["Electronics"]),
+    ("Pixel Store", ["Electronics"]),
+    ("Thread & Needle", ["Clothing"]),
+    ("Urban Outfit", ["Clothing"]),
+    ("Home Harbor", ["Household"]),
+    ("Star Cinema", ["Entertainment"]),
+    ("Paper Lantern Books", ["Entertainment"]),
+    ("Corner Bakery", ["Groceries"]),
+    ("Mega Hyper", ["Groceries", "Household", "Clothing", "Electronics"]),
+    ("Night Shop", ["Groceries", "Eating Out"]),
+]
+
+EMPLOYERS = ["NovaTech Solutions", "Orbital Logistics", "Crescent Bank", "Helix Health", "Summit Studio"]
+SIDE_INCOMES = ["Nebula Freelance Network", "Marketplace Sales", "Tutoring", "Rent Share"]
+SAVINGS_FUNDS = ["Emergency Fund", "Vacation", "New Car", "Home Renovation", "Education"]
+GOALS = {
+    "Emergency Fund": ["Three months of expenses"],
+    "Vacation": ["Flights", "Hotel", "Spending money"],
+    "New Car": ["Down payment", "Insurance"],
+    "Home Renovation": ["Kitchen", "Bathroom"],
+    "Education": ["Course fees", "Books"],
+}
+TARGETS = ["Pay off credit card", "Save for a laptop", "Holiday gifts", "Invest monthly"]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 10
+    years: int = 2
+    receipts_per_month: float = 40
+    items_per_receipt: float = 4
+    seed: int = 1
+    end: date | None = None
+
+    @property
+    def end_date(self) -> date:
+        return self.end or date.today()
+
+
+def user_email(seed: int, n: int) -> str:
+    """Sign-in email of synthetic user ``n`` (0-based) generated with ``seed``."""
+    return f"synthetic-{seed}-{n}@example.com"
+
+
+def _months(end: date, years: int) -> list[date]:
+    """First days of the ``years * 12`` months ending with the month of ``end``."""
+    year, month = end.year, end.month
+    months = []
+    for _ in range(years * 12):
+        months.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _days_in_month(first: date) -> int:
+    following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return (following - first).days
+
+
+def _cents(value: float) -> Decimal:
+    return Decimal(max(1, round(value * 100))) / 100
+
+
+class BulkLoader:
+    """Buffers rows per table and writes them in dependency order, a chunk at a time."""
+
+    def __init__(self, connection, chunk_size: int = CHUNK_SIZE):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.pending: dict = {}
+        self.buffered = 0
+        self.written: dict[str, int] = {}
+        dialect = connection.dialect
+        self.use_copy = dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def add(self, table, row: dict) -> None:
+        self.pending.setdefault(table, []).append(row)
+        self.buffered += 1
+        if self.buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in Base.metadata.sorted_tables:
+            rows = self.pending.pop(table, None)
+            if not rows:
+                continue
+            if self.use_copy:
+                self._copy(table, rows)
+            elif self.connection.dialect.positional:
+                self._executemany(table, rows)
+            else:
+                self.connection.execute(insert(table), rows)
+            self.written[table.name] = self.written.get(table.name, 0) + len(rows)
+        self.buffered = 0
+
+    def _processed(self, table, rows: list[dict]):
+        """Column names and the rows as tuples of DBAPI values."""
+        dialect = self.connection.dialect
+        columns = list(rows[0])
+        processors = [
+            table.c[name].type.dialect_impl(dialect).bind_processor(dialect) for name in columns
+        ]
+        converted = [
+            tuple(
+                value if processor is None or value is None else processor(value)
+                for processor, value in zip(processors, map(row.__getitem__, columns))
+            )
+            for row in rows
+        ]
+        return columns, converted
+
+    def _executemany(self, table, rows: list[dict]) -> None:
+        # Same statement and values as ``execute(insert(table), rows)``,
+        # without the per-row parameter bookkeeping of a compiled execution.
+        columns, values = self._processed(table, rows)
+        compiled = insert(table).compile(dialect=self.connection.dialect, column_keys=columns)
+        positions = [columns.index(name) for name in compiled.positiontup]
+        if positions != list(range(len(columns))):
+            values = [tuple(row[position] for position in positions) for row in values]
+        self.connection.exec_driver_sql(compiled.string, values)
+
+    def _copy(self, table, rows: list[dict]) -> None:
+        columns, values = self._processed(table, rows)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in values:
+            writer.writerow(
+                ("t" if value else "f") if isinstance(value, bool)
+                else json.dumps(value) if isinstance(value, (dict, list))
+                else value
+                for value in row
+            )
+        buffer.seek(0)
+
+        quoted = ", ".join(self.connection.dialect.identifier_preparer.quote(name) for name in columns)
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({quoted}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+
+class _UserGenerator:
+    """All rows of one synthetic user, from a random stream of its own.
+
+    Rows are collected per table and handed to the loader parents first,
+    once counters and balances that depend on the whole history are known.
+    """
+
+    def __init__(self, spec: DatasetSpec, n: int, password_hash: str, months: list[date]):
+        self.spec = spec
+        self.n = n
+        self.rng = random.Random(f"{spec.seed}:{n}")
+        self.password_hash = password_hash
+        self.months = months
+        self.start = datetime.combine(months[0], datetime.min.time())
+        self.rows: dict = {}
+        self.rollups = RollupChanges()
+
+    def add(self, table, row: dict) -> dict:
+        self.rows.setdefault(table, []).append(row)
+        return row
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def moment(self, day: date) -> datetime:
+        return datetime.combine(day, datetime.min.time()) + timedelta(seconds=self.rng.randrange(7 * 3600, 22 * 3600))
+
+    def generate(self, loader: BulkLoader) -> None:
+        add = self.add
+        self.user_id = self.uuid()
+        add(User.__table__, {
+            "id": self.user_id,
+            "username": f"synthetic{self.spec.seed}x{self.n}"[:32],
+            "email": user_email(self.spec.seed, self.n),
+            "password_hash": self.password_hash,
+            "created_at": self.start,
+            "is_verified": True,
+            "data_version": 0,
+        })
+
+        self.account_id = self.uuid()
+        account = add(Account.__table__, {
+            "id": self.account_id, "name": "Main Account", "balance": Decimal("0.00"),
+            "currency": "EUR", "account_type": AccountType.ACCOUNT,
+        })
+        self.membership(self.account_id, self.start)
+
+        self.categories()
+        self.tags()
+        spent_total = self.receipts()
+        income_total = self.incomes(spent_total / len(self.months))
+        saved_total = self.savings(income_total - spent_total)
+        self.targets()
+
+        # The main account keeps whatever was neither spent nor saved.
+        account["balance"] = max(Decimal("0.00"), income_total - spent_total - saved_total)
+        self.finish_tags_and_categories()
+        for key, measures in self.rollups.deltas.items():
+            add(MonthlyRollup.__table__, {"id": self.uuid(), **vars(key), **measures})
+
+        for table in Base.metadata.sorted_tables:
+            for row in self.rows.get(table, ()):
+                loader.add(table, row)
+
+    def membership(self, account_id: uuid.UUID, created_at: datetime) -> None:
+        self.add(AccountMember.__table__, {
+            "id": self.uuid(), "user_id": self.user_id, "account_id": account_id,
+            "role": "owner", "created_at": created_at,
+        })
+
+    def categories(self) -> None:
+        rng = self.rng
+        self.category_rows = []
+        # parent name -> [(category id, products)], sub-categories included.
+        self.category_ids: dict[str, list[tuple[uuid.UUID, list]]] = {}
+        for parent, (children, products) in CATALOG.items():
+            parent_id = self.uuid()
+            self.category_row(parent_id, parent, None)
+            ids = [parent_id]
+            for child in children:
+                child_id = self.uuid()
+                self.category_row(child_id, child, parent_id)
+                ids.append(child_id)
+            # Products are spread over the parent and its sub-categories.
+            groups = [(category_id, []) for category_id in ids]
+            for index, product in enumerate(products):
+                groups[index % len(groups)][1].append(product)
+            self.category_ids[parent] = [group for group in groups if group[1]]
+        self.category_usage: dict[uuid.UUID, int] = {}
+        self.category_limits = {
+            parent: _cents(rng.uniform(50, 400)) for parent in CATALOG if rng.random() < 0.3
+        }
+
+    def category_row(self, category_id: uuid.UUID, name: str, parent_id: uuid.UUID | None) -> None:
+        self.category_rows.append({
+            "id": category_id, "user_id": self.user_id, "parent_id": parent_id, "name": name,
+            "created_at": self.start, "count": 0, "is_pinned": False, "limit": None,
+        })
+
+    def tags(self) -> None:
+        rng = self.rng
+        count = rng.randint(8, len(MERCHANTS))
+        merchants = rng.sample(MERCHANTS, count)
+        # Zipf-like popularity: the first merchants get most receipts.
+        self.merchants = [(self.uuid(), name, parents) for name, parents in merchants]
+        self.merchant_weights = [1 / (rank + 1) for rank in range(count)]
+        self.employer = (self.uuid(), rng.choice(EMPLOYERS))
+        self.side_incomes = [(self.uuid(), name) for name in rng.sample(SIDE_INCOMES, 2)]
+        self.tag_usage: dict[uuid.UUID, list[int]] = {}  # tag id -> [receipts, incomes]
+
+    def use_tag(self, tag_id: uuid.UUID, kind: int) -> None:
+        self.tag_usage.setdefault(tag_id, [0, 0])[kind] += 1
+
+    def finish_tags_and_categories(self) -> None:
+        names = [(tag_id, name) for tag_id, name, _ in self.merchants]
+        names += [self.employer, *self.side_incomes]
+        for tag_id, name in names:
+            receipts, incomes = self.tag_usage.get(tag_id, (0, 0))
+            if receipts and not incomes:
+                tag_type = TagType.EXPENSE
+            elif incomes and not receipts:
+                tag_type = TagType.INCOME
+            else:
+                tag_type = TagType.BOTH
+            self.add(Tag.__table__, {
+                "id": tag_id, "user_id": self.user_id, "name": name,
+                "type": tag_type, "counter": receipts + incomes,
+            })
+
+        for row in self.category_rows:
+            row["count"] = self.category_usage.get(row["id"], 0)
+            if row["parent_id"] is None:
+                row["limit"] = self.category_limits.get(row["name"])
+                row["is_pinned"] = row["limit"] is not None
+            self.add(Category.__table__, row)
+
+    def incomes(self, monthly_spending: Decimal) -> Decimal:
+        rng, add = self.rng, self.add
+        # Earn 10-50% more than is spent, so there is something to save.
+        salary = float(monthly_spending or 1500) * rng.uniform(1.1, 1.5)
+        total = Decimal("0.00")
+        for month in self.months:
+            payday = month.replace(day=rng.randint(1, 5))
+            if payday > self.spec.end_date:
+                break
+            entries = [(self.employer, salary * rng.uniform(0.97, 1.03), "Salary")]
+            if rng.random() < 0.3:
+                tag = rng.choice(self.side_incomes)
+                entries.append((tag, rng.lognormvariate(math.log(250), 0.6), tag[1]))
+            for (tag_id, _), amount, description in entries:
+                day = payday if description == "Salary" else month.replace(
+                    day=rng.randint(1, _days_in_month(month))
+                )
+                if day > self.spec.end_date:
+                    continue
+                amount = _cents(amount)
+                total += amount
+                self.use_tag(tag_id, 1)
+                self.rollups.add(
+                    RollupKey(self.user_id, None, month_start(day), None, tag_id),
+                    income_amount=amount, income_count=1,
+                )
+                add(Income.__table__, {
+                    "id": self.uuid(), "user_id": self.user_id, "tag_id": tag_id,
+                    "description": description, "amount": amount, "income_date": day,
+                    "extra_metadata": None,
+                })
+        return total
+
+    def receipts(self) -> Decimal:
+        rng, spec = self.rng, self.spec
+        total = Decimal("0.00")
+        for month in self.months:
+            days = _days_in_month(month)
+            count = max(0, round(rng.gauss(spec.receipts_per_month, math.sqrt(spec.receipts_per_month))))
+            for _ in range(count):
+                day = month.replace(day=rng.randint(1, days))
+                if day > spec.end_date:
+                    continue
+                total += self.receipt(day)
+        return total
+
+    def receipt(self, day: date) -> Decimal:
+        rng, add = self.rng, self.add
+        tag_id, merchant, parents = rng.choices(self.merchants, weights=self.merchant_weights)[0]
+        tagged = rng.random() < 0.9
+        receipt_id = self.uuid()
+        from_ekasa = rng.random() < 0.5
+
+        items = []
+        if rng.random() >= 0.1:
+            mean_extra = max(0.0, self.spec.items_per_receipt - 1)
+            count = 1 + (int(rng.expovariate(1 / mean_extra)) if mean_extra else 0)
+            for _ in range(count):
+                category_id, products = rng.choice(self.category_ids[rng.choice(parents)])
+                name, price, by_weight = rng.choice(products)
+                quantity = (
+                    Decimal(rng.randint(200, 2500)) / 1000 if by_weight
+                    else Decimal(rng.choices((1, 2, 3, 4), weights=(70, 20, 7, 3))[0])
+                )
+                unit_price = _cents(price * rng.uniform(0.85, 1.2))
+                if rng.random() < 0.08:
+                    category_id = None
+                else:
+                    self.category_usage[category_id] = self.category_usage.get(category_id, 0) + 1
+                items.append({
+                    "id": self.uuid(), "receipt_id": receipt_id, "user_id": self.user_id,
+                    "category_id": category_id, "name": name, "quantity": quantity,
+                    "unit_price": unit_price,
+                    "total_price": (unit_price * quantity).quantize(Decimal("0.01")),
+                    "extra_metadata": (
+                        {"vatRate": rng.choice((10, 20)), "itemType": "K"} if from_ekasa else None
+                    ),
+                })
+            amount = sum((item["total_price"] for item in items), Decimal("0.00"))
+        else:
+            amount = _cents(rng.lognormvariate(math.log(25), 0.8))
+
+        if tagged:
+            self.use_tag(tag_id, 0)
+        else:
+            tag_id = None
+        month = month_start(day)
+        self.rollups.add(
+            RollupKey(self.user_id, self.account_id, month, None, tag_id),
+            receipt_amount=amount, receipt_count=1,
+        )
+        for item in items:
+            self.rollups.add(
+                RollupKey(self.user_id, self.account_id, month, item["category_id"], tag_id),
+                item_amount=item["total_price"], item_count=1,
+            )
+        add(Receipt.__table__, {
+            "id": receipt_id,
+            "external_uid": (
+                "O-" + uuid.UUID(int=rng.getrandbits(128)).hex[:30].upper() if from_ekasa else None
+            ),
+            "user_id": self.user_id,
+            "account_id": self.account_id,
+            "tag_id": tag_id,
+            "description": merchant,
+            "issue_date": day,
+            "total_amount": amount,
+            "extra_metadata": (
+                {"ico": f"{rng.randrange(10**7, 10**8)}", "dic": f"20{rng.randrange(10**7, 10**8)}",
+                 "okp": uuid.UUID(int=rng.getrandbits(128)).hex, "unit": {}}
+                if from_ekasa else None
+            ),
+            "created_at": self.moment(day),
+        })
+        for item in items:
+            add(ReceiptItem.__table__, item)
+        return amount
+
+    def savings(self, available: Decimal) -> Decimal:
+        rng, add = self.rng, self.add
+        saved_total = Decimal("0.00")
+        for name in rng.sample(SAVINGS_FUNDS, rng.randint(1, 3)):
+            fund_id = self.uuid()
+            contribution = _cents(rng.choice((25, 50, 100, 150, 200)))
+            joined = self.months[rng.randrange(len(self.months))]
+            allocations = [month for month in self.months if month >= joined]
+            balance = Decimal("0.00")
+            rows = []
+            for month in allocations:
+                day = month.replace(day=min(rng.randint(5, 10), _days_in_month(month)))
+                if day > self.spec.end_date or saved_total + balance + contribution > available:
+                    break
+                balance += contribution
+                rows.append({
+                    "id": self.uuid(), "allocation_date": day, "amount": contribution,
+                    "source_account_id": self.account_id, "target_account_id": fund_id,
+                })
+            saved_total += balance
+
+            add(Account.__table__, {
+                "id": fund_id, "name": name, "balance": balance, "currency": "EUR",
+                "account_type": AccountType.SAVINGS_FUND,
+            })
+            add(SavingsFund.__table__, {
+                "id": fund_id, "target_amount": contribution * 24, "monthly_contribution": contribution,
+                "description": None, "is_completed": False,
+            })
+            self.membership(fund_id, datetime.combine(joined, datetime.min.time()) + timedelta(days=1))
+            for row in rows:
+                add(Allocation.__table__, row)
+
+            # Active goals never hold more than the fund's balance.
+            unassigned = balance
+            for title in GOALS[name][: rng.randint(1, len(GOALS[name]))]:
+                target = _cents(rng.uniform(300, 3000))
+                current = min(target, (unassigned * Decimal(rng.uniform(0.2, 0.6))).quantize(Decimal("0.01")))
+                unassigned -= current
+                add(Goal.__table__, {
+                    "id": self.uuid(), "user_id": self.user_id, "savings_fund_id": fund_id,
+                    "title": title, "description": None, "target_amount": target,
+                    "current_amount": current, "is_completed": False,
+                })
+        return saved_total
+
+    def targets(self) -> None:
+        rng = self.rng
+        for title in rng.sample(TARGETS, rng.randint(0, 2)):
+            target = _cents(rng.uniform(200, 2000))
+            current = (target * Decimal(rng.uniform(0, 1))).quantize(Decimal("0.01"))
+            self.add(FinancialTarget.__table__, {
+                "id": self.uuid(), "user_id": self.user_id, "title": title,
+                "target_amount": target, "target_percent": None, "currency": "EUR",
+                "current_amount": current,
+                "deadline_date": self.spec.end_date + timedelta(days=rng.randint(30, 365)),
+                "is_completed": current >= target,
+                "created_at": self.start, "updated_at": self.start,
+            })
+
+
+@contextmanager
+def indexes_deferred(engine):
+    """Drop the secondary indexes for a load into fresh tables and build them once afterwards."""
+    indexes = [index for table in Base.metadata.sorted_tables for index in table.indexes]
+    for index in indexes:
+        index.drop(engine)
+    try:
+        yield
+    finally:
+        for index in indexes:
+            index.create(engine)
+
+
+def generate(spec: DatasetSpec, *, chunk_size: int = CHUNK_SIZE) -> dict[str, int]:
+    """Load the dataset described by ``spec`` into the app's database.
+
+    Runs in the current app context and session; the caller commits.
+    Returns the number of rows written per table.
+    """
+    loader = BulkLoader(db.session.connection(), chunk_size)
+    password_hash = generate_password_hash(PASSWORD)
+    months = _months(spec.end_date, spec.years)
+
+    for n in range(spec.users):
+        _UserGenerator(spec, n, password_hash, months).generate(loader)
+    loader.flush()
+    return loader.written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10, help="users to generate")
+    parser.add_argument("--years", type=int, default=2, help="years of history per user")
+    parser.add_argument("--receipts-per-month", type=float, default=40, help="average receipts per user and month")
+    parser.add_argument("--items-per-receipt", type=float, default=4, help="average items per itemized receipt")
+    parser.add_argument("--seed", type=int, default=1, help="random seed; also part of the users' emails")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day of history (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows buffered per bulk write")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args(argv)
+
+    check_environment()
+    spec = DatasetSpec(
+        users=args.users,
+        years=args.years,
+        receipts_per_month=args.receipts_per_month,
+        items_per_receipt=args.items_per_receipt,
+        seed=args.seed,
+        end=args.end,
+    )
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        if args.reset:
+            print("Dropping all tables...")
+            Base.metadata.drop_all(db.engine)
+            Base.metadata.create_all(db.engine)
+            # Empty tables: cheaper to index the loaded rows in one go.
+            with indexes_deferred(db.engine):
+                written = generate(spec, chunk_size=args.chunk_size)
+                db.session.commit()
+        else:
+            Base.metadata.create_all(db.engine)
+            written = generate(spec, chunk_size=args.chunk_size)
+            db.session.commit()
+        elapsed = time.perf_counter() - started
+
+        total = sum(written.values())
+        print(tabulate(sorted(written.items()), headers=["Table", "Rows"], tablefmt="grid"))
+        print(f"\n{total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+        print(f"Sign in as {user_email(spec.seed, 0)} / {PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from http.cookies import SimpleCookie
 
 import pytest
@@ -7,6 +8,7 @@ import pytest
 from app import create_app
 from app.extensions import db
 from app.config import TestConfig
+from app.services import metrics_service
 
 
 @pytest.fixture
@@ -18,6 +20,42 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture(autouse=True)
+def repeated_query_guard(request):
+    """Fail tests whose API requests repeat a statement shape (a likely N+1).
+
+    Mark a test ``allow_repeated_queries`` when the repetition is intended.
+    """
+    with metrics_service.watch_queries() as reports:
+        yield reports
+    if request.node.get_closest_marker("allow_repeated_queries"):
+        return
+    flagged = [report for report in reports if report.repeated]
+    if flagged:
+        pytest.fail(
+            "Repeated SQL statements (possible N+1 query):\n"
+            + "\n".join(report.describe() for report in flagged),
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def query_budget():
+    """``with query_budget(n): ...`` fails if an API request in the block runs more than ``n`` statements."""
+
+    @contextmanager
+    def budget(max_statements: int):
+        with metrics_service.watch_queries() as reports:
+            yield reports
+        assert reports, "no API request was made inside the query budget"
+        over = [report for report in reports if report.count > max_statements]
+        assert not over, f"Query budget of {max_statements} exceeded:\n" + "\n".join(
+            report.describe() for report in over
+        )
+
+    return budget
+
+
 @pytest.fixture
 def client(app):
     return app.test_client()
@@ -46,12 +46,13 @@ def test_monthly_budget_rejects_invalid_month_format(auth_client_factory):
     assert response.status_code == 400
 
 
-def test_monthly_budget_totals_income_and_expenses(auth_client_factory):
+def test_monthly_budget_totals_income_and_expenses(auth_client_factory, query_budget):
     client = auth_client_factory("monthly-totals@test.local")
     create_income(client, 300, "2025-10-01")
     create_receipt(client, 125, "2025-10-02")
 
-    response = client.get("/api/monthly-budget?year=2025&month=10")
+    with query_budget(3):
+        response = client.get("/api/monthly-budget?year=2025&month=10")
 
     assert response.status_code == 200
     data = response.get_json()["data"]
@@ -60,7 +61,7 @@ def test_monthly_budget_totals_income_and_expenses(auth_client_factory):
     assert data["balance"] == 175.0
 
 
-def test_dashboard_summary_includes_only_authenticated_users_data(auth_client_factory):
+def test_dashboard_summary_includes_only_authenticated_users_data(auth_client_factory, query_budget):
     owner = auth_client_factory("dashboard-owner@test.local")
     other = auth_client_factory("dashboard-other@test.local")
     create_income(owner, 100, "2025-10-01")
@@ -68,7 +69,8 @@ def test_dashboard_summary_includes_only_authenticated_users_data(auth_client_fa
     create_income(other, 900, "2025-10-01")
     create_receipt(other, 400, "2025-10-02")
 
-    response = owner.get("/api/dashboard/summary?year=2025&month=10")
+    with query_budget(2):
+        response = owner.get("/api/dashboard/summary?year=2025&month=10")
 
     assert response.status_code == 200
     data = response.get_json()["data"]
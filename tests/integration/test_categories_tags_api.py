@@ -1,5 +1,11 @@
+from uuid import UUID
+
+from sqlalchemy import inspect
+
 from app.extensions import db
 from app.models import Tag
+from app.models.tag import TagType
+from app.services import monthly_rollups_service, tags_service
 
 
 def user_id(client):
@@ -135,6 +141,23 @@ def test_tag_counters_increment_and_decrement_for_income_and_receipt_assignments
     assert reset_expense_tag["type"] == "both"
 
 
+def test_tag_type_is_derived_without_loading_tagged_records(auth_client_factory, app):
+    client = auth_client_factory("tag-exists@test.local")
+    tag_id = create_tag(client, "Busy")
+    for _ in range(3):
+        create_receipt(client, tag_id=tag_id)
+
+    with app.app_context():
+        tag = db.session.get(Tag, UUID(tag_id))
+        tags_service.register_tag_assigned(tag)
+
+        assert tag.type == TagType.EXPENSE
+        state = inspect(tag)
+        assert "receipts" in state.unloaded
+        assert "incomes" in state.unloaded
+        db.session.rollback()
+
+
 def test_income_and_expense_tag_endpoints_filter_by_type(auth_client_factory):
     client = auth_client_factory("tag-filter@test.local")
     income_tag = create_tag(client, "Income only")
@@ -155,3 +178,19 @@ def test_income_and_expense_tag_endpoints_filter_by_type(auth_client_factory):
     assert expense_tag in expense_ids
     assert both_tag in expense_ids
     assert income_tag not in expense_ids
+
+
+def test_deleting_a_tag_untags_its_records_in_constant_queries(auth_client_factory, query_budget):
+    client = auth_client_factory("tag-delete-many@test.local")
+    tag_id = create_tag(client, "Busy")
+    receipt_ids = [create_receipt(client, tag_id) for _ in range(8)]
+    income_ids = [create_income(client, tag_id) for _ in range(8)]
+
+    with query_budget(11):
+        assert client.delete(f"/api/tags/{tag_id}").status_code == 200
+
+    receipts = [client.get(f"/api/receipts/{receipt_id}").get_json()["data"] for receipt_id in receipt_ids]
+    incomes = [client.get(f"/api/incomes/{income_id}").get_json()["data"] for income_id in income_ids]
+    assert all(receipt["tag_id"] is None for receipt in receipts)
+    assert all(income["tag_id"] is None for income in incomes)
+    assert monthly_rollups_service.verify() == []
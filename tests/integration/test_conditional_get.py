@@ -0,0 +1,101 @@
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import AccountMember, User
+
+
+def count_selects(app, run):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+
+def test_unchanged_data_is_answered_with_304_before_the_endpoint_queries(app, auth_client_factory):
+    client = auth_client_factory("etag@test.local")
+    client.post("/api/tags", json={"name": "Market"})
+
+    first = client.get("/api/tags/expense")
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    second, statements = count_selects(
+        app, lambda: client.get("/api/tags/expense", headers={"If-None-Match": first.headers["ETag"]})
+    )
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert len(statements) == 1
+    assert "data_version" in statements[0]
+
+
+def test_writes_change_the_etag_of_their_owner_only(auth_client_factory):
+    owner = auth_client_factory("etag-owner@test.local")
+    other = auth_client_factory("etag-other@test.local")
+    owner_etag = owner.get("/api/categories").headers["ETag"]
+    other_etag = other.get("/api/categories").headers["ETag"]
+
+    assert owner.post("/api/categories", json={"name": "Fresh"}).status_code == 201
+
+    stale = owner.get("/api/categories", headers={"If-None-Match": owner_etag})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] != owner_etag
+    assert "Fresh" in [category["name"] for category in stale.get_json()["data"]["categories"]]
+    assert other.get("/api/categories", headers={"If-None-Match": other_etag}).status_code == 304
+
+
+def test_receipt_writes_invalidate_the_dashboard(auth_client_factory):
+    client = auth_client_factory("etag-dashboard@test.local")
+    url = "/api/dashboard/summary?year=2025&month=10"
+    etag = client.get(url).headers["ETag"]
+
+    response = client.post(
+        "/api/receipts",
+        json={"description": "Groceries", "total_amount": 12.5, "issue_date": "2025-10-03"},
+    )
+    assert response.status_code == 201
+
+    refreshed = client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.get_json()["data"]["total_expenses"] == 12.5
+
+
+def test_goal_writes_invalidate_every_member_of_a_shared_fund(app, auth_client_factory):
+    owner = auth_client_factory("etag-fund-owner@test.local")
+    member = auth_client_factory("etag-fund-member@test.local")
+    fund_id = owner.post("/api/funds", json={"title": "Holiday", "target_amount": "1000.00"}).get_json()["data"]["id"]
+    with app.app_context():
+        member_id = db.session.query(User.id).filter(User.email == "etag-fund-member@test.local").scalar()
+        db.session.add(AccountMember(user_id=member_id, account_id=UUID(fund_id), role="member"))
+        db.session.commit()
+
+    urls = ["/api/savings/summary", "/api/funds", f"/api/funds/{fund_id}"]
+    etags = {url: member.get(url).headers["ETag"] for url in urls}
+
+    goal = owner.post(f"/api/funds/{fund_id}/goals", json={"title": "Flights", "target_amount": "300.00"})
+    assert goal.status_code == 201
+
+    for url in urls:
+        assert member.get(url, headers={"If-None-Match": etags[url]}).status_code == 200, url
+
+
+def test_endpoints_without_the_decorator_are_not_versioned(auth_client_factory):
+    client = auth_client_factory("etag-plain@test.local")
+
+    response = client.get("/api/receipts")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
@@ -0,0 +1,118 @@
+import pytest
+
+from app.services import metrics_service
+
+
+OPERATOR = {"Authorization": "Bearer operator-secret"}
+
+
+def test_db_pool_diagnostics_require_the_operator_token(app, auth_client_factory):
+    client = auth_client_factory("diagnostics-user@test.local")
+    assert client.get("/api/diagnostics/db-pool").status_code == 403
+
+    app.config["METRICS_TOKEN"] = "operator-secret"
+    session_only = client.get("/api/diagnostics/db-pool")
+    wrong = client.get("/api/diagnostics/db-pool", headers={"Authorization": "Bearer wrong"})
+
+    assert session_only.status_code == 401
+    assert wrong.status_code == 401
+    assert client.get("/api/diagnostics/db-pool", headers=OPERATOR).status_code == 200
+
+
+def test_db_pool_diagnostics_report_checkout_counters(app, auth_client_factory):
+    app.config["METRICS_TOKEN"] = "operator-secret"
+    client = auth_client_factory("diagnostics@test.local")
+    client.get("/api/receipts")
+
+    response = client.get("/api/diagnostics/db-pool", headers=OPERATOR)
+
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert data["pool_class"]
+    assert data["stats"]["checkouts"] > 0
+    assert data["stats"]["checkouts"] >= data["stats"]["checkins"]
+
+
+def test_metrics_report_per_endpoint_timing_and_sql_counts(app, auth_client_factory):
+    app.config["METRICS_TOKEN"] = "operator-secret"
+    metrics_service.registry.reset()
+    client = auth_client_factory("metrics@test.local")
+    client.get("/api/receipts")
+    client.get("/api/receipts")
+    client.get("/api/no-such-endpoint")
+
+    response = client.get("/api/diagnostics/metrics", headers=OPERATOR)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    labels = 'endpoint="api.api_receipts_list",method="GET"'
+    assert f'budget_http_requests_total{{{labels},status="200"}} 2' in body
+    assert f'budget_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in body
+    assert f"budget_http_request_sql_statements_count{{{labels}}} 2" in body
+    sql_sum = float(body.split(f"budget_http_request_sql_statements_sum{{{labels}}} ")[1].split()[0])
+    assert sql_sum >= 2
+    assert f'budget_http_request_phase_seconds_total{{{labels},phase="auth"}}' in body
+    assert f'budget_http_request_phase_seconds_total{{{labels},phase="serialize"}}' in body
+    assert 'endpoint="unmatched",method="GET",status="404"' in body
+    assert "budget_db_pool_checkouts_total" in body
+
+
+def test_metrics_accept_only_the_scrape_token(app, auth_client_factory):
+    client = auth_client_factory("metrics-user@test.local")
+    assert client.get("/api/diagnostics/metrics").status_code == 403
+
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+    token = client.get_cookie("auth_token").value
+
+    assert client.get("/api/diagnostics/metrics").status_code == 401
+    assert client.get("/api/diagnostics/metrics", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert client.get("/api/diagnostics/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/api/diagnostics/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+
+
+def test_server_timing_header_is_opt_in(app, auth_client_factory):
+    client = auth_client_factory("server-timing@test.local")
+    assert "Server-Timing" not in client.get("/api/receipts").headers
+
+    app.config["METRICS_SERVER_TIMING"] = True
+    header = client.get("/api/receipts").headers["Server-Timing"]
+
+    entries = {entry.split(";")[0].strip(): entry for entry in header.split(",")}
+    assert set(entries) == {"db", "auth", "serialize", "total"}
+    assert 'desc="' in entries["db"] and "queries" in entries["db"]
+
+
+def test_statement_shapes_collapse_whitespace_and_placeholder_lists():
+    shape = metrics_service.statement_shape("SELECT *\n  FROM receipts\n WHERE receipts.id IN (?, ?, ?)")
+    postgres = metrics_service.statement_shape("SELECT * FROM receipts WHERE receipts.id IN (%(id_1_1)s, %(id_1_2)s)")
+
+    assert shape == "SELECT * FROM receipts WHERE receipts.id IN (?)"
+    assert postgres == "SELECT * FROM receipts WHERE receipts.id IN (?)"
+
+
+@pytest.mark.allow_repeated_queries
+def test_requests_repeating_a_statement_are_reported(app, auth_client_factory, caplog):
+    client = auth_client_factory("repeated-queries@test.local")
+    app.config["QUERY_REPEAT_THRESHOLD"] = 1
+
+    with metrics_service.watch_queries() as reports:
+        client.get("/api/receipts")
+
+    [report] = reports
+    assert report.endpoint == "api.api_receipts_list"
+    assert report.count == sum(report.statements.values())
+    assert report.repeated == report.statements
+    assert "possible N+1 query" in caplog.text
+    assert "GET /api/receipts" in report.describe()
+
+
+def test_query_inspection_can_be_turned_off(app, auth_client_factory):
+    client = auth_client_factory("no-inspection@test.local")
+    app.config["QUERY_INSPECTION"] = False
+
+    with metrics_service.watch_queries() as reports:
+        client.get("/api/receipts")
+
+    assert reports == []
@@ -43,12 +43,13 @@ def test_create_income_validates_description_date_and_amount(auth_client_factory
     assert invalid_amount.status_code == 400
 
 
-def test_list_incomes_filters_by_month_and_rejects_partial_month_filter(auth_client_factory):
+def test_list_incomes_filters_by_month_and_rejects_partial_month_filter(auth_client_factory, query_budget):
     client = auth_client_factory("income-filter@test.local")
     create_income(client, "October salary", 100, "2025-10-10")
     create_income(client, "November salary", 200, "2025-11-10")
 
-    october = client.get("/api/incomes?year=2025&month=10")
+    with query_budget(1):
+        october = client.get("/api/incomes?year=2025&month=10")
     year_only = client.get("/api/incomes?year=2025")
     month_only = client.get("/api/incomes?month=10")
 
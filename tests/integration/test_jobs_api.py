@@ -0,0 +1,115 @@
+import io
+import threading
+import uuid
+
+from app.services.responses import OkResult
+
+
+def upload(client, content=b"fake-image"):
+    return client.post(
+        "/api/import-qr/extract-id?async=true",
+        data={"image": (io.BytesIO(content), "receipt.png")},
+        content_type="multipart/form-data",
+    )
+
+
+def test_async_qr_extraction_returns_a_job_to_poll(app, auth_client_factory, monkeypatch):
+    client = auth_client_factory("jobs-qr@test.local")
+    qr_service = app.extensions["qr_service"]
+    monkeypatch.setattr(qr_service, "extract_ekasa_id", lambda stream: ("O-" + "A" * 30, None))
+
+    submitted = upload(client)
+
+    assert submitted.status_code == 202
+    job = submitted.get_json()["data"]
+    assert job["type"] == "qr_extract"
+    assert job["status"] in ("queued", "running", "succeeded")
+    assert submitted.headers["Location"].endswith(f"/api/jobs/{job['id']}")
+
+    finished = client.get(f"/api/jobs/{job['id']}?wait=5").get_json()["data"]
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"receiptId": "O-" + "A" * 30}
+    assert finished["error"] is None
+    assert finished["finished_at"] is not None
+
+
+def test_async_job_failures_carry_the_synchronous_error(auth_client_factory):
+    client = auth_client_factory("jobs-qr-invalid@test.local")
+
+    job_id = upload(client).get_json()["data"]["id"]
+    finished = client.get(f"/api/jobs/{job_id}?wait=5").get_json()["data"]
+
+    assert finished["status"] == "failed"
+    assert finished["result"] is None
+    assert finished["error"] == {"code": "bad_request", "message": "Invalid image file"}
+
+
+def test_upload_validation_still_happens_before_the_job_is_queued(auth_client_factory):
+    client = auth_client_factory("jobs-qr-type@test.local")
+
+    response = client.post(
+        "/api/import-qr/extract-id?async=true",
+        data={"image": (io.BytesIO(b"text"), "notes.txt")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["message"] == "Invalid file type. Please upload an image."
+
+
+def test_jobs_are_only_visible_to_their_owner(auth_client_factory):
+    owner = auth_client_factory("jobs-owner@test.local")
+    other = auth_client_factory("jobs-other@test.local")
+    job_id = upload(owner).get_json()["data"]["id"]
+
+    assert owner.get(f"/api/jobs/{job_id}").status_code == 200
+    assert other.get(f"/api/jobs/{job_id}").status_code == 404
+    assert owner.get("/api/jobs/00000000-0000-0000-0000-000000000000").status_code == 404
+    assert owner.get(f"/api/jobs/{job_id}?wait=soon").status_code == 400
+
+
+def test_long_poll_returns_the_pending_job_after_the_wait(app, auth_client_factory):
+    client = auth_client_factory("jobs-wait@test.local")
+    me = client.get("/api/auth/me").get_json()["data"]["id"]
+    release = threading.Event()
+    job_queue = app.extensions["job_queue"]
+
+    def blocked():
+        release.wait(5)
+        return OkResult({"done": True})
+
+    job = job_queue.submit("test", uuid.UUID(me), blocked)
+    try:
+        pending = client.get(f"/api/jobs/{job.id}?wait=0.05").get_json()["data"]
+        assert pending["status"] in ("queued", "running")
+    finally:
+        release.set()
+
+    assert client.get(f"/api/jobs/{job.id}?wait=5").get_json()["data"]["result"] == {"done": True}
+
+
+def test_submissions_are_rejected_while_the_queue_is_full(app, auth_client_factory):
+    client = auth_client_factory("jobs-full@test.local")
+    job_queue = app.extensions["job_queue"]
+    release = threading.Event()
+    job_queue.max_pending = 1
+    try:
+        upload_job = job_queue.submit("test", None, release.wait, 5)
+        response = upload(client)
+    finally:
+        release.set()
+
+    assert response.status_code == 503
+    assert response.get_json()["error"]["code"] == "service_unavailable"
+    assert job_queue.wait(upload_job.id, None, 5).status == "succeeded"
+
+
+def test_async_mode_is_refused_while_jobs_are_disabled(app, auth_client_factory):
+    app.config["JOBS_ENABLED"] = False
+    client = auth_client_factory("jobs-disabled@test.local")
+
+    response = upload(client)
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["message"] == "Asynchronous processing is not enabled on this server"
+
@@ -0,0 +1,123 @@
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import MonthlyRollup, Receipt
+from app.services import monthly_rollups_service
+
+
+def created_id(response, key="id"):
+    assert response.status_code == 201
+    return response.get_json()["data"][key]
+
+
+def month_summary(client, year, month):
+    response = client.get(f"/api/dashboard/summary?year={year}&month={month}")
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    return data["total_incomes"], data["total_expenses"]
+
+
+def category_spent(client, category_id, year, month):
+    response = client.get(f"/api/categories/monthly-limit?year={year}&month={month}&category_id={category_id}")
+    assert response.status_code == 200
+    return response.get_json()["data"]["spent"]
+
+
+def assert_rollups_consistent(app):
+    with app.app_context():
+        assert monthly_rollups_service.verify() == []
+
+
+def test_rollups_follow_receipt_item_and_income_changes(app, auth_client_factory):
+    client = auth_client_factory("rollups-flow@test.local")
+    food = created_id(client.post("/api/categories", json={"name": "Food"}))
+    shop = created_id(client.post("/api/tags", json={"name": "Shop", "type": "expense"}))
+
+    income_id = created_id(client.post(
+        "/api/incomes", json={"description": "Salary", "amount": 1000, "income_date": "2025-10-01"}
+    ))
+    receipt_id = created_id(client.post(
+        "/api/receipts",
+        json={"description": "Groceries", "total_amount": 30, "issue_date": "2025-10-05", "tag_id": shop},
+    ))
+    item_id = created_id(client.post(
+        f"/api/receipts/{receipt_id}/items",
+        json={"name": "Bread", "quantity": 2, "unit_price": 1.25, "category_id": food},
+    ), key="item_id")
+    created_id(client.post(
+        f"/api/receipts/{receipt_id}/items", json={"name": "Milk", "quantity": 1, "unit_price": 27.5}
+    ), key="item_id")
+
+    assert month_summary(client, 2025, 10) == (1000.0, 30.0)
+    assert category_spent(client, food, 2025, 10) == 2.5
+    assert_rollups_consistent(app)
+
+    client.put(f"/api/receipts/{receipt_id}/items/{item_id}", json={"quantity": 4})
+    client.put(f"/api/incomes/{income_id}", json={"amount": 1200})
+    assert month_summary(client, 2025, 10) == (1200.0, 30.0)
+    assert category_spent(client, food, 2025, 10) == 5.0
+    assert_rollups_consistent(app)
+
+    # Moving the receipt to another month moves its items with it.
+    assert client.put(f"/api/receipts/{receipt_id}", json={"issue_date": "2025-11-02"}).status_code == 200
+    assert month_summary(client, 2025, 10) == (1200.0, 0.0)
+    assert month_summary(client, 2025, 11) == (0.0, 30.0)
+    assert category_spent(client, food, 2025, 10) == 0.0
+    assert category_spent(client, food, 2025, 11) == 5.0
+    assert_rollups_consistent(app)
+
+    assert client.delete(f"/api/tags/{shop}").status_code == 200
+    assert client.delete(f"/api/receipts/{receipt_id}/items/{item_id}").status_code == 200
+    assert_rollups_consistent(app)
+
+    assert client.delete(f"/api/receipts/{receipt_id}").status_code == 200
+    assert client.delete(f"/api/incomes/{income_id}").status_code == 200
+    assert month_summary(client, 2025, 11) == (0.0, 0.0)
+    assert_rollups_consistent(app)
+    with app.app_context():
+        assert db.session.query(MonthlyRollup).count() == 0
+
+
+def test_rollups_fold_deleted_category_into_uncategorized(app, auth_client_factory):
+    client = auth_client_factory("rollups-category@test.local")
+    category_id = created_id(client.post("/api/categories", json={"name": "Short-lived"}))
+    receipt_id = created_id(client.post(
+        "/api/receipts", json={"description": "Receipt", "total_amount": 8, "issue_date": "2025-10-05"}
+    ))
+    created_id(client.post(
+        f"/api/receipts/{receipt_id}/items",
+        json={"name": "Item", "quantity": 1, "unit_price": 8, "category_id": category_id},
+    ), key="item_id")
+
+    assert client.delete(f"/api/categories/{category_id}").status_code == 200
+
+    assert_rollups_consistent(app)
+
+
+def test_rollups_verify_reports_drift_and_rebuild_repairs_it(app, auth_client_factory):
+    client = auth_client_factory("rollups-drift@test.local")
+    receipt_id = created_id(client.post(
+        "/api/receipts", json={"description": "Receipt", "total_amount": 10, "issue_date": "2025-10-05"}
+    ))
+
+    with app.app_context():
+        # Bulk statements bypass the ORM flush and therefore the rollups.
+        db.session.execute(
+            update(Receipt).where(Receipt.id == UUID(receipt_id)).values(total_amount=Decimal("25.00")),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+
+        drift = monthly_rollups_service.verify()
+        assert len(drift) == 1
+        assert drift[0]["stored"]["receipt_amount"] == Decimal("10.00")
+        assert drift[0]["expected"]["receipt_amount"] == Decimal("25.00")
+
+        assert monthly_rollups_service.rebuild() == 1
+        db.session.commit()
+        assert monthly_rollups_service.verify() == []
+
+    assert month_summary(client, 2025, 10) == (0.0, 25.0)
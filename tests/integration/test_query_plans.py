@@ -0,0 +1,144 @@
+"""Query plans of the hot read paths.
+
+Every SELECT issued while serving the dashboard, analytics, receipt and
+income endpoints is re-run under ``EXPLAIN``; none of them may fall back
+to a full scan of the large per-user tables. SQLite runs always. PostgreSQL
+runs when ``QUERY_PLAN_DATABASE_URL`` points to an empty database, with
+``enable_seqscan`` off so the small seeded tables do not make a sequential
+scan look cheaper than an index that exists.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db
+from app.models import Base
+from tests.conftest import login_user, register_user
+
+HOT_TABLES = {"receipts", "receipt_items", "incomes", "auth_tokens", "account_members", "monthly_rollups"}
+
+POSTGRES_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+
+
+@pytest.fixture(params=[
+    "sqlite",
+    pytest.param("postgresql", marks=pytest.mark.skipif(not POSTGRES_URL, reason="QUERY_PLAN_DATABASE_URL not set")),
+])
+def plan_app(request):
+    class PlanConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = POSTGRES_URL if request.param == "postgresql" else "sqlite:///:memory:"
+
+    app = create_app(PlanConfig)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        Base.metadata.drop_all(bind=db.engine)
+
+
+def seed(client, *, receipts: int, incomes: int):
+    category_id = client.post("/api/categories", json={"name": "Food"}).get_json()["data"]["id"]
+    tag_id = client.post("/api/tags", json={"name": "Market"}).get_json()["data"]["id"]
+    response = client.post("/api/receipts/bulk", json={"receipts": [
+        {
+            "description": f"Receipt {n}",
+            "total_amount": 10,
+            "issue_date": f"2025-{9 + n % 3:02d}-{1 + n % 28:02d}",
+            "tag_id": tag_id if n % 2 else None,
+            "items": [
+                {"name": "Bread", "quantity": 1, "unit_price": 4, "category_id": category_id},
+                {"name": "Milk", "quantity": 2, "unit_price": 3},
+            ],
+        }
+        for n in range(receipts)
+    ]})
+    assert response.status_code == 201
+    for n in range(incomes):
+        response = client.post("/api/incomes", json={
+            "description": f"Income {n}", "amount": 100, "income_date": f"2025-{9 + n % 3:02d}-15",
+        })
+        assert response.status_code == 201
+
+
+def capture_selects(run) -> list[tuple[str, object]]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return statements
+
+
+def full_scans(statement: str, parameters) -> list[str]:
+    """Hot tables the plan of ``statement`` reads without an index."""
+    with db.engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            nodes, scans = [plan[0]["Plan"]], []
+            while nodes:
+                node = nodes.pop()
+                nodes.extend(node.get("Plans", []))
+                if node["Node Type"] == "Seq Scan" and node["Relation Name"] in HOT_TABLES:
+                    scans.append(node["Relation Name"])
+            return scans
+
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        scans = []
+        for row in rows:
+            match = re.match(r"SCAN (\w+)", row[-1])
+            if match and re.sub(r"_\d+$", "", match.group(1)) in HOT_TABLES:
+                scans.append(row[-1])
+        return scans
+
+
+def test_hot_queries_use_indexes(plan_app):
+    other = plan_app.test_client()
+    register_user(other, email="plans-other@test.local")
+    login_user(other, email="plans-other@test.local")
+    seed(other, receipts=40, incomes=10)
+
+    client = plan_app.test_client()
+    register_user(client, email="plans@test.local")
+    login_user(client, email="plans@test.local")
+    seed(client, receipts=40, incomes=10)
+    account_id = client.get("/api/account").get_json()["data"]["id"]
+
+    # A fresh login so the first request resolves the token from the database.
+    login_user(client, email="plans@test.local")
+    urls = [
+        "/api/auth/me",
+        "/api/dashboard/summary?year=2025&month=10",
+        "/api/analytics/donut?year=2025&month=10",
+        "/api/receipts?year=2025&month=10&limit=20",
+        f"/api/receipts?year=2025&month=10&limit=20&account_id={account_id}",
+        "/api/incomes?year=2025&month=10",
+        "/api/receipts/ekasa-items?year=2025&month=10&limit=20",
+    ]
+
+    def run():
+        for url in urls:
+            assert client.get(url).status_code == 200, url
+
+    statements = capture_selects(run)
+    touched = {table for statement, _ in statements for table in HOT_TABLES if re.search(rf"\b{table}\b", statement)}
+    assert touched == HOT_TABLES
+
+    offenders = {}
+    for statement, parameters in statements:
+        scans = full_scans(statement, parameters)
+        if scans:
+            offenders[statement] = scans
+    assert offenders == {}
@@ -1,9 +1,14 @@
+import json
 from uuid import UUID
 
 import pytest
+from sqlalchemy import event
 
 from app.extensions import db
-from app.models import Receipt
+from app.models import Category, Receipt, Tag
+from app.services import ekasa_service, monthly_rollups_service
+from app.services.errors import BadRequestError
+from app.services.pagination import encode_cursor
 
 
 def user_id(client):
@@ -101,6 +106,345 @@ def test_receipt_item_create_and_update_validation(auth_client_factory):
     assert invalid_update.status_code == 400
 
 
+def collect_receipt_pages(client, **params):
+    seen = []
+    cursor = None
+    while True:
+        query = dict(params)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/receipts", query_string=query)
+        assert response.status_code == 200
+        page = response.get_json()["data"]
+        assert len(page["receipts"]) <= int(params["limit"])
+        seen.extend(page["receipts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("sort", ["issue_date", "total_amount"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_receipts_keyset_pages_match_full_listing(auth_client_factory, sort, order):
+    client = auth_client_factory(f"receipt-pages-{sort}-{order}@test.local")
+    # Duplicate sort values force the id tie-breaker to be used across pages.
+    for day, amount in [(1, 10), (1, 10), (2, 5), (3, 10), (3, 7), (4, 5), (5, 12)]:
+        create_receipt(client, issue_date=f"2025-10-{day:02d}", total_amount=amount)
+
+    pages = collect_receipt_pages(client, sort=sort, order=order, limit=2)
+
+    ids = [receipt["id"] for receipt in pages]
+    assert len(ids) == 7
+    assert len(set(ids)) == 7
+    values = [receipt[sort] for receipt in pages]
+    assert values == sorted(values, reverse=order == "desc")
+
+
+def test_receipts_page_respects_month_filter_and_reports_last_page(auth_client_factory, query_budget):
+    client = auth_client_factory("receipt-pages-month@test.local")
+    create_receipt(client, issue_date="2025-09-30")
+    october_ids = {create_receipt(client, issue_date="2025-10-10") for _ in range(3)}
+
+    with query_budget(1):
+        response = client.get("/api/receipts", query_string={"year": 2025, "month": 10, "limit": 3})
+
+    assert response.status_code == 200
+    page = response.get_json()["data"]
+    assert {receipt["id"] for receipt in page["receipts"]} == october_ids
+    assert page["next_cursor"] is None
+
+
+def test_receipts_page_rejects_invalid_limit_and_cursor(auth_client_factory):
+    client = auth_client_factory("receipt-pages-invalid@test.local")
+    create_receipt(client)
+    create_receipt(client)
+    first = client.get("/api/receipts", query_string={"limit": 1, "sort": "issue_date"})
+    cursor = first.get_json()["data"]["next_cursor"]
+
+    zero_limit = client.get("/api/receipts", query_string={"limit": 0})
+    huge_limit = client.get("/api/receipts", query_string={"limit": 10_000})
+    garbage_cursor = client.get("/api/receipts", query_string={"cursor": "not-a-cursor"})
+    other_sort = client.get("/api/receipts", query_string={"cursor": cursor, "sort": "total_amount"})
+    non_string_fields = [
+        client.get("/api/receipts", query_string={"cursor": encode_cursor(payload), "order": order})
+        for order in ("asc", "desc")
+        for payload in (
+            {"sort": "issue_date", "order": order, "value": "2025-10-10", "id": 5},
+            {"sort": "issue_date", "order": order, "value": 20251010, "id": str(UUID(int=1))},
+        )
+    ]
+
+    for response in (zero_limit, huge_limit, garbage_cursor, other_sort, *non_string_fields):
+        assert response.status_code == 400
+        assert response.get_json()["error"]["code"] == "bad_request"
+
+
+def bulk_receipt(tag_id=None, items=(), **overrides):
+    receipt = {"description": "Bulk receipt", "total_amount": 12, "issue_date": "2025-10-10"}
+    if tag_id:
+        receipt["tag_id"] = tag_id
+    receipt["items"] = [
+        {"name": f"Item {n}", "quantity": 2, "unit_price": 3, "category_id": category_id}
+        for n, category_id in enumerate(items)
+    ]
+    receipt.update(overrides)
+    return receipt
+
+
+def ekasa_checks(client, **params):
+    response = client.get("/api/receipts/ekasa-items", query_string=params)
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+def test_ekasa_items_pages_and_stream_match_full_listing(auth_client_factory, query_budget):
+    client = auth_client_factory("ekasa-items-pages@test.local")
+    # One bulk request: receipts share created_at, so pages rely on the id tie-breaker.
+    receipts = [
+        bulk_receipt(external_uid=f"O-{n}", issue_date=f"2025-10-{1 + n // 3:02d}", items=[None] * (n % 3))
+        for n in range(7)
+    ]
+    receipts.append(bulk_receipt(issue_date="2025-10-01"))
+    assert client.post("/api/receipts/bulk", json={"receipts": receipts}).status_code == 201
+
+    full = ekasa_checks(client)
+    assert full["total_checks"] == 7
+    assert full["total_items"] == 6
+
+    pages, cursor = [], None
+    while True:
+        with query_budget(2):
+            page = ekasa_checks(client, limit=3, **({"cursor": cursor} if cursor else {}))
+        assert page["total_checks"] == len(page["checks"]) <= 3
+        pages.extend(page["checks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == full["checks"]
+
+    streamed = client.get("/api/receipts/ekasa-items", query_string={"format": "ndjson"})
+    assert streamed.status_code == 200
+    assert streamed.mimetype == "application/x-ndjson"
+    assert [json.loads(line) for line in streamed.get_data(as_text=True).splitlines()] == full["checks"]
+
+
+def test_ekasa_items_pages_do_not_depend_on_the_cursor_receipt(auth_client_factory):
+    client = auth_client_factory("ekasa-items-deleted@test.local")
+    receipts = [bulk_receipt(external_uid=f"D-{n}", issue_date="2025-10-01") for n in range(4)]
+    assert client.post("/api/receipts/bulk", json={"receipts": receipts}).status_code == 201
+    full = ekasa_checks(client)["checks"]
+
+    first = ekasa_checks(client, limit=2)
+    assert client.delete(f"/api/receipts/{first['checks'][-1]['receipt_id']}").status_code == 200
+    second = ekasa_checks(client, limit=2, cursor=first["next_cursor"])
+
+    assert second["checks"] == full[2:]
+    assert second["next_cursor"] is None
+
+
+def test_ekasa_items_rejects_invalid_paging_and_format(auth_client_factory):
+    client = auth_client_factory("ekasa-items-invalid@test.local")
+
+    garbage_cursor = client.get("/api/receipts/ekasa-items", query_string={"cursor": "not-a-cursor"})
+    zero_limit = client.get("/api/receipts/ekasa-items", query_string={"limit": 0})
+    unknown_format = client.get("/api/receipts/ekasa-items", query_string={"format": "xml"})
+    streamed_page = client.get("/api/receipts/ekasa-items", query_string={"format": "ndjson", "limit": 5})
+    crafted_cursors = [
+        client.get("/api/receipts/ekasa-items", query_string={"cursor": encode_cursor(payload)})
+        for payload in (
+            {"issue_date": "2025-10-01", "created_at": "2025-10-01 10:00:00", "id": 5},
+            {"issue_date": "2025-10-01", "created_at": "garbage", "id": str(UUID(int=1))},
+            {"issue_date": "2025-10-01", "id": str(UUID(int=1))},
+        )
+    ]
+
+    for response in (garbage_cursor, zero_limit, unknown_format, streamed_page, *crafted_cursors):
+        assert response.status_code == 400
+        assert response.get_json()["error"]["code"] == "bad_request"
+
+
+def test_bulk_receipt_create_stores_receipts_items_and_usage_counters(app, auth_client_factory):
+    client = auth_client_factory("receipt-bulk@test.local")
+    tag_id = client.post("/api/tags", json={"name": "Market"}).get_json()["data"]["id"]
+    category_id = client.post("/api/categories", json={"name": "Veg"}).get_json()["data"]["id"]
+
+    response = client.post("/api/receipts/bulk", json={"receipts": [
+        bulk_receipt(tag_id, items=[category_id, category_id, None]),
+        bulk_receipt(tag_id, items=[category_id], issue_date="2025-11-02"),
+        bulk_receipt(),
+    ]})
+
+    assert response.status_code == 201
+    data = response.get_json()["data"]
+    assert data["total_receipts"] == 3
+    assert data["total_items"] == 4
+    first = data["receipts"][0]
+    items = client.get(f"/api/receipts/{first['id']}/items").get_json()["data"]
+    assert sorted(item["id"] for item in items) == sorted(first["item_ids"])
+    assert {item["total_price"] for item in items} == {6.0}
+
+    with app.app_context():
+        tag = db.session.get(Tag, UUID(tag_id))
+        assert tag.counter == 2
+        assert tag.type.value == "expense"
+        assert db.session.get(Category, UUID(category_id)).count == 3
+        assert monthly_rollups_service.verify() == []
+
+
+def test_bulk_receipt_create_is_validated_up_front(app, auth_client_factory):
+    owner = auth_client_factory("receipt-bulk-owner@test.local")
+    other = auth_client_factory("receipt-bulk-other@test.local")
+    foreign_tag = other.post("/api/tags", json={"name": "Theirs"}).get_json()["data"]["id"]
+
+    bad_item_payload = bulk_receipt(items=[None])
+    bad_item_payload["items"][0].pop("name")
+    missing_name = owner.post("/api/receipts/bulk", json={"receipts": [bulk_receipt(), bad_item_payload]})
+    foreign = owner.post("/api/receipts/bulk", json={"receipts": [bulk_receipt(), bulk_receipt(foreign_tag)]})
+    empty = owner.post("/api/receipts/bulk", json={"receipts": []})
+
+    assert missing_name.status_code == 400
+    assert missing_name.get_json()["error"]["message"] == "receipts[1].items[0]: Missing name"
+    assert foreign.status_code == 403
+    assert empty.status_code == 400
+    with app.app_context():
+        assert db.session.query(Receipt).count() == 0
+
+
+def test_bulk_receipt_create_query_count_does_not_grow_with_request_size(app, auth_client_factory):
+    client = auth_client_factory("receipt-bulk-queries@test.local")
+    tag_id = client.post("/api/tags", json={"name": "Tag"}).get_json()["data"]["id"]
+    category_ids = [
+        client.post("/api/categories", json={"name": f"Category {n}"}).get_json()["data"]["id"] for n in range(3)
+    ]
+
+    def selects_for(receipts):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.post("/api/receipts/bulk", json={"receipts": receipts})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 201
+        return len(statements)
+
+    # Same tag, categories and month in both requests, so the monthly
+    # rollup keys touched are the same too.
+    small = selects_for([bulk_receipt(tag_id, items=category_ids)])
+    large = selects_for([bulk_receipt(tag_id, items=category_ids * 10) for _ in range(30)])
+
+    assert large == small
+
+
+def ekasa_payload(receipt_id, organization="Shop", items=2):
+    return {
+        "returnValue": 0,
+        "receipt": {
+            "receiptId": f"UID-{receipt_id}",
+            "issueDate": "05.10.2025 10:00:00",
+            "totalPrice": 3.0 * items,
+            "organization": {"name": organization},
+            "items": [{"name": f"Item {n}", "quantity": 1, "price": 3.0} for n in range(items)],
+        },
+    }
+
+
+@pytest.fixture
+def fake_ekasa(monkeypatch):
+    client = ekasa_service.get_client()
+    client.clear_cache()
+    lookups = []
+
+    def fetch_receipt(receipt_id):
+        lookups.append(receipt_id)
+        if receipt_id.startswith("MISSING"):
+            raise BadRequestError("Invalid receiptId or not found")
+        if receipt_id.startswith("BROKEN"):
+            return {"returnValue": 0, "receipt": {"receiptId": receipt_id, "issueDate": "yesterday"}}
+        organization = "Other shop" if receipt_id.startswith("B") else "Shop"
+        return ekasa_payload(receipt_id, organization=organization)
+
+    monkeypatch.setattr(client, "fetch_receipt", fetch_receipt)
+    return lookups
+
+
+def test_ekasa_batch_import_reports_per_receipt_results(app, auth_client_factory, fake_ekasa):
+    client = auth_client_factory("ekasa-batch@test.local")
+    assert client.post("/api/receipts/import-ekasa", json={"receipt_id": "A1"}).status_code == 201
+
+    response = client.post(
+        "/api/receipts/import-ekasa/batch",
+        json={"receipt_ids": ["A1", "A2", "B1", "MISSING-1", "BROKEN-1", "A2", "B2"]},
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    statuses = {result["receipt_id"]: result["status"] for result in data["results"]}
+    assert [result["receipt_id"] for result in data["results"]] == ["A1", "A2", "B1", "MISSING-1", "BROKEN-1", "B2"]
+    assert statuses == {
+        "A1": "duplicate",
+        "A2": "imported",
+        "B1": "imported",
+        "MISSING-1": "error",
+        "BROKEN-1": "error",
+        "B2": "imported",
+    }
+    assert data["summary"] == {"imported": 3, "duplicate": 1, "error": 2}
+    assert sorted(fake_ekasa) == ["A1", "A1", "A2", "B1", "B2", "BROKEN-1", "MISSING-1"]
+
+    with app.app_context():
+        counters = {tag.name: tag.counter for tag in db.session.query(Tag)}
+        assert counters == {"Shop": 2, "Other shop": 2}
+        imported = db.session.query(Receipt).filter(Receipt.external_uid.like("UID-%")).all()
+        assert len(imported) == 4
+        assert sum(len(receipt.items) for receipt in imported) == 8
+
+
+def test_ekasa_batch_import_looks_up_existing_receipts_once(app, auth_client_factory, fake_ekasa, query_budget):
+    client = auth_client_factory("ekasa-batch-queries@test.local")
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if "receipts.external_uid IN" in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with query_budget(15):
+            response = client.post(
+                "/api/receipts/import-ekasa/batch", json={"receipt_ids": [f"A{n}" for n in range(10)]}
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["summary"]["imported"] == 10
+    assert len(statements) == 1
+
+
+def test_ekasa_batch_import_validates_request(app, auth_client_factory, fake_ekasa):
+    client = auth_client_factory("ekasa-batch-invalid@test.local")
+    app.config["EKASA_BATCH_MAX"] = 3
+
+    missing = client.post("/api/receipts/import-ekasa/batch", json={})
+    empty = client.post("/api/receipts/import-ekasa/batch", json={"receipt_ids": []})
+    too_many = client.post("/api/receipts/import-ekasa/batch", json={"receipt_ids": ["A1", "A2", "A3", "A4"]})
+    not_strings = client.post("/api/receipts/import-ekasa/batch", json={"receipt_ids": ["A1", 2]})
+
+    for response in (missing, empty, too_many, not_strings):
+        assert response.status_code == 400
+        assert response.get_json()["error"]["code"] == "bad_request"
+    assert fake_ekasa == []
+
+
 @pytest.mark.xfail(reason="Goals are currently global in-memory records and have no user ownership field.")
 def test_user_cannot_access_another_users_goals(auth_client_factory):
     owner = auth_client_factory("goal-owner@test.local")
@@ -117,3 +461,35 @@ def test_user_cannot_access_another_users_goals(auth_client_factory):
 @pytest.mark.skip(reason="No financial-target API endpoints exist yet; only the database model is present.")
 def test_user_cannot_access_another_users_financial_targets():
     pass
+
+
+def test_async_ekasa_import_runs_as_a_background_job(app, auth_client_factory, fake_ekasa):
+    client = auth_client_factory("ekasa-async@test.local")
+
+    submitted = client.post("/api/receipts/import-ekasa?async=true", json={"receipt_id": "A1"})
+    assert submitted.status_code == 202
+    job_id = submitted.get_json()["data"]["id"]
+
+    job = client.get(f"/api/jobs/{job_id}?wait=5").get_json()["data"]
+    assert job["status"] == "succeeded"
+    assert job["result"]["total_items"] == 2
+    assert client.get(f"/api/receipts/{job['result']['receipt_id']}").status_code == 200
+
+    duplicate = client.post("/api/receipts/import-ekasa?async=true", json={"receipt_id": "A1"})
+    job = client.get(f"/api/jobs/{duplicate.get_json()['data']['id']}?wait=5").get_json()["data"]
+    assert job["status"] == "failed"
+    assert job["error"]["code"] == "conflict"
+
+
+def test_async_ekasa_imports_are_validated_before_they_are_queued(app, auth_client_factory, fake_ekasa):
+    client = auth_client_factory("ekasa-async-invalid@test.local")
+
+    missing_id = client.post("/api/receipts/import-ekasa?async=true", json={"receipt_id": " "})
+    bad_account = client.post("/api/receipts/import-ekasa?async=true", json={"receipt_id": "A1", "account_id": "x"})
+    empty_batch = client.post("/api/receipts/import-ekasa/batch?async=true", json={"receipt_ids": []})
+
+    for response in (missing_id, bad_account, empty_batch):
+        assert response.status_code == 400
+        assert response.get_json()["error"]["code"] == "bad_request"
+    assert fake_ekasa == []
+
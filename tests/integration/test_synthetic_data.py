@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Goal, Income, Receipt, ReceiptItem, SavingsFund, Tag
+from app.models.base import Base
+from app.services import monthly_rollups_service
+from scripts.synthetic_data import PASSWORD, DatasetSpec, generate, user_email
+
+SPEC = DatasetSpec(users=2, years=1, receipts_per_month=8, items_per_receipt=3, seed=5, end=date(2025, 10, 20))
+
+
+def snapshot():
+    receipts = db.session.execute(
+        select(Receipt.id, Receipt.issue_date, Receipt.total_amount, Receipt.tag_id).order_by(Receipt.id)
+    ).all()
+    items = db.session.execute(select(ReceiptItem.id, ReceiptItem.total_price).order_by(ReceiptItem.id)).all()
+    incomes = db.session.execute(select(Income.id, Income.amount).order_by(Income.id)).all()
+    return receipts, items, incomes
+
+
+def test_generated_dataset_is_deterministic_and_consistent(app):
+    written = generate(SPEC, chunk_size=100)
+    db.session.commit()
+    first = snapshot()
+
+    assert written["users"] == 2
+    assert written["receipts"] == len(first[0]) > 0
+    assert written["receipt_items"] == len(first[1]) > 0
+    assert all(date(2024, 11, 1) <= issue_date <= SPEC.end for _, issue_date, _, _ in first[0])
+    assert monthly_rollups_service.verify() == []
+
+    usage = dict(db.session.execute(
+        select(Receipt.tag_id, func.count()).where(Receipt.tag_id.isnot(None)).group_by(Receipt.tag_id)
+    ).all())
+    for tag_id, count in db.session.execute(select(Income.tag_id, func.count()).group_by(Income.tag_id)):
+        usage[tag_id] = usage.get(tag_id, 0) + count
+    assert {tag.id: tag.counter for tag in db.session.query(Tag) if tag.counter} == usage
+
+    for fund in db.session.query(SavingsFund):
+        goals = db.session.query(Goal).filter(Goal.savings_fund_id == fund.id).all()
+        assert sum(goal.current_amount for goal in goals) <= fund.balance
+
+    db.session.remove()
+    Base.metadata.drop_all(db.engine)
+    Base.metadata.create_all(db.engine)
+    generate(SPEC)
+    db.session.commit()
+
+    assert snapshot() == first
+
+
+def test_generated_users_can_sign_in_and_read_their_data(app, client):
+    generate(SPEC)
+    db.session.commit()
+
+    login = client.post("/api/auth/login", json={"email": user_email(SPEC.seed, 1), "password": PASSWORD})
+    assert login.status_code == 200
+
+    receipts = client.get("/api/receipts?year=2025&month=10").get_json()["data"]
+    summary = client.get("/api/dashboard/summary?year=2025&month=10").get_json()["data"]
+    savings = client.get("/api/savings/summary")
+
+    assert receipts
+    assert summary["total_incomes"] > 0
+    assert summary["total_expenses"] == pytest.approx(sum(receipt["total_amount"] for receipt in receipts))
+    assert savings.status_code == 200
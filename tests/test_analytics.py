@@ -6,7 +6,7 @@ import pytest
 
 from app import create_app
 from app.extensions import db
-from app.models import Account, AccountMember, AccountType, Income, Receipt, ReceiptItem
+from app.models import Account, AccountMember, AccountType, Category, Income, Receipt, ReceiptItem, Tag
 from app.config import TestConfig
 
 
@@ -107,6 +107,64 @@ def test_donut_analytics_uses_authenticated_users_main_account(app):
     assert ignored.get_json()["data"]["total_amount"] == 10.0
 
 
+def test_donut_analytics_rolls_up_categories_tags_and_days(app):
+    client = app.test_client()
+    register_and_login(client, "analytics-breakdown@test.local")
+    user_id = UUID(client.get("/api/auth/me").get_json()["data"]["id"])
+    account_id = UUID(client.get("/api/account").get_json()["data"]["id"])
+
+    with app.app_context():
+        food = Category(user_id=user_id, name="Food")
+        home = Category(user_id=user_id, name="Home")
+        weekly = Tag(user_id=user_id, name="Weekly")
+        db.session.add_all([food, home, weekly])
+        db.session.flush()
+
+        def add_receipt(issue_date, tag, items):
+            receipt = Receipt(
+                user_id=user_id,
+                account_id=account_id,
+                description="Breakdown fixture",
+                issue_date=issue_date,
+                total_amount=sum((Decimal(price) for _, price in items), Decimal("0")),
+                tag_id=tag.id if tag else None,
+            )
+            db.session.add(receipt)
+            db.session.flush()
+            for category, price in items:
+                db.session.add(ReceiptItem(
+                    receipt_id=receipt.id,
+                    user_id=user_id,
+                    name="Item",
+                    quantity=Decimal("1"),
+                    unit_price=Decimal(price),
+                    total_price=Decimal(price),
+                    category_id=category.id if category else None,
+                ))
+
+        add_receipt(date(2025, 10, 1), weekly, [(food, "10.25"), (food, "4.75"), (home, "5.00")])
+        add_receipt(date(2025, 10, 2), weekly, [(food, "20.00")])
+        add_receipt(date(2025, 10, 2), None, [(home, "35.00"), (None, "25.00")])
+        add_receipt(date(2025, 11, 1), weekly, [(food, "99.00")])
+        db.session.commit()
+
+    response = client.get("/api/analytics/donut?year=2025&month=10")
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+
+    assert data["total_amount"] == 100.0
+    assert data["categories"] == [
+        {"category": "Home", "amount": 40.0, "percentage": 40.0},
+        {"category": "Food", "amount": 35.0, "percentage": 35.0},
+        {"category": "Uncategorized", "amount": 25.0, "percentage": 25.0},
+    ]
+    assert data["tags_by_category"] == {
+        "Food": {"Weekly": {"2025-10-01": 15.0, "2025-10-02": 20.0}},
+        "Home": {"No tag": {"2025-10-02": 35.0}, "Weekly": {"2025-10-01": 5.0}},
+        "Uncategorized": {"No tag": {"2025-10-02": 25.0}},
+    }
+
+
 def test_donut_analytics_rejects_year_outside_date_range(app):
     client = app.test_client()
     register_and_login(client, "analytics-year@test.local")
@@ -243,3 +243,78 @@ def test_account_patch_rejects_non_object_json_body(app):
     assert response.status_code == 400
     assert response.get_json()["error"]["code"] == "bad_request"
     assert response.get_json()["error"]["message"] == "JSON body must be an object"
+
+
+def test_repeated_requests_resolve_token_from_cache(app):
+    client = app.test_client()
+    register_and_login(client, "cached@test.local", "pass")
+    token_cache = app.extensions["auth_service"].token_cache
+
+    assert client.get("/api/auth/me").status_code == 200
+    misses = token_cache.misses
+    hits = token_cache.hits
+
+    for _ in range(3):
+        me = client.get("/api/auth/me")
+        assert me.status_code == 200
+        assert me.get_json()["data"]["email"] == "cached@test.local"
+
+    assert token_cache.misses == misses
+    assert token_cache.hits == hits + 3
+    assert token_cache.stats()["size"] == 1
+
+
+def test_logout_invalidates_cached_token(app):
+    client = app.test_client()
+    login = register_and_login(client, "cached-logout@test.local", "pass")
+    token = get_cookie_value(login, "auth_token")
+    token_cache = app.extensions["auth_service"].token_cache
+
+    assert client.get("/api/auth/me").status_code == 200
+    assert token_cache.get(token) is not None
+
+    client.post("/api/auth/logout")
+
+    assert token_cache.get(token) is None
+    rejected = app.test_client().get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert rejected.status_code == 401
+
+
+def test_cached_token_is_rejected_and_removed_once_expired(app):
+    client = app.test_client()
+    login = register_and_login(client, "cached-expiry@test.local", "pass")
+    token = get_cookie_value(login, "auth_token")
+    auth_service = app.extensions["auth_service"]
+
+    assert client.get("/api/auth/me").status_code == 200
+    user, _expires_at = auth_service.token_cache.get(token)
+    auth_service.token_cache.put(token, user, datetime.utcnow() - timedelta(seconds=1))
+
+    with app.app_context():
+        stored = db.session.execute(db.select(AuthToken).filter_by(token=token)).scalar_one()
+        stored.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+    assert client.get("/api/auth/me").status_code == 401
+    assert auth_service.token_cache.get(token) is None
+
+    with app.app_context():
+        assert db.session.execute(db.select(AuthToken).filter_by(token=token)).scalar_one_or_none() is None
+
+
+def test_token_cache_can_be_disabled_through_config():
+    class NoTokenCacheConfig(TestConfig):
+        AUTH_TOKEN_CACHE_TTL = 0
+
+    app = create_app(NoTokenCacheConfig)
+    with app.app_context():
+        client = app.test_client()
+        register_and_login(client, "no-cache@test.local", "pass")
+        assert client.get("/api/auth/me").status_code == 200
+        assert client.get("/api/auth/me").status_code == 200
+
+        stats = app.extensions["auth_service"].token_cache.stats()
+        assert stats["enabled"] is False
+        assert stats["hits"] == 0
+        assert stats["size"] == 0
+        db.session.remove()
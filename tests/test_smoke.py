@@ -5,7 +5,6 @@ These tests verify that the application can start and basic infrastructure works
 """
 import io
 import os
-import time
 import uuid
 from datetime import date
 from decimal import Decimal
@@ -1221,27 +1220,23 @@ def test_import_qr_extract_id_invalid_extension_uses_structured_error(auth_clien
 
 
 def test_import_qr_extract_id_rate_limit_uses_structured_error(auth_client):
-    from app.api import importqr
-
-    remote_addr = "203.0.113.10"
-    key = f"{remote_addr}:api_importqr_extract_id"
-    importqr.rate_limit_store[key] = [time.time()] * 10
-
-    try:
-        resp = auth_client.post(
+    def upload():
+        return auth_client.post(
             "/api/import-qr/extract-id",
             data={"image": (io.BytesIO(b"fake-image"), "receipt.png")},
             content_type="multipart/form-data",
-            environ_overrides={"REMOTE_ADDR": remote_addr},
         )
-    finally:
-        importqr.rate_limit_store.pop(key, None)
+
+    for _ in range(10):
+        assert upload().status_code != 429
+    resp = upload()
 
     assert resp.status_code == 429
     body = resp.get_json()
     assert body["data"] is None
     assert body["error"]["code"] == "rate_limit_exceeded"
     assert body["error"]["message"] == "Rate limit exceeded. Try again later."
+    assert 0 < int(resp.headers["Retry-After"]) <= 60
 
 
 def test_auth_flow_ok(client):
@@ -1316,6 +1311,49 @@ def test_export_ok(app, auth_client, path):
         assert "Groceries" in csv_body
 
 
+def test_export_csv_streams_rows_merged_in_date_order(app, auth_client, monkeypatch):
+    from app.services import export_service
+
+    monkeypatch.setattr(export_service, "CSV_CHUNK_SIZE", 64)
+
+    with app.app_context():
+        user = _get_user("u@test.local")
+        account = _get_main_account(user)
+        for day in (5, 1, 3):
+            db.session.add(
+                Income(
+                    user_id=user.id,
+                    description=f"Income {day}",
+                    amount=Decimal("10.00"),
+                    income_date=date(2025, 10, day),
+                )
+            )
+        for day in (4, 2):
+            db.session.add(
+                Receipt(
+                    user_id=user.id,
+                    account_id=account.id,
+                    description=f"Expense {day}",
+                    issue_date=date(2025, 10, day),
+                    total_amount=Decimal("3.00"),
+                )
+            )
+        db.session.commit()
+
+    r = auth_client.get("/api/export/csv?year=2025&month=10")
+
+    assert r.status_code == 200
+    assert r.is_streamed
+    assert r.mimetype == "text/csv"
+    assert "attachment" in r.headers["Content-Disposition"]
+    lines = r.data.decode("utf-8").splitlines()
+    assert lines[0].startswith("date,kind,description,amount")
+    assert [line.split(",")[0] for line in lines[1:]] == [f"2025-10-0{day}" for day in range(1, 6)]
+    assert [line.split(",")[2] for line in lines[1:]] == [
+        "Income 1", "Expense 2", "Income 3", "Expense 4", "Income 5",
+    ]
+
+
 def test_export_pdf_invalid_month_returns_bad_request(auth_client):
     r = auth_client.get("/api/export/pdf?year=2025&month=13")
 
@@ -2060,7 +2098,7 @@ def test_ekasa_service_raises_upstream_service_error_on_non_200(monkeypatch):
         def json(self):
             return {}
 
-    monkeypatch.setattr(ekasa_service.requests, "post", lambda *args, **kwargs: DummyResponse())
+    monkeypatch.setattr(ekasa_service.get_client().session, "post", lambda *args, **kwargs: DummyResponse())
 
     with pytest.raises(UpstreamServiceError, match="eKasa API returned 503"):
         ekasa_service.fetch_receipt_data("1234567890ABCDEF")
@@ -2073,7 +2111,7 @@ def test_ekasa_service_raises_upstream_service_error_on_invalid_json(monkeypatch
         def json(self):
             raise ValueError("not json")
 
-    monkeypatch.setattr(ekasa_service.requests, "post", lambda *args, **kwargs: DummyResponse())
+    monkeypatch.setattr(ekasa_service.get_client().session, "post", lambda *args, **kwargs: DummyResponse())
 
     with pytest.raises(UpstreamServiceError, match="Invalid response returned by eKasa API"):
         ekasa_service.fetch_receipt_data("1234567890ABCDEF")
@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.services import database_service
+from app.services.database_service import InstrumentedQueuePool, build_engine_options
+
+
+def _config(uri, **overrides):
+    config = {
+        "SQLALCHEMY_DATABASE_URI": uri,
+        "DB_POOL_SIZE": 7,
+        "DB_MAX_OVERFLOW": 3,
+        "DB_POOL_TIMEOUT": 2.5,
+        "DB_POOL_RECYCLE": 600,
+        "DB_POOL_PRE_PING": True,
+        "DB_POOL_USE_LIFO": True,
+        "DB_PGBOUNCER": False,
+    }
+    config.update(overrides)
+    return config
+
+
+def test_sqlite_keeps_flask_sqlalchemy_pool_defaults():
+    assert build_engine_options(_config("sqlite:///:memory:")) == {}
+    assert build_engine_options(_config("sqlite:///dev.db")) == {}
+
+
+def test_server_database_pool_is_configured_from_settings():
+    options = build_engine_options(_config("postgresql+psycopg2://u:p@db/budget"))
+
+    assert options == {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": 7,
+        "max_overflow": 3,
+        "pool_timeout": 2.5,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+
+
+@pytest.mark.parametrize(
+    ("uri", "connect_args"),
+    [
+        ("postgresql+psycopg2://u:p@db/budget", None),
+        ("postgresql+psycopg://u:p@db/budget", {"prepare_threshold": None}),
+        ("postgresql+asyncpg://u:p@db/budget", {"statement_cache_size": 0, "prepared_statement_cache_size": 0}),
+    ],
+)
+def test_pgbouncer_mode_disables_server_side_prepared_statements(uri, connect_args):
+    options = build_engine_options(_config(uri, DB_PGBOUNCER=True))
+
+    assert options.get("connect_args") == connect_args
+
+
+def test_instrumented_pool_records_waits_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    before = database_service.pool_stats.snapshot()
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    engine.dispose()
+
+    after = database_service.pool_stats.snapshot()
+    assert after["waits"] - before["waits"] == 2
+    assert after["timeouts"] - before["timeouts"] == 1
+    assert after["wait_max_ms"] >= 50
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_sqlite_performance_profile_is_applied_on_connect(tmp_path, enabled):
+    class App:
+        config = {
+            "SQLITE_PERFORMANCE_PROFILE": enabled,
+            "SQLITE_MMAP_SIZE": 1024 * 1024,
+            "SQLITE_CACHE_SIZE_KB": 2048,
+            "SQLITE_BUSY_TIMEOUT_MS": 1500,
+        }
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    database_service.install_engine_hooks(App, engine)
+
+    with engine.connect() as connection:
+        pragmas = {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "cache_size", "temp_store", "busy_timeout")
+        }
+    engine.dispose()
+
+    if enabled:
+        assert pragmas == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "cache_size": -2048,
+            "temp_store": 2,
+            "busy_timeout": 1500,
+        }
+    else:
+        assert pragmas["journal_mode"] == "delete"
+        assert pragmas["synchronous"] == 2
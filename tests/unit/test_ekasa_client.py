@@ -0,0 +1,131 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.ekasa_service import EkasaClient
+from app.services.errors import BadRequestError, UpstreamServiceError
+
+
+def _payload(receipt_id):
+    return {"returnValue": 0, "receipt": {"receiptId": receipt_id, "totalPrice": 1.5, "items": []}}
+
+
+class StubEkasaServer:
+    """Local stand-in for the eKasa API.
+
+    ``responses`` is a queue of ``(status, body)`` pairs served in order;
+    once it is empty every lookup succeeds with a payload echoing the
+    requested receipt ID.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+                status, payload = stub.responses.pop(0) if stub.responses else (200, _payload(body["receiptId"]))
+                raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/receipt/find"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    with StubEkasaServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(stub):
+    ekasa = EkasaClient(stub.url, timeout=5, backoff_factor=0, cache_size=2)
+    yield ekasa
+    ekasa.close()
+
+
+def test_lookups_reuse_one_keep_alive_connection(stub, client):
+    for receipt_id in ("O-A", "O-B", "O-C"):
+        assert client.fetch_receipt(receipt_id)["receipt"]["receiptId"] == receipt_id
+
+    assert len(stub.requests) == 3
+    assert stub.connections == 1
+
+
+def test_successful_payloads_are_cached_by_receipt_id(stub, client):
+    first = client.fetch_receipt("O-A")
+    first["receipt"]["totalPrice"] = 99
+    second = client.fetch_receipt("O-A")
+
+    assert len(stub.requests) == 1
+    assert second["receipt"]["totalPrice"] == 1.5
+    assert client.stats()["cache_hits"] == 1
+
+    client.fetch_receipt("O-B")
+    client.fetch_receipt("O-C")
+    client.fetch_receipt("O-A")
+    assert len(stub.requests) == 4
+
+
+def test_transient_upstream_errors_are_retried(stub, client):
+    stub.responses = [(503, {}), (502, {})]
+
+    assert client.fetch_receipt("O-A")["returnValue"] == 0
+    assert len(stub.requests) == 3
+
+
+def test_persistent_upstream_error_is_reported_and_not_cached(stub, client):
+    stub.responses = [(503, {})] * 3
+
+    with pytest.raises(UpstreamServiceError, match="eKasa API returned 503"):
+        client.fetch_receipt("O-A")
+
+    assert client.fetch_receipt("O-A")["returnValue"] == 0
+    assert len(stub.requests) == 4
+
+
+def test_unknown_receipt_and_invalid_json_are_rejected(stub, client):
+    stub.responses = [(200, {"returnValue": -1}), (200, b"not json")]
+
+    with pytest.raises(BadRequestError, match="Invalid receiptId or not found"):
+        client.fetch_receipt("O-A")
+    with pytest.raises(UpstreamServiceError, match="Invalid response returned by eKasa API"):
+        client.fetch_receipt("O-A")
+
+
+def test_connection_failure_is_reported_as_upstream_error():
+    with StubEkasaServer() as stub:
+        url = stub.url
+    ekasa = EkasaClient(url, timeout=1, max_retries=0)
+
+    with pytest.raises(UpstreamServiceError, match="Failed to connect to eKasa API"):
+        ekasa.fetch_receipt("O-A")
@@ -0,0 +1,53 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+PAYLOAD = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "total_amount": Decimal("12.50"),
+    "issue_date": date(2025, 10, 3),
+    "created_at": datetime(2025, 10, 3, 8, 30, 5, 120000, tzinfo=timezone.utc),
+    "description": "Potraviny čerstvé",
+    "tag_id": None,
+    "items": [{"quantity": Decimal("1.500")}],
+}
+
+EXPECTED = (
+    '{"id":"12345678-1234-5678-1234-567812345678","total_amount":12.5,"issue_date":"2025-10-03",'
+    '"created_at":"2025-10-03T08:30:05.120000+00:00","description":"Potraviny čerstvé",'
+    '"tag_id":null,"items":[{"quantity":1.5}]}'
+)
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def app(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_model_types_are_serialized_natively(app):
+    assert app.json.dumps(PAYLOAD) == EXPECTED
+    with app.app_context():
+        response = app.json.response(PAYLOAD)
+    assert response.get_data(as_text=True) == EXPECTED + "\n"
+    assert response.mimetype == "application/json"
+
+
+def test_unknown_types_still_fail(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({"value": object()})
+
+
+def test_request_bodies_round_trip(app):
+    assert app.json.loads('{"amount": 1.5, "name": "čaj"}') == {"amount": 1.5, "name": "čaj"}
@@ -0,0 +1,123 @@
+import os
+import time
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services import qr_service
+from app.services.qr_service import QrService
+
+RECEIPT_ID = "O-E0F4A2C3B5D6E7F8A9B0C1D2E3F4A5B6"
+
+
+def qr_photo(text=RECEIPT_ID, module_px=6, size=(600, 800), angle=0):
+    encoder = cv2.QRCodeEncoder.create() if hasattr(cv2.QRCodeEncoder, "create") else cv2.QRCodeEncoder()
+    qr = Image.fromarray(encoder.encode(text), mode="L")
+    qr = qr.resize((qr.width * module_px, qr.height * module_px), Image.NEAREST)
+    framed = Image.new("L", (qr.width + 8 * module_px, qr.height + 8 * module_px), 255)
+    framed.paste(qr, (4 * module_px, 4 * module_px))
+    framed = framed.rotate(angle, expand=True, fillcolor=255)
+    photo = Image.new("L", size, 235)
+    photo.paste(framed, (20, 20))
+    return photo.convert("RGB")
+
+
+@pytest.mark.parametrize("workers, processes", [(1, 0), (3, 0), (1, 2)])
+def test_scan_image_stops_at_first_successful_attempt(workers, processes):
+    service = QrService(max_workers=workers, processes=processes)
+    try:
+        result = service.scan_image(qr_photo())
+    finally:
+        service.shutdown()
+
+    assert result.receipt_id == RECEIPT_ID
+    assert result.variant.endswith("/rot_0")
+    # Never gets past the cheap upright stage (3 variants x 2 decoders).
+    assert result.attempts <= 6
+
+
+def test_scan_image_reports_all_attempts_when_no_qr_code_is_present():
+    service = QrService(max_workers=1)
+    result = service.scan_image(Image.new("RGB", (120, 160), "white"))
+
+    assert result.receipt_id is None
+    # 7 variants x 4 rotations x 2 decoders for an image small enough to upscale.
+    assert result.attempts == 56
+
+
+def test_large_photos_are_scaled_down_and_skip_oversized_upscales():
+    service = QrService(max_workers=1)
+    photo = Image.new("RGB", (3000, 4000), "white")
+
+    base = service._fit_to_decode_size(photo)
+    labels = [label for label, _factory in service._variant_stages(photo)]
+
+    assert max(base.size) == QrService.MAX_DECODE_SIDE
+    assert labels == ["original", "gray", "auto", "bright2", "bright3", "x2"]
+
+
+def test_variants_are_built_lazily():
+    service = QrService(max_workers=1)
+    built = []
+
+    def stage_factory(label):
+        def make():
+            built.append(label)
+            return np.zeros((10, 10), dtype=np.uint8)
+        return make
+
+    service._variant_stages = lambda source: iter(
+        (label, stage_factory(label)) for label in ["original", "gray", "auto", "bright2"]
+    )
+    attempts = service._attempts(None)
+    _label, _decoder, make = next(attempts)
+    make()
+
+    assert built == ["original"]
+
+
+def test_decoder_processes_rebuild_images_from_pixel_buffers():
+    qr_service._init_decode_worker()
+    photo = qr_photo()
+
+    for image in (photo, photo.convert("L")):
+        assert qr_service._decode_buffer(
+            "_extract_with_opencv", image.mode, image.size, image.tobytes()
+        ) == RECEIPT_ID
+
+
+def test_warm_up_starts_the_decoder_processes():
+    service = QrService(processes=2)
+    try:
+        service.warm_up()
+        pool = service._process_pool
+        assert pool is not None
+        assert pool.submit(os.getpid).result() != os.getpid()
+
+        assert service.scan_image(qr_photo(angle=90)).receipt_id == RECEIPT_ID
+        assert service._process_pool is pool
+    finally:
+        service.shutdown()
+
+
+def test_stuck_decoder_abandons_the_scan_and_replaces_its_process():
+    service = QrService(processes=1, task_timeout=0.5)
+    try:
+        service.warm_up()
+        pool = service._process_pool
+        stuck = next(iter(pool._processes.values()))
+        service._submit_to_process = lambda decoder, image, buffers: (pool, pool.submit(time.sleep, 30))
+
+        started = time.monotonic()
+        result = service.scan_image(qr_photo())
+
+        assert result.receipt_id is None
+        assert result.attempts == 1
+        assert time.monotonic() - started < 5
+        assert service._process_pool is None
+        stuck.join(5)
+        assert not stuck.is_alive()
+    finally:
+        service.shutdown()
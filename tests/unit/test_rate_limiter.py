@@ -0,0 +1,210 @@
+import fnmatch
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from app.services.rate_limiter import MemoryRateLimiter, RedisRateLimiter, build_rate_limiter
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubRespServer:
+    """Local stand-in for a Redis server.
+
+    Speaks RESP2 and implements the commands the limiter uses against an
+    in-memory dict; expiry is recorded but not enforced. ``commands`` logs
+    every command received apart from the client's connection setup.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.commands = []
+        self.connections = 0
+        self.sockets = []
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                stub.connections += 1
+                stub.sockets.append(self.request)
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    args = []
+                    for _ in range(int(line[1:])):
+                        length = int(self.rfile.readline()[1:])
+                        args.append(self.rfile.read(length + 2)[:-2].decode())
+                    if args[0].upper() != "CLIENT":
+                        stub.commands.append(args)
+                    self.wfile.write(stub.execute(*args))
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"redis://127.0.0.1:{self.server.server_address[1]}/0"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def execute(self, command, *args):
+        command = command.upper()
+        if command == "CLIENT":
+            return b"+OK\r\n"
+        if command in ("INCRBY", "DECRBY"):
+            value = int(self.data.get(args[0], 0)) + int(args[1]) * (1 if command == "INCRBY" else -1)
+            self.data[args[0]] = str(value)
+            return b":%d\r\n" % value
+        if command == "PEXPIRE":
+            self.expiry[args[0]] = int(args[1])
+            return b":1\r\n"
+        if command == "GET":
+            value = self.data.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value.encode())
+        if command == "SCAN":
+            keys = [key for key in self.data if fnmatch.fnmatchcase(key, args[args.index("MATCH") + 1])]
+            return b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(
+                b"$%d\r\n%s\r\n" % (len(key), key.encode()) for key in keys
+            )
+        if command == "DEL":
+            deleted = [self.data.pop(key) for key in args if key in self.data]
+            return b":%d\r\n" % len(deleted)
+        return b"-ERR unknown command '%s'\r\n" % command.encode()
+
+    def drop_connections(self):
+        for sock in self.sockets:
+            sock.shutdown(socket.SHUT_RDWR)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    with StubRespServer() as server:
+        yield server
+
+
+def backends(stub, clock):
+    return {
+        "memory": MemoryRateLimiter(clock=clock),
+        "redis": RedisRateLimiter(stub.url, clock=clock),
+    }
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_limit_is_enforced_per_key_and_denied_hits_are_not_counted(stub, backend):
+    clock = Clock()
+    limiter = backends(stub, clock)[backend]
+
+    decisions = [limiter.hit("login:ip:a", 3, 60) for _ in range(5)]
+
+    assert [decision.allowed for decision in decisions] == [True, True, True, False, False]
+    assert [decision.remaining for decision in decisions[:3]] == [2, 1, 0]
+    assert 0 < decisions[3].retry_after <= 60
+    assert limiter.hit("login:ip:b", 3, 60).allowed
+    if backend == "redis":
+        assert stub.data[f"rate-limit:login:ip:a:{int(clock.now // 60)}"] == "3"
+    limiter.close()
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_previous_window_is_weighted_by_its_remaining_overlap(stub, backend):
+    clock = Clock(now=60 * 20_000)
+    limiter = backends(stub, clock)[backend]
+    for _ in range(4):
+        assert limiter.hit("key", 4, 60).allowed
+
+    # A quarter into the next window, 3 of the previous 4 hits still count.
+    clock.now += 75
+    assert limiter.hit("key", 4, 60).allowed
+    denied = limiter.hit("key", 4, 60)
+    assert not denied.allowed
+    # Room for one more once the previous window's share drops to 2.
+    assert denied.retry_after == 15
+
+    clock.now += 15
+    assert limiter.hit("key", 4, 60).allowed
+    limiter.close()
+
+
+def test_memory_limiter_evicts_least_recently_used_keys():
+    limiter = MemoryRateLimiter(max_keys=2, clock=Clock())
+    limiter.hit("a", 1, 60)
+    limiter.hit("b", 1, 60)
+    assert not limiter.hit("a", 1, 60).allowed
+
+    limiter.hit("c", 1, 60)
+
+    assert len(limiter) == 2
+    assert limiter.hit("b", 1, 60).allowed
+    assert not limiter.hit("c", 1, 60).allowed
+
+
+def test_redis_limiter_pipelines_one_round_trip_and_sets_expiry(stub):
+    clock = Clock(now=60 * 20_000 + 5)
+    limiter = RedisRateLimiter(stub.url, prefix="rl:", clock=clock)
+
+    limiter.hit("key", 5, 60)
+    limiter.hit("key", 5, 60)
+
+    assert stub.commands == [
+        ["INCRBY", "rl:key:20000", "1"], ["PEXPIRE", "rl:key:20000", "120000"], ["GET", "rl:key:19999"],
+    ] * 2
+    assert stub.connections == 1
+    limiter.close()
+
+
+def test_redis_limiter_reconnects_after_the_server_drops_the_connection(stub):
+    limiter = RedisRateLimiter(stub.url, clock=Clock())
+    assert limiter.hit("key", 5, 60).remaining == 4
+
+    stub.drop_connections()
+
+    assert limiter.hit("key", 5, 60).remaining == 3
+    assert stub.connections == 2
+    limiter.close()
+
+
+def test_redis_limiter_reset_deletes_only_its_own_keys(stub):
+    limiter = RedisRateLimiter(stub.url, prefix="rl:", clock=Clock())
+    limiter.hit("a", 5, 60)
+    limiter.hit("b", 5, 60)
+    stub.data["other:key"] = "1"
+
+    limiter.reset()
+
+    assert stub.data == {"other:key": "1"}
+    assert limiter.hit("a", 5, 60).remaining == 4
+    limiter.close()
+
+
+def test_redis_limiter_fails_open_when_the_server_is_unreachable(stub, caplog):
+    url = stub.url
+    stub.__exit__()
+    limiter = RedisRateLimiter(url, clock=Clock())
+
+    decision = limiter.hit("key", 1, 60)
+
+    assert decision.allowed
+    assert "Rate limit storage unavailable" in caplog.text
+
+
+def test_build_rate_limiter_picks_the_backend_from_the_storage_url(stub):
+    assert isinstance(build_rate_limiter({"RATE_LIMIT_STORAGE_URL": ""}), MemoryRateLimiter)
+    limiter = build_rate_limiter({"RATE_LIMIT_STORAGE_URL": stub.url, "RATE_LIMIT_KEY_PREFIX": "app:"})
+    assert isinstance(limiter, RedisRateLimiter)
+    assert limiter.prefix == "app:"
+    with pytest.raises(ValueError):
+        build_rate_limiter({"RATE_LIMIT_STORAGE_URL": "memcached://cache:11211"})
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "pyzbar", "pandas", "reportlab")
+
+PROBE = f"""
+import json, sys
+from app import create_app
+from app.config import TestConfig
+create_app(TestConfig)
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_create_app_does_not_import_heavy_optional_dependencies():
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=dict(os.environ, APP_ENV="test"),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.services.token_cache import AuthenticatedUser, TokenCache, hash_token
+
+
+def _user(email="cache@test.local"):
+    return AuthenticatedUser(
+        id=uuid.uuid4(),
+        username=email.split("@")[0],
+        email=email,
+        is_verified=True,
+        created_at=None,
+    )
+
+
+def _expires():
+    return datetime.utcnow() + timedelta(hours=1)
+
+
+def test_token_cache_evicts_least_recently_used_entry():
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    cache.put("a", _user("a@test.local"), _expires())
+    cache.put("b", _user("b@test.local"), _expires())
+    assert cache.get("a") is not None
+
+    cache.put("c", _user("c@test.local"), _expires())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_token_cache_drops_entries_older_than_ttl(monkeypatch):
+    cache = TokenCache(max_size=10, ttl_seconds=5)
+    now = [1000.0]
+    monkeypatch.setattr("app.services.token_cache.time.monotonic", lambda: now[0])
+
+    cache.put("token", _user(), _expires())
+    now[0] += 4
+    assert cache.get("token") is not None
+
+    now[0] += 2
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_invalidate_user_removes_all_sessions_of_user():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    user = _user()
+    cache.put("first", user, _expires())
+    cache.put("second", user, _expires())
+    cache.put("other", _user("other@test.local"), _expires())
+
+    cache.invalidate_user(user.id)
+
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+    assert cache.get("other") is not None
+    assert cache.invalidations == 2
+
+
+def test_token_cache_keys_are_token_digests():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put("secret-token", _user(), _expires())
+
+    assert "secret-token" not in cache._entries
+    assert hash_token("secret-token") in cache._entries